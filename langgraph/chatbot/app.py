@@ -3,20 +3,37 @@ import sys
 import json
 import traceback
 import time
+import uuid
 from datetime import datetime
+
+import compare
+
+# compare 모드는 저장된 벤치마크 JSON만 비교하므로 LLM/MCP 모듈을 import하기 전에 분기
+if __name__ == "__main__" and compare.is_compare_mode(sys.argv[1:]):
+    compare.main(sys.argv[1:])
+
 from dotenv import load_dotenv
 from typing import Dict, List, Any
 import asyncio
 
 from langgraph.graph import StateGraph, END
 
-from config import LOGGING_CONFIG
+from config import (
+    LOGGING_CONFIG,
+    RAG_PIPELINE_CONFIG,
+    LLM_RESILIENCE_CONFIG,
+    SERVE_CONFIG,
+    HISTORY_COMPACTION_CONFIG,
+    FAST_PATH_CONFIG
+)
 from states import ChatState
 from nodes.validate_input import validate_input
+from nodes.fast_path import fast_path
 from nodes.rewrite_query import rewrite_query
 from nodes.check_simple import check_simple_query
 from nodes.direct_answer import direct_answer
 from nodes.generate import generate_answer
+from nodes.search_knowledge import search_knowledge
 # from nodes.retrieve import retrieve
 # from nodes.rerank import rerank
 from nodes.tool_call import tool_call
@@ -25,6 +42,7 @@ from nodes.tool_call import tool_call
 from nodes.force_final_answer import force_final_answer
 from routers import (
     input_valid_router,
+    fast_path_router,
     check_simple_router,
     # check_answerable_router,
     should_continue,
@@ -32,6 +50,20 @@ from routers import (
 )
 from utils.logger import logger, session_logger
 from utils.llm_clients import AVAILABLE_TOOLS
+from utils.tool_executor import tool_executor
+from utils.prefetch import retrieval_prefetcher
+from utils.streaming_dispatch import streaming_dispatcher
+from utils.llm_usage import summarize_llm_calls, summarize_model_latency
+from utils.resilient_llm import llm_caller
+from utils.model_router import model_router
+from utils.http_client import shared_http_client
+from utils.node_timing import timed_node, summarize_node_timings
+from utils.tracing import tracer
+from utils.metrics import metrics_registry, observe_query
+from utils.history import compact_history
+from utils.retrieval_memory import update_memory, memory_outcome
+from utils.intent import intent_extractor
+from mcp_client.client_manager import get_mcp_manager
 
 
 class ChatbotApplication:
@@ -47,6 +79,8 @@ class ChatbotApplication:
         self.debug_mode = debug_mode if debug_mode is not None else LOGGING_CONFIG["debug_mode"]
         self.app = None
         self.session_stats = {}
+        # 쿼리마다 새 이벤트 루프를 만들면 HTTP 커넥션 풀이 재사용되지 않으므로 루프 하나를 유지
+        self._loop = asyncio.new_event_loop()
 
         # 세션 로그 시작
         session_logger.start_session()
@@ -57,6 +91,17 @@ class ChatbotApplication:
 
         self._validate_environment()
         self._create_workflow()
+        self.run(shared_http_client.warmup())
+        self.run(self._load_intent_gazetteer())
+
+    async def _load_intent_gazetteer(self):
+        """fast path 도시 목록을 weather_server 리소스(weather://supported-cities)로 갱신"""
+        if FAST_PATH_CONFIG["enabled"]:
+            await intent_extractor.load_gazetteer(await get_mcp_manager())
+
+    def run(self, coro):
+        """애플리케이션 이벤트 루프에서 coroutine 실행"""
+        return self._loop.run_until_complete(coro)
 
     def _validate_environment(self):
         """환경 설정 검증"""
@@ -93,9 +138,11 @@ class ChatbotApplication:
         """모든 노드를 워크플로우에 추가"""
         nodes = {
             "validate_input": validate_input,
+            "fast_path": fast_path,
             "rewrite": rewrite_query,
             "check_simple": check_simple_query,
             "direct_answer": direct_answer,
+            "search_knowledge": search_knowledge,
             "generate": generate_answer,
             "tools": tool_call,
             # "retrieve": retrieve,
@@ -105,8 +152,9 @@ class ChatbotApplication:
             "force_final_answer": force_final_answer
         }
 
+        # 노드별 실행 시간을 state["node_timings"]에 기록 (벤치마크 단계별 비교용)
         for name, func in nodes.items():
-            workflow.add_node(name, func)
+            workflow.add_node(name, timed_node(name, func))
             logger.debug(f"노드 추가: {name}")
 
     def _configure_routing(self, workflow: StateGraph):
@@ -118,11 +166,20 @@ class ChatbotApplication:
             "validate_input",
             input_valid_router,
             {
-                "rewrite": "rewrite",
+                "fast_path": "fast_path",
                 "error": END
             }
         )
 
+        workflow.add_conditional_edges(
+            "fast_path",
+            fast_path_router,
+            {
+                "answered": END,
+                "rewrite": "rewrite"
+            }
+        )
+
         workflow.add_edge("rewrite", "check_simple")
 
         workflow.add_conditional_edges(
@@ -130,10 +187,13 @@ class ChatbotApplication:
             check_simple_router,
             {
                 "direct_answer": "direct_answer",
+                "search_knowledge": "search_knowledge",
                 "generate": "generate"
             }
         )
 
+        workflow.add_edge("search_knowledge", "generate")
+
         workflow.add_conditional_edges(
             "direct_answer",
             should_continue,
@@ -175,7 +235,8 @@ class ChatbotApplication:
     async def process_query(
         self,
         user_query: str,
-        session_id: str = None
+        session_id: str = None,
+        use_rag_pipeline: bool = None
     ) -> Dict[str, Any]:
         """
         단일 쿼리 처리
@@ -183,64 +244,162 @@ class ChatbotApplication:
         Args:
             user_query: 사용자 질문
             session_id: 세션 ID (선택사항)
+            use_rag_pipeline: retrieve → rerank 고정 파이프라인 사용 여부 (None이면 설정값)
 
         Returns:
             처리 결과 딕셔너리
         """
         if not session_id:
-            session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            # 동시 요청이 같은 초에 들어와도 세션(검색 메모리, 선행 검색)이 섞이지 않도록 무작위 id 사용
+            session_id = f"session_{uuid.uuid4().hex}"
 
         logger.info(f"🔍 쿼리 처리 시작 [세션: {session_id}]")
         logger.info(f"질문: {user_query}")
 
+        if use_rag_pipeline is None:
+            use_rag_pipeline = RAG_PIPELINE_CONFIG["enabled"]
+
+        start_time = time.time()
+
+        session = self.session_stats.get(session_id, {})
+
         # 초기 상태 생성
         initial_state = {
             "session_id": session_id,
             "user_query": user_query,
-            "messages": self.session_stats.get(session_id, {}).get("messages", []),
+            "messages": session.get("messages", []),
             "processing_stage": "start",
             "tool_call_count": 0,
             "max_tool_calls": 3,
+            "tool_cache_hits": 0,
+            "tool_cache_misses": 0,
+            "llm_calls": [],
+            "model_routing": [],
+            "node_timings": [],
+            "use_rag_pipeline": use_rag_pipeline,
+            "deadline": start_time + LLM_RESILIENCE_CONFIG["query_deadline"],
             "error": None,
             "is_simple_query": None,
             "rewritten_query": None,
+            "fast_path_intent": None,
             "retrieve_results": [],
+            "result_set_id": None,
             "reranked_context": [],
+            "reranked_chunk_ids": [],
+            "retrieval_memory": session.get("retrieval_memory"),
+            "retrieval_memory_used": False,
+            "retrieval_memory_answered": False,
             "is_answerable": None,
             "final_answer": None,
             "confidence_score": None
         }
 
-        start_time = time.time()
+        # 쿼리 1건 = trace 1개 (노드, LLM, 도구, 서버 측 span의 루트)
+        with tracer.span("query", kind="query", session_id=session_id) as query_span:
+            try:
+                # 워크플로우 실행
+                final_state = await self.app.ainvoke(initial_state)
 
-        try:
-            # 워크플로우 실행
-            final_state = await self.app.ainvoke(initial_state)
+                execution_time = time.time() - start_time
 
-            execution_time = time.time() - start_time
+                # 결과 처리
+                result = self._process_result(final_state, execution_time, session_id)
+                streaming_dispatcher.cancel(session_id)
+                result["metadata"]["prefetch"] = {
+                    **retrieval_prefetcher.finish(session_id),
+                    "overall": retrieval_prefetcher.stats()
+                }
+                result["metadata"]["trace_id"] = query_span.trace_id
+                observe_query(final_state, execution_time, result["success"])
 
-            # 결과 처리
-            result = self._process_result(final_state, execution_time, session_id)
+                # 세션 상태 업데이트 (히스토리 압축 결과 포함)
+                result["metadata"]["history_compaction"] = self._update_session_stats(
+                    session_id, final_state, execution_time
+                )
 
-            # 세션 상태 업데이트
-            self._update_session_stats(session_id, final_state, execution_time)
+                logger.info(f"✅ 쿼리 처리 완료 ({execution_time:.2f}초)")
 
-            logger.info(f"✅ 쿼리 처리 완료 ({execution_time:.2f}초)")
+                return result
 
-            return result
+            except Exception as e:
+                execution_time = time.time() - start_time
+                logger.error(f"❌ 쿼리 처리 실패 ({execution_time:.2f}초): {e}", exc_info=True)
+                query_span.status = "error"
+                query_span.set(error=str(e))
+                observe_query(None, execution_time, success=False)
+                retrieval_prefetcher.finish(session_id)
+                streaming_dispatcher.cancel(session_id)
+
+                return {
+                    "session_id": session_id,
+                    "success": False,
+                    "error": str(e),
+                    "execution_time": execution_time,
+                    "final_answer": "죄송합니다. 처리 중 오류가 발생했습니다.",
+                    "processing_stage": "error",
+                    "token_usage": {"input_tokens": 0, "cached_tokens": 0, "response_tokens": 0, "total_tokens": 0},
+                    "metadata": {"rag_pipeline": use_rag_pipeline},
+                    "debug_info": traceback.format_exc() if self.debug_mode else None
+                }
 
-        except Exception as e:
-            execution_time = time.time() - start_time
-            logger.error(f"❌ 쿼리 처리 실패 ({execution_time:.2f}초): {e}", exc_info=True)
+    async def serve(self, host: str = SERVE_CONFIG["host"], port: int = SERVE_CONFIG["port"]):
+        """
+        HTTP 서빙 모드
 
-            return {
-                "session_id": session_id,
-                "success": False,
-                "error": str(e),
-                "execution_time": execution_time,
-                "final_answer": "죄송합니다. 처리 중 오류가 발생했습니다.",
-                "debug_info": traceback.format_exc() if self.debug_mode else None
-            }
+        - POST /query: {"query": "...", "session_id": "...", "use_rag_pipeline": true}
+        - GET /metrics: Prometheus text format 지표
+        - GET /health: 상태 확인
+        """
+        from aiohttp import web
+
+        async def handle_query(request: web.Request) -> web.Response:
+            try:
+                body = await request.json()
+            except json.JSONDecodeError:
+                return web.json_response({"error": "JSON 본문이 필요합니다"}, status=400)
+            if not isinstance(body, dict):
+                return web.json_response({"error": "JSON 본문은 객체여야 합니다"}, status=400)
+
+            query = body.get("query")
+            if query is not None and not isinstance(query, str):
+                return web.json_response({"error": "query는 문자열이어야 합니다"}, status=400)
+            query = (query or "").strip()
+            if not query:
+                return web.json_response({"error": "query가 비어있습니다"}, status=400)
+            if body.get("session_id") is not None and not isinstance(body["session_id"], str):
+                return web.json_response({"error": "session_id는 문자열이어야 합니다"}, status=400)
+            if body.get("use_rag_pipeline") is not None and not isinstance(body["use_rag_pipeline"], bool):
+                return web.json_response({"error": "use_rag_pipeline은 true/false여야 합니다"}, status=400)
+
+            result = await self.process_query(query, body.get("session_id"), body.get("use_rag_pipeline"))
+            result.pop("debug_info", None)
+            return web.json_response(result, dumps=lambda obj: json.dumps(obj, ensure_ascii=False, default=str))
+
+        async def handle_metrics(request: web.Request) -> web.Response:
+            return web.Response(
+                body=metrics_registry.render().encode("utf-8"),
+                headers={"Content-Type": metrics_registry.CONTENT_TYPE}
+            )
+
+        async def handle_health(request: web.Request) -> web.Response:
+            return web.json_response({"status": "ok", "tools": len(AVAILABLE_TOOLS)})
+
+        web_app = web.Application()
+        web_app.router.add_post("/query", handle_query)
+        web_app.router.add_get("/metrics", handle_metrics)
+        web_app.router.add_get("/health", handle_health)
+
+        runner = web.AppRunner(web_app)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        logger.info(f"🌐 서빙 시작: http://{host}:{port} (POST /query, GET /metrics)")
+        print(f"🌐 서빙 중: http://{host}:{port} (Ctrl+C로 종료)")
+
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
 
     def _process_result(
         self,
@@ -252,9 +411,11 @@ class ChatbotApplication:
         final_answer = final_state.get("final_answer", "답변을 생성할 수 없습니다.")
         processing_stage = final_state.get("processing_stage", "unknown")
 
-        # 토큰 사용량 계산
-        input_tokens = final_state.get("input_token_count", 0)
-        response_tokens = final_state.get("response_tokens", 0)
+        # 토큰 사용량 계산 (LLM 호출별 usage_metadata 합계)
+        llm_calls = final_state.get("llm_calls") or []
+        usage_summary = summarize_llm_calls(llm_calls)
+        input_tokens = usage_summary["input_tokens"]
+        response_tokens = usage_summary["output_tokens"]
 
         result = {
             "session_id": session_id,
@@ -265,13 +426,36 @@ class ChatbotApplication:
             "execution_time": execution_time,
             "token_usage": {
                 "input_tokens": input_tokens,
+                "cached_tokens": usage_summary["cached_tokens"],
                 "response_tokens": response_tokens,
                 "total_tokens": input_tokens + response_tokens
             },
             "metadata": {
                 "is_simple_query": final_state.get("is_simple_query"),
                 "rewritten_query": final_state.get("rewritten_query"),
-                "retrieval_time": final_state.get("retrieval_time", 0)
+                "fast_path_intent": final_state.get("fast_path_intent"),
+                "retrieval_time": final_state.get("retrieval_time", 0),
+                "llm_calls": llm_calls,
+                "stage_timings": summarize_node_timings(final_state.get("node_timings") or []),
+                "rag_pipeline": final_state.get("use_rag_pipeline", False),
+                "llm_resilience": {
+                    "retries": sum(call.get("attempts", 1) - 1 for call in llm_calls),
+                    "hedged": sum(1 for call in llm_calls if call.get("hedged")),
+                    "hedge_won": sum(1 for call in llm_calls if call.get("hedge_won")),
+                    "overall": llm_caller.stats()
+                },
+                "http_pool": shared_http_client.stats(),
+                "model_routing": {
+                    "decisions": final_state.get("model_routing") or [],
+                    "model_latency": summarize_model_latency(llm_calls),
+                    "overall": model_router.stats()
+                },
+                "retrieval_memory": memory_outcome(final_state),
+                "tool_cache": {
+                    "hits": final_state.get("tool_cache_hits", 0),
+                    "misses": final_state.get("tool_cache_misses", 0),
+                    "overall": tool_executor.cache.stats()
+                }
             }
         }
 
@@ -291,21 +475,42 @@ class ChatbotApplication:
         session_id: str,
         final_state: Dict[str, Any],
         execution_time: float
-    ):
-        """세션 통계 업데이트"""
+    ) -> Dict[str, Any]:
+        """세션 통계 업데이트 (다음 턴으로 넘길 히스토리는 압축하여 저장)"""
         if session_id not in self.session_stats:
             self.session_stats[session_id] = {
                 "created_at": datetime.now(),
                 "query_count": 0,
                 "total_execution_time": 0,
-                "messages": []
+                "messages": [],
+                "compaction": {"saved_bytes": 0, "saved_tokens": 0},
+                "retrieval_memory": None
             }
 
         stats = self.session_stats[session_id]
         stats["query_count"] += 1
         stats["total_execution_time"] += execution_time
         stats["last_activity"] = datetime.now()
-        stats["messages"] = final_state.get("messages", [])
+        stats["retrieval_memory"] = update_memory(
+            final_state, stats.get("retrieval_memory"), stats["query_count"]
+        )
+
+        messages = final_state.get("messages", [])
+        if not HISTORY_COMPACTION_CONFIG["enabled"]:
+            stats["messages"] = messages
+            return {}
+
+        compacted, compaction = compact_history(messages)
+        stats["messages"] = compacted
+        stats["compaction"]["saved_bytes"] += compaction["saved_bytes"]
+        stats["compaction"]["saved_tokens"] += compaction["saved_tokens"]
+        logger.info(
+            f"🗜️ 히스토리 압축 [{session_id}]: 메시지 {compaction['before']['messages']} → "
+            f"{compaction['after']['messages']}개, {compaction['before']['bytes']} → "
+            f"{compaction['after']['bytes']} bytes, {compaction['before']['tokens']} → "
+            f"{compaction['after']['tokens']} 토큰"
+        )
+        return compaction
 
     def interactive_chat(self):
         """대화형 채팅 모드"""
@@ -336,6 +541,7 @@ class ChatbotApplication:
                 elif user_input.lower() == 'clear':
                     if session_id in self.session_stats:
                         self.session_stats[session_id]["messages"] = []
+                        self.session_stats[session_id]["retrieval_memory"] = None
                     print("🗑️ 대화 히스토리가 초기화되었습니다.")
                     continue
 
@@ -363,7 +569,7 @@ class ChatbotApplication:
 
                 # 쿼리 처리
                 print("🤔 처리 중...")
-                result = asyncio.run(self.process_query(user_input, session_id))
+                result = self.run(self.process_query(user_input, session_id))
 
                 # 결과 출력
                 print(f"\n🤖 AI: {result['final_answer']}")
@@ -392,6 +598,9 @@ class ChatbotApplication:
         print(f"  • 총 실행 시간: {stats['total_execution_time']:.2f}초")
         print(f"  • 평균 응답 시간: {avg_time:.2f}초")
         print(f"  • 메시지 수: {len(stats['messages'])}개")
+        if stats.get("compaction"):
+            print(f"  • 히스토리 압축 절감: {stats['compaction']['saved_bytes']} bytes, "
+                  f"{stats['compaction']['saved_tokens']} 토큰 (다음 턴 프롬프트 기준)")
         print(f"  • 마지막 활동: {stats.get('last_activity', 'N/A')}")
 
     def _show_debug_info(self, result: Dict[str, Any]):
@@ -400,7 +609,30 @@ class ChatbotApplication:
         print(f"  • 처리 단계: {result['processing_stage']}")
         print(f"  • 실행 시간: {result['execution_time']:.3f}초")
         # print(f"  • 신뢰도: {result['confidence_score']:.2f}")
-        print(f"  • 토큰 사용량: {result['token_usage']['total_tokens']}")
+        print(f"  • 토큰 사용량: {result['token_usage']['total_tokens']} "
+              f"(입력 {result['token_usage']['input_tokens']}, 캐시 적중 {result['token_usage']['cached_tokens']})")
+        for call in result['metadata'].get('llm_calls', []):
+            print(f"    - {call['node']} ({call['model']}): 입력 {call['input_tokens']} / "
+                  f"캐시 {call['cached_tokens']} / 출력 {call['output_tokens']} 토큰, {call['latency']:.2f}초")
+
+        resilience = result['metadata'].get('llm_resilience')
+        if resilience:
+            print(f"  • LLM 재시도: {resilience['retries']}회, 헤징: {resilience['hedged']}회 "
+                  f"(헤징 요청 승리 {resilience['hedge_won']}회)")
+
+        for decision in result['metadata'].get('model_routing', {}).get('decisions', []):
+            escalation = f" → 승격 ({decision['escalation_reason']})" if decision['escalated'] else ""
+            print(f"  • 모델 라우팅: {decision['node']} {decision['model']} ({decision['reason']}){escalation}")
+
+        http_pool = result['metadata'].get('http_pool')
+        if http_pool:
+            print(f"  • HTTP 커넥션: 요청 {http_pool['requests']}회 / 새 연결 {http_pool['new_connections']}개 "
+                  f"(재사용률 {http_pool['reuse_rate']:.1%})")
+
+        tool_cache = result['metadata'].get('tool_cache')
+        if tool_cache:
+            print(f"  • 도구 캐시: 적중 {tool_cache['hits']} / 미스 {tool_cache['misses']} "
+                  f"(전체 적중률 {tool_cache['overall']['hit_rate']:.1%})")
 
         if result['metadata']['rewritten_query']:
             print(f"  • 재작성된 쿼리: {result['metadata']['rewritten_query']}")
@@ -439,11 +671,22 @@ class ChatbotApplication:
     def benchmark_test(
         self,
         test_queries: List[str],
-        iterations: int = 3
+        iterations: int = 3,
+        compare_rag_pipeline: bool = False
     ) -> Dict[str, Any]:
-        """벤치마크 테스트 실행"""
+        """
+        벤치마크 테스트 실행
+
+        Args:
+            test_queries: 테스트 쿼리 목록
+            iterations: 쿼리별 반복 횟수
+            compare_rag_pipeline: True이면 retrieve → rerank 고정 파이프라인 ON/OFF를
+                번갈아 실행하여 end-to-end 지연 시간 차이를 함께 기록
+        """
         logger.info(f"🏃 벤치마크 테스트 시작: {len(test_queries)}개 쿼리, {iterations}회 반복")
 
+        variants = [True, False] if compare_rag_pipeline else [None]
+
         results = []
         total_start_time = time.time()
 
@@ -453,41 +696,59 @@ class ChatbotApplication:
             query_results = []
 
             for iteration in range(iterations):
-                session_id = f"benchmark_{i}_{iteration}"
-                result = asyncio.run(self.process_query(query, session_id))
-
-                query_results.append({
-                    "iteration": iteration + 1,
-                    "success": result["success"],
-                    "execution_time": result["execution_time"],
-                    "token_usage": result["token_usage"]["total_tokens"],
-                    "processing_stage": result["processing_stage"]
-                })
+                for variant in variants:
+                    suffix = "" if variant is None else f"_{'rag_on' if variant else 'rag_off'}"
+                    session_id = f"benchmark_{i}_{iteration}{suffix}"
+                    result = self.run(self.process_query(query, session_id, use_rag_pipeline=variant))
+
+                    query_results.append({
+                        "iteration": iteration + 1,
+                        "success": result["success"],
+                        "execution_time": result["execution_time"],
+                        "token_usage": result["token_usage"]["total_tokens"],
+                        "cached_tokens": result["token_usage"].get("cached_tokens", 0),
+                        "processing_stage": result["processing_stage"],
+                        "stage_timings": result["metadata"].get("stage_timings", {}),
+                        "rag_pipeline": result["metadata"].get("rag_pipeline"),
+                        "tool_cache": {
+                            "hits": result["metadata"].get("tool_cache", {}).get("hits", 0),
+                            "misses": result["metadata"].get("tool_cache", {}).get("misses", 0)
+                        },
+                        "prefetch_hit": result["metadata"].get("prefetch", {}).get("hit", False),
+                        "history_saved_tokens": result["metadata"].get("history_compaction", {}).get("saved_tokens", 0),
+                        "hedged": result["metadata"].get("llm_resilience", {}).get("hedged", 0),
+                        "hedge_won": result["metadata"].get("llm_resilience", {}).get("hedge_won", 0),
+                        "fast_path_intent": result["metadata"].get("fast_path_intent"),
+                        "escalations": sum(
+                            1 for d in result["metadata"].get("model_routing", {}).get("decisions", []) if d["escalated"]
+                        ),
+                        "saved_tool_calls": result["metadata"].get("retrieval_memory", {}).get("saved_tool_calls", 0)
+                    })
 
             # 통계 계산
-            successful_runs = [r for r in query_results if r["success"]]
-            if successful_runs:
-                avg_time = sum(r["execution_time"] for r in successful_runs) / len(successful_runs)
-                avg_tokens = sum(r["token_usage"] for r in successful_runs) / len(successful_runs)
-                success_rate = len(successful_runs) / iterations
-            else:
-                avg_time = 0
-                avg_tokens = 0
-                success_rate = 0
-
-            results.append({
+            statistics = self._summarize_runs(query_results)
+            query_summary = {
                 "query": query,
                 "iterations": query_results,
-                "statistics": {
-                    "success_rate": success_rate,
-                    "avg_execution_time": avg_time,
-                    "avg_token_usage": avg_tokens,
-                    "total_runs": iterations,
-                    "successful_runs": len(successful_runs)
-                }
-            })
+                "statistics": statistics
+            }
+
+            if compare_rag_pipeline:
+                query_summary["rag_pipeline_comparison"] = self._compare_rag_pipeline(query_results)
 
-            logger.info(f"  성공률: {success_rate:.1%}, 평균 시간: {avg_time:.2f}초")
+            results.append(query_summary)
+
+            logger.info(
+                f"  성공률: {statistics['success_rate']:.1%}, "
+                f"평균 시간: {statistics['avg_execution_time']:.2f}초"
+            )
+            if compare_rag_pipeline:
+                comparison = query_summary["rag_pipeline_comparison"]
+                logger.info(
+                    f"  파이프라인 ON {comparison['pipeline_on']['avg_execution_time']:.2f}초 / "
+                    f"OFF {comparison['pipeline_off']['avg_execution_time']:.2f}초 "
+                    f"(차이: {comparison['latency_delta']:+.2f}초)"
+                )
 
         total_time = time.time() - total_start_time
 
@@ -496,29 +757,169 @@ class ChatbotApplication:
                 "total_queries": len(test_queries),
                 "iterations_per_query": iterations,
                 "total_execution_time": total_time,
+                "compare_rag_pipeline": compare_rag_pipeline,
                 "timestamp": datetime.now().isoformat()
             },
             "results": results,
             "overall_stats": {
                 "total_success_rate": sum(r["statistics"]["success_rate"] for r in results) / len(results),
                 "avg_execution_time": sum(r["statistics"]["avg_execution_time"] for r in results) / len(results),
-                "avg_token_usage": sum(r["statistics"]["avg_token_usage"] for r in results) / len(results)
+                "avg_token_usage": sum(r["statistics"]["avg_token_usage"] for r in results) / len(results),
+                "tool_cache": tool_executor.cache.stats(),
+                "prefetch": retrieval_prefetcher.stats(),
+                "llm_resilience": llm_caller.stats(),
+                "model_routing": model_router.stats(),
+                "http_pool": shared_http_client.stats()
             }
         }
 
+        if compare_rag_pipeline:
+            on_times = [r["rag_pipeline_comparison"]["pipeline_on"]["avg_execution_time"] for r in results]
+            off_times = [r["rag_pipeline_comparison"]["pipeline_off"]["avg_execution_time"] for r in results]
+            benchmark_result["overall_stats"]["rag_pipeline_comparison"] = {
+                "pipeline_on_avg_execution_time": sum(on_times) / len(on_times),
+                "pipeline_off_avg_execution_time": sum(off_times) / len(off_times),
+                "latency_delta": (sum(on_times) - sum(off_times)) / len(results)
+            }
+
         logger.info(f"✅ 벤치마크 테스트 완료 ({total_time:.2f}초)")
 
         return benchmark_result
 
+    def conversation_benchmark(self, turns: List[str], iterations: int = 1) -> Dict[str, Any]:
+        """
+        멀티턴 벤치마크 (turns를 한 세션에서 순서대로 질문)
+
+        후속 질문에서 세션 검색 메모리로 절약한 도구 왕복(retrieve → rerank) 수를 함께 기록
+
+        Args:
+            turns: 대화 순서대로의 질문 목록
+            iterations: 대화 반복 횟수 (반복마다 새 세션)
+        """
+        logger.info(f"🏃 멀티턴 벤치마크 시작: {len(turns)}턴, {iterations}회 반복")
+
+        conversations = []
+        total_start_time = time.time()
+
+        for iteration in range(iterations):
+            session_id = f"benchmark_conversation_{iteration}"
+            turn_results = []
+
+            for turn, query in enumerate(turns, 1):
+                result = self.run(self.process_query(query, session_id))
+                memory = result["metadata"].get("retrieval_memory", {})
+                turn_results.append({
+                    "turn": turn,
+                    "query": query,
+                    "success": result["success"],
+                    "execution_time": result["execution_time"],
+                    "token_usage": result["token_usage"]["total_tokens"],
+                    "processing_stage": result["processing_stage"],
+                    "stage_timings": result["metadata"].get("stage_timings", {}),
+                    "memory_used": memory.get("used", False),
+                    "memory_hit": memory.get("hit", False),
+                    "memory_fallback": memory.get("fallback", False),
+                    "saved_tool_calls": memory.get("saved_tool_calls", 0)
+                })
+
+            conversations.append({
+                "iteration": iteration + 1,
+                "session_id": session_id,
+                "turns": turn_results,
+                "statistics": self._summarize_runs(turn_results)
+            })
+
+        all_turns = [turn for conversation in conversations for turn in conversation["turns"]]
+        total_time = time.time() - total_start_time
+
+        # 기존 비교 도구(compare 모드)가 턴별 지연 시간을 비교할 수 있도록 results 형식 유지
+        results = []
+        for turn, query in enumerate(turns, 1):
+            runs = [{**t, "iteration": i + 1} for i, c in enumerate(conversations) for t in c["turns"] if t["turn"] == turn]
+            results.append({
+                "query": f"[turn {turn}] {query}",
+                "iterations": runs,
+                "statistics": self._summarize_runs(runs)
+            })
+
+        benchmark_result = {
+            "test_info": {
+                "mode": "conversation",
+                "total_turns": len(turns),
+                "iterations": iterations,
+                "total_execution_time": total_time,
+                "timestamp": datetime.now().isoformat()
+            },
+            "conversations": conversations,
+            "results": results,
+            "overall_stats": {
+                "total_success_rate": sum(r["statistics"]["success_rate"] for r in results) / len(results),
+                "avg_execution_time": sum(r["statistics"]["avg_execution_time"] for r in results) / len(results),
+                "avg_token_usage": sum(r["statistics"]["avg_token_usage"] for r in results) / len(results),
+                "retrieval_memory": {
+                    "used": sum(1 for t in all_turns if t["memory_used"]),
+                    "hits": sum(1 for t in all_turns if t["memory_hit"]),
+                    "fallbacks": sum(1 for t in all_turns if t["memory_fallback"]),
+                    "saved_tool_calls": sum(t["saved_tool_calls"] for t in all_turns)
+                },
+                "tool_cache": tool_executor.cache.stats(),
+                "llm_resilience": llm_caller.stats(),
+                "http_pool": shared_http_client.stats()
+            }
+        }
+
+        logger.info(f"✅ 멀티턴 벤치마크 완료 ({total_time:.2f}초)")
+
+        return benchmark_result
+
+    def _summarize_runs(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """반복 실행 결과 통계 계산"""
+        successful_runs = [r for r in runs if r["success"]]
+        if successful_runs:
+            avg_time = sum(r["execution_time"] for r in successful_runs) / len(successful_runs)
+            avg_tokens = sum(r["token_usage"] for r in successful_runs) / len(successful_runs)
+            success_rate = len(successful_runs) / len(runs)
+        else:
+            avg_time = 0
+            avg_tokens = 0
+            success_rate = 0
+
+        return {
+            "success_rate": success_rate,
+            "avg_execution_time": avg_time,
+            "avg_token_usage": avg_tokens,
+            "total_runs": len(runs),
+            "successful_runs": len(successful_runs)
+        }
+
+    def _compare_rag_pipeline(self, runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """고정 파이프라인 ON/OFF 실행 결과 비교"""
+        pipeline_on = self._summarize_runs([r for r in runs if r["rag_pipeline"]])
+        pipeline_off = self._summarize_runs([r for r in runs if not r["rag_pipeline"]])
+        delta = pipeline_on["avg_execution_time"] - pipeline_off["avg_execution_time"]
+
+        return {
+            "pipeline_on": pipeline_on,
+            "pipeline_off": pipeline_off,
+            "latency_delta": delta,
+            "latency_delta_ratio": (
+                delta / pipeline_off["avg_execution_time"] if pipeline_off["avg_execution_time"] else None
+            )
+        }
+
 
 def main():
     """메인 실행 함수"""
     import argparse
 
+    # 벤치마크 결과 비교 (인자 처리는 compare 모듈에서, LLM/도구 초기화 불필요)
+    if compare.is_compare_mode(sys.argv[1:]):
+        compare.main(sys.argv[1:])
+
     parser = argparse.ArgumentParser(description="LangGraph AI 챗봇")
     parser.add_argument(
         "--mode",
-        choices=["chat", "test", "benchmark"],
+        choices=["chat", "test", "benchmark", "compare", "serve"],
         default="chat",
         help="실행 모드 선택"
     )
@@ -535,7 +936,7 @@ def main():
     parser.add_argument(
         "--benchmark-queries",
         nargs="+",
-        default=["안녕하세요", "지금 몇 시야?", "AAPL 주가 알려줘", "지금 서울 날씨를 알려줘"],
+        default=["안녕하세요", "지금 몇 시야?", "AAPL 주가 알려줘", "지금 서울 날씨를 알려줘", "파일서버 권한 신청 방법 알려줘"],
         help="벤치마크 테스트 쿼리들"
     )
     parser.add_argument(
@@ -544,6 +945,34 @@ def main():
         default=1,
         help="벤치마크 반복 횟수"
     )
+    parser.add_argument(
+        "--conversation",
+        action="store_true",
+        help="벤치마크 쿼리들을 한 세션의 연속된 대화로 실행 (멀티턴, 세션 검색 메모리 효과 측정)"
+    )
+    parser.add_argument(
+        "--compare-rag-pipeline",
+        action="store_true",
+        help="벤치마크에서 retrieve → rerank 고정 파이프라인 ON/OFF 지연 시간 비교"
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=SERVE_CONFIG["host"],
+        help="serve 모드 바인드 주소"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=SERVE_CONFIG["port"],
+        help="serve 모드 포트"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        help="chat/test/benchmark 모드 종료 시 지표(Prometheus text format)를 저장할 경로"
+    )
 
     args = parser.parse_args()
 
@@ -555,19 +984,43 @@ def main():
             # 대화형 모드
             app.interactive_chat()
 
+        elif args.mode == "serve":
+            # HTTP 서빙 모드 (/metrics 포함)
+            app.run(app.serve(args.host, args.port))
+
         elif args.mode == "test":
             # 단일 쿼리 테스트
             query = args.query or "안녕하세요!"
-            result = asyncio.run(app.process_query(query))
+            result = app.run(app.process_query(query))
 
             print(f"\n질문: {query}")
             print(f"답변: {result['final_answer']}")
             print(f"처리 시간: {result['execution_time']:.3f}초")
             print(f"성공 여부: {'✅' if result['success'] else '❌'}")
 
+        elif args.mode == "benchmark" and args.conversation:
+            # 멀티턴 벤치마크 모드
+            benchmark_result = app.conversation_benchmark(args.benchmark_queries, args.iterations)
+
+            output_file = f"benchmark_conversation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(benchmark_result, f, ensure_ascii=False, indent=2, default=str)
+
+            memory = benchmark_result["overall_stats"]["retrieval_memory"]
+            print("\n📊 멀티턴 벤치마크 결과:")
+            print(f"  총 성공률: {benchmark_result['overall_stats']['total_success_rate']:.1%}")
+            print(f"  턴 평균 실행 시간: {benchmark_result['overall_stats']['avg_execution_time']:.2f}초")
+            print(f"  검색 메모리 사용: {memory['used']}턴 (적중 {memory['hits']}, 재검색 {memory['fallbacks']})")
+            print(f"  절약한 도구 호출: {memory['saved_tool_calls']}회")
+            print(f"  결과 저장됨: {output_file}")
+
         elif args.mode == "benchmark":
             # 벤치마크 모드
-            benchmark_result = app.benchmark_test(args.benchmark_queries, args.iterations)
+            benchmark_result = app.benchmark_test(
+                args.benchmark_queries,
+                args.iterations,
+                compare_rag_pipeline=args.compare_rag_pipeline
+            )
 
             # 결과 저장
             output_file = f"benchmark_result_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -578,6 +1031,11 @@ def main():
             print(f"  총 성공률: {benchmark_result['overall_stats']['total_success_rate']:.1%}")
             print(f"  평균 실행 시간: {benchmark_result['overall_stats']['avg_execution_time']:.2f}초")
             print(f"  평균 토큰 사용량: {benchmark_result['overall_stats']['avg_token_usage']:.0f}")
+            if args.compare_rag_pipeline:
+                comparison = benchmark_result["overall_stats"]["rag_pipeline_comparison"]
+                print(f"  RAG 파이프라인 ON 평균: {comparison['pipeline_on_avg_execution_time']:.2f}초")
+                print(f"  RAG 파이프라인 OFF 평균: {comparison['pipeline_off_avg_execution_time']:.2f}초")
+                print(f"  지연 시간 차이 (ON - OFF): {comparison['latency_delta']:+.2f}초")
             print(f"  결과 저장됨: {output_file}")
 
     except KeyboardInterrupt:
@@ -589,6 +1047,10 @@ def main():
         print(f"❌ 오류: {e}")
         session_logger.end_session()
         sys.exit(1)
+    finally:
+        if args.metrics_file:
+            metrics_registry.dump(args.metrics_file)
+            print(f"📈 지표 저장됨: {args.metrics_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,70 @@
+"""
+벤치마크 결과 비교 (회귀 검사) 실행 모듈
+
+저장된 벤치마크 JSON만 비교하므로 LLM 클라이언트, MCP 클라이언트, 그래프 모듈을 import하지 않습니다.
+app.py는 --mode compare일 때 무거운 import 전에 이 모듈로 분기합니다.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from config import BENCHMARK_COMPARE_CONFIG
+from utils.benchmark_compare import compare_benchmarks, format_comparison
+
+
+def is_compare_mode(argv: List[str]) -> bool:
+    """명령행 인자가 --mode compare (또는 --mode=compare)인지 확인"""
+    for i, arg in enumerate(argv):
+        if arg == "--mode" and i + 1 < len(argv):
+            return argv[i + 1] == "compare"
+        if arg.startswith("--mode="):
+            return arg.split("=", 1)[1] == "compare"
+    return False
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="LangGraph AI 챗봇 - 벤치마크 결과 비교")
+    parser.add_argument(
+        "--mode",
+        choices=["compare"],
+        default="compare",
+        help="실행 모드 (app.py와 같은 명령행 형식 유지용)"
+    )
+    parser.add_argument(
+        "--compare-files",
+        nargs="+",
+        required=True,
+        help="비교할 벤치마크 결과 JSON 파일들 (첫 번째 파일이 기준선)"
+    )
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=BENCHMARK_COMPARE_CONFIG["max_regression_ratio"],
+        help="회귀로 판정할 평균 지연 시간 증가율 (예: 0.1 = 10%%)"
+    )
+    parser.add_argument(
+        "--compare-output",
+        type=str,
+        help="비교 결과 JSON 저장 경로"
+    )
+    args = parser.parse_args(argv)
+
+    if len(args.compare_files) < 2:
+        parser.error("--mode compare에는 --compare-files로 2개 이상의 파일이 필요합니다")
+
+    config = {**BENCHMARK_COMPARE_CONFIG, "max_regression_ratio": args.regression_threshold}
+    comparison = compare_benchmarks(args.compare_files, config)
+    print(format_comparison(comparison))
+
+    if args.compare_output:
+        with open(args.compare_output, 'w', encoding='utf-8') as f:
+            json.dump(comparison, f, ensure_ascii=False, indent=2)
+        print(f"\n  비교 결과 저장됨: {args.compare_output}")
+
+    sys.exit(1 if comparison["has_regression"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,38 @@ load_dotenv()
 DEBUG_MODE = os.getenv("DEBUG_MODE", "false").lower() == "true"
 
 # 모델 설정
+# stream_usage: 스트리밍 호출에서도 토큰 사용량(캐시 적중 토큰 포함) 수집
+# max_retries: 재시도는 LLM_RESILIENCE_CONFIG에서 deadline 기준으로 처리하므로 클라이언트 재시도는 끔
 GPT_4O_MINI_CONFIG = {
     "model": "gpt-4o-mini",
     "temperature": 0.1,
+    "stream_usage": True,
+    "max_retries": 0,
 }
 
 GPT_4O_CONFIG = {
     "model": "gpt-4o",
     "temperature": 0.1,
+    "stream_usage": True,
+    "max_retries": 0,
+}
+
+# LLM 클라이언트 공용 HTTP 커넥션 풀 설정
+# - http2: h2 패키지가 설치된 경우에만 적용
+# - warmup: 시작 시 커넥션을 미리 열어 첫 요청의 TLS 핸드셰이크 비용 제거
+#   (url이 None이면 OPENAI_BASE_URL 또는 https://api.openai.com/v1)
+HTTP_CLIENT_CONFIG = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 60.0,
+    "http2": True,
+    "timeout": 60.0,
+    "connect_timeout": 10.0,
+    "warmup": {
+        "enabled": os.getenv("LLM_HTTP_WARMUP", "false").lower() == "true",
+        "url": None,
+        "connections": 2,
+    },
 }
 
 # 모델별 토큰 제한
@@ -32,6 +56,15 @@ PROCESSING_LIMITS = {
     "max_conversation_history": 10,
 }
 
+# 세션 히스토리 압축 설정 (턴 종료 후 다음 턴으로 넘길 메시지 정리)
+# - max_turns: 보관할 최근 대화 턴 수
+# - summary_max_chars: 도구 결과 1건의 요약 최대 길이
+HISTORY_COMPACTION_CONFIG = {
+    "enabled": True,
+    "max_turns": PROCESSING_LIMITS["max_conversation_history"] // 2,
+    "summary_max_chars": 200,
+}
+
 # Processing Stages
 PROCESSING_STAGES = {
     "VALIDATION_FAILED": "validation_failed",
@@ -46,7 +79,9 @@ PROCESSING_STAGES = {
     "ASKED_FOR_MORE_INFO": "asked_for_more_info",
     "TOOL_ASSISTED_GENERATE": "tool_asisted_generate",
     "TOOL_ASSISTED_DIRECT_ANSWER": "tool_assisted_direct_answer",
-    "FORCE_ANSWERED": "force_answered"
+    "SEARCHED_KNOWLEDGE": "searched_knowledge",
+    "FORCE_ANSWERED": "force_answered",
+    "FAST_PATH_ANSWERED": "fast_path_answered"
 }
 
 # 로깅 설정
@@ -76,3 +111,161 @@ RERANK_CONFIG = {
     "top_k": 5,
     "use_fp16": True
 }
+
+# Retrieve → Rerank 고정 파이프라인 설정
+# enabled=True이면 check_simple 이후 search_knowledge 노드가 LLM 판단 없이
+# 검색과 재순위화를 연속 수행하여 reranked_context를 채웁니다.
+RAG_PIPELINE_CONFIG = {
+    "enabled": True,
+    "collection_name": CHROMA_CONFIG["collection_name"],
+    "retrieve_top_k": RETRIEVE_CONFIG["top_k"],
+    "rerank_top_k": RERANK_CONFIG["top_k"],
+}
+
+# 도구 실행 설정
+# - max_concurrency: 한 턴에서 동시에 실행할 최대 tool call 수
+# - timeouts: 도구별 타임아웃(초), 지정되지 않은 도구는 default_timeout 사용
+TOOL_EXECUTION_CONFIG = {
+    "max_concurrency": 4,
+    "default_timeout": 30.0,
+    "timeouts": {
+        "get_current_time": 5.0,
+        "get_stock_price": 15.0,
+        "get_current_weather": 15.0,
+        "retrieve_documents": 60.0,
+        "retrieve_documents_batch": 90.0,
+        "retrieve_documents_multi": 90.0,
+        "rerank_documents": 120.0,
+    },
+}
+
+# 도구 결과 캐시 설정
+# - ttl: 캐시 유지 시간(초), 0이면 캐시하지 않음 (정책이 없는 도구도 캐시하지 않음)
+# - invalidate_on_collection_change: rag_ingest가 컬렉션을 갱신하면 무효화
+#   (retrieve 결과는 result_set_id를 포함하므로 ttl은 결과 세트 보관 기간(RESULT_SET_TTL_SECONDS, 기본 1800초)보다 짧게 유지,
+#    결과 세트가 개수 제한으로 먼저 제거되면 rerank가 알리는 시점에 해당 retrieve 캐시를 무효화)
+TOOL_CACHE_CONFIG = {
+    "enabled": True,
+    "max_entries": 512,
+    "collection_versions_path": os.path.join(CHROMA_CONFIG["persist_dir"], "collection_versions.json"),
+    "policies": {
+        "get_current_time": {"ttl": 0},
+        "get_stock_price": {"ttl": 30},
+        "get_current_weather": {"ttl": 600},
+        "retrieve_documents": {"ttl": 900, "invalidate_on_collection_change": True},
+        "retrieve_documents_batch": {"ttl": 900, "invalidate_on_collection_change": True},
+        "retrieve_documents_multi": {"ttl": 900, "invalidate_on_collection_change": True},
+        "rerank_documents": {"ttl": 900, "invalidate_on_collection_change": True},
+    },
+}
+
+# 검색 선행 실행(speculative prefetch) 설정
+# - 쿼리 재작성 직후 재작성 쿼리로 실행 (검색 노드/LLM은 재작성 쿼리로 retrieve_documents를 호출하므로
+#   사용자 원문으로 선행 실행하면 인자가 일치하지 않음)
+# - 이후 인자가 일치하는 retrieve_documents 호출은 선행 결과로 응답
+PREFETCH_CONFIG = {
+    "enabled": False,
+    "collection_name": CHROMA_CONFIG["collection_name"],
+    "top_k": RETRIEVE_CONFIG["top_k"],
+}
+
+# 스트리밍 도구 선행 실행 설정
+# enabled=True이면 generate/direct_answer가 응답을 스트리밍으로 받으면서
+# 인자가 확정된 tool call부터 즉시 실행합니다 (ToolMessage 순서는 기존과 동일)
+STREAMING_DISPATCH_CONFIG = {
+    "enabled": False,
+}
+
+# LLM 호출 안정화 설정 (tail latency 대응)
+# - query_deadline: 쿼리 1건의 전체 처리 기한(초), 호출별 타임아웃은 남은 시간으로 제한
+# - max_retries / backoff_*: 실패 시 재시도 횟수와 지수 백오프(full jitter) 범위
+# - hedge_*: 최근 지연 시간의 hedge_percentile 분위수가 지나도 응답이 없으면 동일 요청을 한 번 더 전송
+#   (샘플이 hedge_min_samples 미만이면 hedge_initial_delay 사용, 요청 비용이 늘어나므로 기본 비활성화)
+LLM_RESILIENCE_CONFIG = {
+    "query_deadline": 90.0,
+    "call_timeout": 45.0,
+    "max_retries": 2,
+    "backoff_base": 0.5,
+    "backoff_max": 4.0,
+    "hedge_enabled": False,
+    "hedge_percentile": 95,
+    "hedge_min_samples": 20,
+    "hedge_initial_delay": 8.0,
+    "latency_window": 200,
+}
+
+# 벤치마크 비교(--mode compare) 회귀 판정 설정
+# - max_regression_ratio: 평균 지연 시간 증가율이 이 값을 넘으면 회귀 (신뢰 구간 하한이 0보다 클 때만)
+# - min_delta_seconds: 증가량이 이보다 작으면 회귀로 보지 않음 (짧은 단계의 노이즈 방지)
+# - gate_stages: 노드(단계)별 회귀도 종료 코드에 반영할지 여부
+BENCHMARK_COMPARE_CONFIG = {
+    "max_regression_ratio": 0.10,
+    "min_delta_seconds": 0.05,
+    "confidence": 0.95,
+    "bootstrap_resamples": 2000,
+    "seed": 0,
+    "gate_stages": False,
+}
+
+# 트레이싱 설정
+# span(그래프 노드, LLM 호출, MCP 도구 호출, 서버 측 단계)을 JSONL로 기록
+# MCP 서버는 langgraph/.cache/traces.jsonl에 기록하므로 경로를 바꾸면 서버 span과 파일이 분리됨
+TRACING_CONFIG = {
+    "enabled": os.getenv("TRACING_ENABLED", "false").lower() == "true",
+    "path": os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "traces.jsonl"),
+    "service": "chatbot",
+}
+
+# 지표(Prometheus text format) 설정
+# - serve 모드: GET /metrics로 노출, CLI 모드: --metrics-file 경로로 종료 시 저장
+METRICS_CONFIG = {
+    "namespace": "chatbot",
+    "latency_buckets": (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0),
+}
+
+# serve 모드(HTTP) 설정
+SERVE_CONFIG = {
+    "host": os.getenv("CHATBOT_HOST", "127.0.0.1"),
+    "port": int(os.getenv("CHATBOT_PORT", "8080")),
+}
+
+# 세션 검색 메모리 설정
+# 후속 질문(지시어/연결어 포함, utils.retrieval_memory.FOLLOW_UP_MARKERS_*)이면 이전 턴의 rerank 결과로 먼저 답변을 시도하고,
+# 부족할 때만 LLM이 retrieve_documents를 다시 호출 (절약한 retrieve → rerank 왕복은 결과에 기록)
+# - max_age_turns: 검색 후 이 턴 수가 지나면 메모리를 사용하지 않음
+RETRIEVAL_MEMORY_CONFIG = {
+    "enabled": True,
+    "max_age_turns": 3,
+}
+
+# 결정적 의도 분류 fast path 설정
+# 시간/날씨/주가 질문은 패턴·도시 목록(weather://supported-cities)·티커로 도구와 인자를 로컬에서 결정하고
+# MCP 도구를 바로 호출 (rewrite, check_simple, 도구 선택용 gpt-4o 호출 생략)
+# - formatter: "template"(LLM 호출 없음) 또는 "llm"(gpt-4o-mini로 답변 문장 1회 생성)
+# - max_query_chars: 이보다 긴 질문은 복합 질문일 수 있으므로 기존 경로 사용
+FAST_PATH_CONFIG = {
+    "enabled": True,
+    "formatter": "template",
+    "max_query_chars": 40,
+    "default_timezone": "Asia/Seoul",
+}
+
+# 모델 라우팅 설정 (direct_answer, generate)
+# 노드별로 gpt-4o-mini를 먼저 사용하고, 응답이 신뢰도 검사를 통과하지 못하면 gpt-4o로 한 번 더 호출
+# - max_mini_context_tokens: 참고 컨텍스트가 이보다 크면 처음부터 gpt-4o
+# - max_mini_tool_iterations: 도구 호출 반복이 이 횟수 이상이면 처음부터 gpt-4o (여러 도구 결과 종합)
+# - min_confidence: 응답 토큰 평균 확률(logprobs)의 하한, logprobs가 없으면 문구 검사만 수행
+# - min_context_answer_chars: 참고 컨텍스트가 있을 때 이보다 짧은 답변은 불충분으로 판단
+MODEL_ROUTING_CONFIG = {
+    "enabled": True,
+    "nodes": ["direct_answer", "generate"],
+    "max_mini_context_tokens": 3000,
+    "max_mini_tool_iterations": 2,
+    "use_logprobs": True,
+    "min_confidence": 0.75,
+    "min_context_answer_chars": 20,
+    "uncertain_phrases": [
+        "잘 모르", "알 수 없", "확인할 수 없", "정보가 없", "찾을 수 없", "답변하기 어렵",
+        "I don't know", "I'm not sure", "cannot determine"
+    ],
+}
@@ -1,4 +1,5 @@
 from typing import Dict, List, Optional
+import asyncio
 import sys
 from pathlib import Path
 
@@ -76,8 +77,16 @@ class MCPClientManager:
         # MultiServerMCPClient 생성
         self.client = MultiServerMCPClient(connections)
 
-        # 모든 도구 자동 로드
-        self.tools = await self.client.get_tools()
+        # 서버별로 도구 로드 (도구 metadata에 소속 MCP 서버 이름 기록 - 서버별 지표 집계용)
+        server_names = list(connections.keys())
+        server_tools = await asyncio.gather(
+            *(self.client.get_tools(server_name=name) for name in server_names)
+        )
+        self.tools = []
+        for server_name, tools in zip(server_names, server_tools):
+            for tool in tools:
+                tool.metadata = {**(tool.metadata or {}), "mcp_server": server_name}
+            self.tools.extend(tools)
 
         print(f"✅ MCP 초기화 완료: {len(self.tools)}개 도구 로드됨")
         for tool in self.tools:
@@ -1,27 +1,35 @@
-from langchain_core.messages import SystemMessage
-
 from states import ChatState
-from config import PROCESSING_STAGES
-from prompts import SYSTEM_PROMPTS
+from config import PROCESSING_STAGES, GPT_4O_MINI_CONFIG
+from prompts import SYSTEM_PROMPTS, build_cacheable_prompt
 from utils.llm_clients import gpt_4o_mini
+from utils.prefetch import retrieval_prefetcher
+from utils.resilient_llm import invoke_llm
 from utils.logger import logger
 
 
-def check_simple_query(state: ChatState) -> ChatState:
+async def check_simple_query(state: ChatState) -> ChatState:
     """단순 쿼리 검사"""
     messages = state.get("messages", [])
     user_message = messages[-1]
 
     logger.info(f"[Check Simple] user_message(rewritten): {user_message.content}")
-    system_prompt = SystemMessage(content=SYSTEM_PROMPTS["check_simple"])
-    prompt = [system_prompt, user_message]
+    prompt = build_cacheable_prompt(SYSTEM_PROMPTS["check_simple"], [user_message])
 
-    result = gpt_4o_mini.invoke(prompt).content.strip()
+    response, llm_call = await invoke_llm(
+        "check_simple", GPT_4O_MINI_CONFIG["model"], prompt,
+        llm=gpt_4o_mini, deadline=state.get("deadline")
+    )
+    result = response.content.strip()
     is_simple_query = result.upper().startswith("YES")
 
     logger.info(f"[Check Simple] LLM simple query check: {is_simple_query}")
 
+    # 단순 질문은 문서 검색이 필요 없으므로 선행 검색 취소
+    if is_simple_query:
+        retrieval_prefetcher.cancel(state.get("session_id"), reason="simple_query")
+
     return {
         "is_simple_query": is_simple_query,
+        "llm_calls": [llm_call],
         "processing_stage": PROCESSING_STAGES["CHECKED_SIMPLE"]
     }
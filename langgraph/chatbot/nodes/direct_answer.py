@@ -1,14 +1,14 @@
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import HumanMessage
 
 from states import ChatState
 from config import PROCESSING_STAGES
-from prompts import SYSTEM_PROMPTS
-from utils.llm_clients import gpt_4o_with_tools
+from prompts import SYSTEM_PROMPTS, build_cacheable_prompt
 from utils.token_counter import count_tokens
+from utils.model_router import invoke_routed
 from utils.logger import logger, format_messages_for_log
 
 
-def direct_answer(state: ChatState) -> ChatState:
+async def direct_answer(state: ChatState) -> ChatState:
     """단순 쿼리에 대한 응답 생성"""
     messages = state.get("messages", [])
     logger.info(f"[Direct Answer] messages: {format_messages_for_log(messages)}")
@@ -23,14 +23,15 @@ def direct_answer(state: ChatState) -> ChatState:
         last_msg_type = type(user_message).__name__
         logger.debug(f"[Direct Answer] 유저 메시지: '{last_msg_type}', {user_message.content}")
 
-    system_prompt = SystemMessage(content=SYSTEM_PROMPTS["direct_answer"])
-    prompt = [system_prompt] + messages
+    prompt = build_cacheable_prompt(SYSTEM_PROMPTS["direct_answer"], messages)
 
     # 토큰 수 로깅
     total_prompt_tokens = sum(count_tokens(getattr(msg, 'content', str(msg))) for msg in prompt)
     logger.debug(f"[Direct Answer] 전체 프롬프트 토큰: {total_prompt_tokens}")
 
-    response = gpt_4o_with_tools.invoke(prompt)
+    # 단순 질문은 gpt-4o-mini로 시작 (신뢰도 검사 실패 시 gpt-4o로 승격)
+    tool_call_count = state.get("tool_call_count", 0)
+    response, llm_calls, routing = await invoke_routed("direct_answer", state, prompt)
 
     # Tool 호출 정보 로깅
     tool_calls = getattr(response, 'tool_calls', None)
@@ -43,7 +44,9 @@ def direct_answer(state: ChatState) -> ChatState:
         logger.info(f"[Direct Answer] Response: {format_messages_for_log([response])}")
         return {
             "messages": [response],
-            "tool_call_count": state.get("tool_call_count", 0) + 1,
+            "llm_calls": llm_calls,
+            "model_routing": [routing],
+            "tool_call_count": tool_call_count + 1,
             "processing_stage": PROCESSING_STAGES["TOOL_ASSISTED_DIRECT_ANSWER"]
         }
     else:
@@ -54,5 +57,7 @@ def direct_answer(state: ChatState) -> ChatState:
         return {
             "final_answer": response.content or "",
             "messages": [response],
+            "llm_calls": llm_calls,
+            "model_routing": [routing],
             "processing_stage": PROCESSING_STAGES["ANSWERED_DIRECT"]
         }
@@ -0,0 +1,79 @@
+import json
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from states import ChatState
+from config import PROCESSING_STAGES, FAST_PATH_CONFIG, GPT_4O_MINI_CONFIG
+from prompts import SYSTEM_PROMPTS, build_cacheable_prompt
+from utils.intent import intent_extractor, format_template_answer
+from utils.llm_clients import gpt_4o_mini
+from utils.prefetch import retrieval_prefetcher
+from utils.resilient_llm import invoke_llm
+from utils.tool_executor import tool_executor, parse_tool_message, count_cache_results
+from utils.logger import logger
+
+
+async def fast_path(state: ChatState) -> ChatState:
+    """
+    시간/날씨/주가 질문의 결정적 처리 노드
+
+    로컬 의도·슬롯 추출에 성공하면 MCP 도구를 바로 호출하고 템플릿(또는 gpt-4o-mini 1회)으로 답변합니다.
+    추출 실패, 도구 없음, 도구 실패 시에는 상태를 변경하지 않고 기존 경로(rewrite)로 넘깁니다.
+    """
+    user_query = state.get("user_query", "")
+    intent = intent_extractor.extract(user_query)
+    if intent is None:
+        return {}
+
+    if intent["tool"] not in tool_executor.tools:
+        logger.warning(f"[Fast Path] {intent['tool']} 도구 없음 - 기존 경로로 위임")
+        return {}
+
+    logger.info(f"[Fast Path] ⚡ 의도 인식: {intent['intent']} → {intent['tool']}({intent['args']})")
+
+    tool_call_id = f"fast_path_{uuid.uuid4().hex[:12]}"
+    tool_message = await tool_executor.invoke(
+        intent["tool"], intent["args"], tool_call_id=tool_call_id, session_id=state.get("session_id")
+    )
+    result = parse_tool_message(tool_message)
+    if not result or not result.get("success"):
+        logger.warning(f"[Fast Path] 도구 실패 - 기존 경로로 위임: {tool_message.content[:200]}")
+        return {}
+
+    # 도구 결과로 답변하므로 문서 선행 검색은 불필요
+    retrieval_prefetcher.cancel(state.get("session_id"), reason="fast_path")
+
+    llm_calls = []
+    if FAST_PATH_CONFIG["formatter"] == "llm":
+        prompt = build_cacheable_prompt(
+            SYSTEM_PROMPTS["format_tool_answer"],
+            [HumanMessage(content=f"질문: {user_query}\n도구 결과: {json.dumps(result, ensure_ascii=False)}")]
+        )
+        response, llm_call = await invoke_llm(
+            "fast_path", GPT_4O_MINI_CONFIG["model"], prompt,
+            llm=gpt_4o_mini, deadline=state.get("deadline")
+        )
+        answer = response.content or format_template_answer(intent, result)
+        llm_calls.append(llm_call)
+    else:
+        answer = format_template_answer(intent, result)
+
+    logger.info(f"[Fast Path] ✅ 답변 생성: {answer}")
+
+    # 히스토리에는 일반 도구 경로와 같은 형태(질문 → tool_calls → 결과 → 답변)로 기록
+    tool_request = AIMessage(
+        content="",
+        tool_calls=[{"name": intent["tool"], "args": intent["args"], "id": tool_call_id}]
+    )
+    cache_counts = count_cache_results([tool_message])
+    return {
+        "final_answer": answer,
+        "messages": [HumanMessage(content=user_query), tool_request, tool_message, AIMessage(content=answer)],
+        "llm_calls": llm_calls,
+        "fast_path_intent": intent["intent"],
+        "tool_call_count": state.get("tool_call_count", 0) + 1,
+        "tool_cache_hits": state.get("tool_cache_hits", 0) + cache_counts["hits"],
+        "tool_cache_misses": state.get("tool_cache_misses", 0) + cache_counts["misses"],
+        "processing_stage": PROCESSING_STAGES["FAST_PATH_ANSWERED"]
+    }
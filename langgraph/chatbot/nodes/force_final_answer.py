@@ -1,13 +1,14 @@
-from langchain_core.messages import SystemMessage, ToolMessage
+from langchain_core.messages import ToolMessage
 
 from states import ChatState
-from config import PROCESSING_STAGES
-from prompts import SYSTEM_PROMPTS
+from config import PROCESSING_STAGES, GPT_4O_CONFIG
+from prompts import SYSTEM_PROMPTS, build_cacheable_prompt
 from utils.llm_clients import gpt_4o
+from utils.resilient_llm import invoke_llm
 from utils.logger import logger
 
 
-def force_final_answer(state: ChatState) -> ChatState:
+async def force_final_answer(state: ChatState) -> ChatState:
     """Tool count 초과 시 강제로 최종 답변 생성"""
     messages = state.get("messages", [])
     user_query = state.get("user_query", "")
@@ -32,14 +33,17 @@ def force_final_answer(state: ChatState) -> ChatState:
                 pending_tool_messages.append(dummy_message)
 
     # Tool 결과들을 포함한 메시지로 최종 답변 생성
-    system_prompt = SystemMessage(content=SYSTEM_PROMPTS["force_final_answer"])
-    prompt = [system_prompt] + messages + pending_tool_messages
-    response = gpt_4o.invoke(prompt)
+    prompt = build_cacheable_prompt(SYSTEM_PROMPTS["force_final_answer"], messages + pending_tool_messages)
+    response, llm_call = await invoke_llm(
+        "force_final_answer", GPT_4O_CONFIG["model"], prompt,
+        llm=gpt_4o, deadline=state.get("deadline")
+    )
 
     logger.info("[Force Final Answer] ✅ 강제 답변 생성 완료")
 
     return {
         "final_answer": response.content or "죄송합니다. 충분한 정보를 수집하지 못했습니다.",
         "messages": [response],
+        "llm_calls": [llm_call],
         "processing_stage": PROCESSING_STAGES["FORCE_ANSWERED"]
     }
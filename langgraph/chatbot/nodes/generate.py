@@ -1,17 +1,28 @@
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import HumanMessage
 
 from states import ChatState
 from config import PROCESSING_STAGES
-from prompts import SYSTEM_PROMPTS
-from utils.llm_clients import gpt_4o_with_tools
+from prompts import SYSTEM_PROMPTS, build_cacheable_prompt
 from utils.token_counter import count_tokens
+from utils.model_router import invoke_routed
+from utils.retrieval_memory import can_use_memory
 from utils.logger import logger, format_messages_for_log  
 
 
-def generate_answer(state: ChatState) -> ChatState:
+async def generate_answer(state: ChatState) -> ChatState:
     reranked_context = state.get("reranked_context") or []
     if not isinstance(reranked_context, list):
         reranked_context = []
+
+    # 후속 질문이고 이번 턴에 검색한 컨텍스트가 없으면 이전 턴 검색 결과(세션 메모리)를 먼저 사용
+    use_memory = can_use_memory(state)
+    if use_memory:
+        memory = state["retrieval_memory"]
+        reranked_context = memory["contexts"]
+        logger.info(
+            f"[Generate] 🧠 세션 검색 메모리 사용: {len(reranked_context)}개 청크 "
+            f"(이전 검색: {memory.get('query')})"
+        )
     contexts = "\n".join(reranked_context)
 
     messages = state.get("messages", [])
@@ -24,43 +35,26 @@ def generate_answer(state: ChatState) -> ChatState:
             break
 
     logger.info(f"[Generate] 최종 답변 생성 시도: {user_message.content}")
-    logger.debug(f"[Generate] 컨텍스트: {len(contexts)}개, 메시지 히스토리: {len(messages)}개")
+    logger.debug(f"[Generate] 컨텍스트: {len(reranked_context)}개, 메시지 히스토리: {len(messages)}개")
 
-    context_text = "\n".join(contexts)
+    context_text = contexts
 
-    # ✅ State 정보를 포함한 동적 프롬프트 생성
+    # ✅ 요청별로 바뀌는 상태 정보와 컨텍스트는 프롬프트 마지막에 배치
+    # (고정 시스템 프롬프트 + 도구 스키마 prefix가 매 요청 동일하게 유지되어 prompt caching 적중)
     retrieve_results = state.get("retrieve_results") or []
+    result_set_id = state.get("result_set_id")
     is_reranked = state.get("is_reranked", True)
 
-    state_info = f"""
-## 현재 상태 정보
+    volatile_info = f"""## 현재 상태 정보
 - 검색 결과 존재: {"예 (" + str(len(retrieve_results)) + "개 문서)" if retrieve_results else "아니오"}
+- 검색 결과 세트 ID (result_set_id): {result_set_id or "없음"}
 - Rerank 완료 여부: {"예" if is_reranked else "아니오"}
-
-## 도구 사용 가이드
-1. **retrieve_documents 사용 시점**:
-   - 사용자 질문이 특정 컬렉션(innorules, technical_docs 등)의 정보를 요구할 때
-   - 아직 검색을 수행하지 않았을 때
-
-2. **rerank_documents 사용 시점 (우선순위)**:
-   - 검색 결과가 존재하고 ({len(retrieve_results)}개 문서)
-   - Rerank가 아직 수행되지 않았을 때 (현재: {"완료" if is_reranked else "미완료"})
-   - ⚠️ 이 조건이 충족되면 **반드시 먼저 rerank_documents를 호출**하세요
-
-3. **답변 생성 시점**:
-   - Rerank가 완료되어 정제된 문서가 있을 때
-   - 또는 도구 없이 답변 가능한 간단한 질문일 때
-"""
-
-    system_prompt_with_context = SystemMessage(content=f"""
-{SYSTEM_PROMPTS["generate_answer"]}
-
-{state_info}
+- 컨텍스트 출처: {"이전 턴 검색 결과 (질문에 답하기에 부족하면 retrieve_documents로 다시 검색)" if use_memory else "이번 턴 검색 결과"}
 
 참고 컨텍스트:
 {context_text if context_text else "(검색된 컨텍스트 없음)"}
-""")
-    prompt = [system_prompt_with_context] + messages
+"""
+    prompt = build_cacheable_prompt(SYSTEM_PROMPTS["generate_answer"], messages, volatile_info)
 
     # 토큰 수 로깅
     context_tokens = count_tokens(context_text)
@@ -68,7 +62,9 @@ def generate_answer(state: ChatState) -> ChatState:
     logger.debug(f"[Generate] 컨텍스트 토큰: {context_tokens}")
     logger.debug(f"[Generate] 전체 프롬프트 토큰: {total_prompt_tokens}")
 
-    response = gpt_4o_with_tools.invoke(prompt)
+    # 컨텍스트 크기와 도구 호출 반복 횟수에 따라 gpt-4o-mini / gpt-4o 선택 (신뢰도 검사 실패 시 승격)
+    tool_call_count = state.get("tool_call_count", 0)
+    response, llm_calls, routing = await invoke_routed("generate", state, prompt, context_tokens=context_tokens)
 
     # Tool 호출 확인
     tool_calls = getattr(response, 'tool_calls', None)
@@ -81,7 +77,10 @@ def generate_answer(state: ChatState) -> ChatState:
         logger.info(f"[Generate] Response: {format_messages_for_log([response])}")
         return {
             "messages": [response],
-            "tool_call_count": state.get("tool_call_count", 0) + 1,
+            "llm_calls": llm_calls,
+            "model_routing": [routing],
+            "retrieval_memory_used": state.get("retrieval_memory_used") or use_memory,
+            "tool_call_count": tool_call_count + 1,
             "processing_stage": PROCESSING_STAGES["TOOL_ASSISTED_GENERATE"]
         }
     else:
@@ -92,5 +91,10 @@ def generate_answer(state: ChatState) -> ChatState:
         return {
             "final_answer": response.content or "",
             "messages": [response],
+            "llm_calls": llm_calls,
+            "model_routing": [routing],
+            "retrieval_memory_used": state.get("retrieval_memory_used") or use_memory,
+            # 메모리 컨텍스트로 답변을 완성한 경우만 적중으로 집계
+            "retrieval_memory_answered": use_memory and bool(response.content),
             "processing_stage": PROCESSING_STAGES["ANSWERED"]
         }
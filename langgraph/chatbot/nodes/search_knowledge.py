@@ -0,0 +1,117 @@
+import time
+
+from langchain_core.messages import HumanMessage
+
+from states import ChatState
+from config import PROCESSING_STAGES, RAG_PIPELINE_CONFIG
+from utils.logger import logger
+from utils.tool_executor import tool_executor, parse_tool_message, count_cache_results
+
+
+async def _run_tool(name: str, args: dict, cache_counts: dict, session_id: str = None) -> dict:
+    """도구 실행기를 통해 MCP 도구 실행 후 결과 dict 반환"""
+    message = await tool_executor.invoke(
+        name, args, tool_call_id=f"search_knowledge_{name}", session_id=session_id
+    )
+    for key, value in count_cache_results([message]).items():
+        cache_counts[key] += value
+    return parse_tool_message(message) or {"success": False, "error": message.content}
+
+
+async def search_knowledge(state: ChatState) -> ChatState:
+    """
+    Retrieve → Rerank 고정 파이프라인 노드
+
+    LLM이 retrieve/rerank 호출 여부를 매 턴 판단하지 않도록,
+    검색과 재순위화를 결정적으로 수행하고 reranked_context를 바로 채웁니다.
+    실패 시 상태를 변경하지 않고 generate 노드의 도구 호출 경로로 넘깁니다.
+    """
+    messages = state.get("messages", [])
+    query = None
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            query = msg.content
+            break
+    query = query or state.get("user_query", "")
+
+    if "retrieve_documents" not in tool_executor.tools or "rerank_documents" not in tool_executor.tools:
+        logger.warning("[Search Knowledge] retrieve/rerank 도구 없음 - generate 노드로 위임")
+        return {}
+
+    logger.info(f"[Search Knowledge] 검색 파이프라인 시작: {query}")
+    start_time = time.time()
+    cache_counts = {"hits": 0, "misses": 0}
+
+    def with_cache_counts(updates: dict) -> dict:
+        updates["tool_cache_hits"] = state.get("tool_cache_hits", 0) + cache_counts["hits"]
+        updates["tool_cache_misses"] = state.get("tool_cache_misses", 0) + cache_counts["misses"]
+        return updates
+
+    try:
+        # 캐시된 retrieve 결과의 result_set_id가 저장소에서 이미 제거되었으면
+        # 도구 실행기가 해당 캐시를 무효화하므로 검색을 한 번 다시 실행
+        for attempt in range(2):
+            retrieve_result = await _run_tool("retrieve_documents", {
+                "query": query,
+                "collection_name": RAG_PIPELINE_CONFIG["collection_name"],
+                "top_k": RAG_PIPELINE_CONFIG["retrieve_top_k"]
+            }, cache_counts, session_id=state.get("session_id"))
+            if not retrieve_result.get("success"):
+                logger.warning(f"[Search Knowledge] 검색 실패: {retrieve_result.get('error')}")
+                return with_cache_counts({})
+
+            retrieve_results = retrieve_result.get("retrieve_results", [])
+            result_set_id = retrieve_result.get("result_set_id")
+            logger.info(f"[Search Knowledge] 검색 완료: {len(retrieve_results)}개 문서 ({result_set_id})")
+
+            if not retrieve_results:
+                return with_cache_counts({
+                    "retrieve_results": [],
+                    "result_set_id": result_set_id,
+                    "reranked_context": [],
+                    "is_reranked": True,
+                    "retrieval_time": time.time() - start_time,
+                    "processing_stage": PROCESSING_STAGES["SEARCHED_KNOWLEDGE"]
+                })
+
+            rerank_result = await _run_tool("rerank_documents", {
+                "query": query,
+                "result_set_id": result_set_id,
+                "top_k": RAG_PIPELINE_CONFIG["rerank_top_k"]
+            }, cache_counts, session_id=state.get("session_id"))
+            if rerank_result.get("error_type") != "result_set_not_found" or attempt:
+                break
+            logger.info(f"[Search Knowledge] 결과 세트 {result_set_id} 만료 - 검색 재실행")
+
+        if not rerank_result.get("success"):
+            logger.warning(f"[Search Knowledge] 재순위화 실패: {rerank_result.get('error')}")
+            return with_cache_counts({
+                "retrieve_results": retrieve_results,
+                "result_set_id": result_set_id,
+                "is_reranked": False
+            })
+
+        reranked_docs = rerank_result.get("reranked_documents", [])
+        retrieval_time = time.time() - start_time
+
+        logger.info(
+            f"[Search Knowledge] ✅ 파이프라인 완료: {len(reranked_docs)}개 문서 "
+            f"({retrieval_time:.2f}초)"
+        )
+        for i, doc in enumerate(reranked_docs):
+            preview = doc.get("text", "")[:60] + "..."
+            logger.debug(f"[Search Knowledge] #{i+1} score={doc.get('rerank_score', 0):.4f} | {preview}")
+
+        return with_cache_counts({
+            "retrieve_results": retrieve_results,
+            "result_set_id": result_set_id,
+            "reranked_context": [doc.get("text", "") for doc in reranked_docs],
+            "reranked_chunk_ids": [doc.get("chunk_id") for doc in reranked_docs],
+            "is_reranked": True,
+            "retrieval_time": retrieval_time,
+            "processing_stage": PROCESSING_STAGES["SEARCHED_KNOWLEDGE"]
+        })
+
+    except Exception as e:
+        logger.error(f"[Search Knowledge] 파이프라인 오류 - generate 노드로 위임: {e}", exc_info=True)
+        return {}
@@ -1,12 +1,11 @@
 import json
 
 from langchain_core.messages import ToolMessage
-from langgraph.prebuilt import ToolNode
 
 from states import ChatState
 from utils.logger import logger
 # from mcp_client.client_manager import get_mcp_manager
-from utils.llm_clients import AVAILABLE_TOOLS
+from utils.tool_executor import tool_executor, count_cache_results
 
 
 async def tool_call(state: ChatState) -> ChatState:
@@ -44,22 +43,28 @@ async def tool_call(state: ChatState) -> ChatState:
 
     try:
         # MCP 도구 가져오기
-        if not AVAILABLE_TOOLS:
+        if not tool_executor.tools:
             logger.error("사용 가능한 MCP 도구가 없습니다.")
 
-        logger.info(f"MCP 도구 실행: {len(AVAILABLE_TOOLS)}개 도구 사용 가능")
+        last_message = messages[-1]
+        tool_calls = getattr(last_message, "tool_calls", None) or []
+        logger.info(
+            f"MCP 도구 실행: {len(tool_calls)}개 호출 "
+            f"({len(tool_executor.tools)}개 도구 사용 가능, 동시 실행 최대 {tool_executor.max_concurrency}개)"
+        )
 
-        # ToolNode로 도구 실행
-        tool_node = ToolNode(AVAILABLE_TOOLS)
-        result = await tool_node.ainvoke(state)
+        # 독립적인 tool call 동시 실행 (도구별 타임아웃 적용)
+        tool_messages = await tool_executor.execute(tool_calls, session_id=state.get("session_id"))
 
         logger.info("MCP 도구 실행 완료")
 
+        cache_counts = count_cache_results(tool_messages)
         state_updates = {
-            "messages": result["messages"]
+            "messages": tool_messages,
+            "tool_cache_hits": state.get("tool_cache_hits", 0) + cache_counts["hits"],
+            "tool_cache_misses": state.get("tool_cache_misses", 0) + cache_counts["misses"]
         }
 
-        tool_messages = result.get("messages", [])
         for tool_message in tool_messages:
             if isinstance(tool_message, ToolMessage):
                 try:
@@ -70,12 +75,14 @@ async def tool_call(state: ChatState) -> ChatState:
                     if tool_result.get("success") and "retrieve_results" in tool_result:
                         # retrieve_results state 업데이트
                         state_updates["retrieve_results"] = tool_result["retrieve_results"]
+                        state_updates["result_set_id"] = tool_result.get("result_set_id")
                         state_updates["is_reranked"] = False
 
                         logger.info(
                             f"✅ [State Update] retrieve_results 업데이트: "
                             f"{len(tool_result['retrieve_results'])}개 문서, "
-                            f"컬렉션: {tool_result.get('collection', 'unknown')}"
+                            f"컬렉션: {tool_result.get('collection', 'unknown')}, "
+                            f"result_set_id: {tool_result.get('result_set_id')}"
                         )
                         for i, doc in enumerate(tool_result['retrieve_results']):
                             preview = doc["text"][:60] + "..." if len(doc["text"]) > 80 else doc["text"]
@@ -88,6 +95,9 @@ async def tool_call(state: ChatState) -> ChatState:
                         state_updates["reranked_context"] = [
                             doc.get("text", "") for doc in reranked_docs
                         ]
+                        state_updates["reranked_chunk_ids"] = [
+                            doc.get("chunk_id") for doc in reranked_docs
+                        ]
                         state_updates["is_reranked"] = True
 
                         logger.info(
@@ -1,3 +1,8 @@
+from typing import List, Optional
+
+from langchain_core.messages import BaseMessage, SystemMessage
+
+
 SYSTEM_PROMPTS = {
     "check_simple": """당신은 제공된 도구나 기본 지식으로 바로 답변 가능한 질문인지 판별하는 전문가입니다.
 
@@ -84,7 +89,29 @@ SYSTEM_PROMPTS = {
 5. 사용자 친화적 톤 유지
 
 답변은 구조화되고 이해하기 쉬워야 합니다.
-참조간 컨텍스트가 있다면 마지막에는 어느 문서를 참조 하였는지 반드시 출처를 명시해야 합니다.""",
+참조간 컨텍스트가 있다면 마지막에는 어느 문서를 참조 하였는지 반드시 출처를 명시해야 합니다.
+
+## 도구 사용 가이드
+대화 마지막의 '현재 상태 정보'를 확인하여 다음 순서를 따르세요.
+
+1. **retrieve_documents 사용 시점**:
+   - 사용자 질문이 특정 컬렉션(innorules, technical_docs 등)의 정보를 요구할 때
+   - 아직 검색을 수행하지 않았을 때 (검색 결과 존재: 아니오)
+   - 여러 측면을 묻는 질문이라 쿼리가 여러 개 필요하면 retrieve_documents를 여러 번 호출하지 말고
+     **retrieve_documents_batch**를 한 번 호출하세요 (병합된 결과의 result_set_id로 rerank 가능)
+   - 질문이 여러 컬렉션에 걸쳐 있거나 어느 컬렉션인지 불분명하면 **retrieve_documents_multi**로 한 번에 검색하세요
+   - 질문이 특정 문서, 문서 형식, 기간에 한정되면 필터 인자를 지정하세요
+     (titles/exclude_titles: 제목 부분 일치, source_type: pdf/txt, updated_after: ISO 날짜, latest_version_only)
+
+2. **rerank_documents 사용 시점 (우선순위)**:
+   - 검색 결과가 존재하고 Rerank가 아직 수행되지 않았을 때
+   - ⚠️ 이 조건이 충족되면 **반드시 먼저 rerank_documents를 호출**하세요
+   - documents 인자로 문서를 다시 보내지 말고 현재 상태 정보의 **result_set_id**만 전달하세요
+
+3. **답변 생성 시점**:
+   - Rerank가 완료되어 정제된 문서가 있을 때 (이미 참고 컨텍스트로 제공됨 → 도구를 다시 호출하지 말고 바로 답변)
+   - 또는 도구 없이 답변 가능한 간단한 질문일 때
+   - 컨텍스트 출처가 '이전 턴 검색 결과'이면 먼저 그 내용으로 답변하고, 질문에 답하기에 부족할 때만 retrieve_documents를 호출""",
 
     "direct_answer": """
 사용자의 질문에 대해 직접적이고 유용한 답변을 제공하세요.
@@ -113,5 +140,30 @@ SYSTEM_PROMPTS = {
 4. 사용자에게 실질적인 도움이 되는 내용 포함
 5. 명확하고 이해하기 쉬운 구조로 답변
 
-최선을 다해 완전하고 정확한 답변을 제공하세요."""
+최선을 다해 완전하고 정확한 답변을 제공하세요.""",
+
+    "format_tool_answer": """당신은 도구 조회 결과를 사용자에게 전달하는 AI 어시스턴트입니다.
+사용자 질문과 도구 결과(JSON)가 주어집니다.
+
+다음 원칙을 따라 답변하세요:
+1. 도구 결과에 있는 값만 사용하고 추측하지 않음
+2. 1~2문장으로 간결하게 답변
+3. 단위(°C, km/h, 통화 등)를 함께 표시"""
 }
+
+
+def build_cacheable_prompt(
+    static_prompt: str,
+    messages: List[BaseMessage],
+    volatile: Optional[str] = None
+) -> List[BaseMessage]:
+    """
+    프롬프트 캐시 친화적 메시지 배치
+
+    [고정 시스템 프롬프트] + 대화 히스토리 + [요청별 가변 정보] 순서로 구성합니다.
+    고정 시스템 프롬프트와 도구 스키마가 항상 같은 prefix가 되어 provider 측 prompt caching이 적중합니다.
+    """
+    prompt = [SystemMessage(content=static_prompt)] + list(messages)
+    if volatile:
+        prompt.append(SystemMessage(content=volatile))
+    return prompt
@@ -4,16 +4,27 @@ from langgraph.graph import END
 from states import ChatState
 from config import PROCESSING_STAGES
 from utils.logger import logger
+from utils.retrieval_memory import can_use_memory
 
 
 def input_valid_router(state: ChatState) -> str:
     """입력 유효성 검사 결과에 따른 라우팅"""
-    return "error" if state.get("error") else "rewrite"
+    return "error" if state.get("error") else "fast_path"
+
+
+def fast_path_router(state: ChatState) -> str:
+    """fast path로 답변했으면 종료, 아니면 기존 경로(rewrite)로 진행"""
+    return "answered" if state.get("fast_path_intent") else "rewrite"
 
 
 def check_simple_router(state: ChatState) -> str:
     """단순 쿼리 여부에 따른 라우팅"""
-    return "direct_answer" if state.get("is_simple_query") else "generate"
+    if state.get("is_simple_query"):
+        return "direct_answer"
+    # 후속 질문은 세션 검색 메모리로 먼저 답변 시도 (부족하면 generate에서 재검색)
+    if state.get("use_rag_pipeline") and not can_use_memory(state):
+        return "search_knowledge"
+    return "generate"
 
 
 # def check_answerable_router(state: ChatState) -> str:
@@ -10,22 +10,43 @@ class ChatState(TypedDict):
     processing_stage: str
     tool_call_count: int
     max_tool_calls: int
+    tool_cache_hits: int
+    tool_cache_misses: int
+    use_rag_pipeline: Optional[bool]
+    deadline: Optional[float]
 
     # 쿼리 관련
     user_query: str
     is_simple_query: Optional[bool]
     rewritten_query: Optional[str]
+    fast_path_intent: Optional[str]
 
     # 검색 관련
     retrieve_results: Optional[List[Dict[str, Any]]]
+    result_set_id: Optional[str]
     reranked_context: Optional[List[str]]
+    reranked_chunk_ids: Optional[List[str]]
     is_reranked: Optional[bool]
     is_answerable: Optional[bool]
     retrieval_time: Optional[float]
 
+    # 세션 검색 메모리 (이전 턴 rerank 결과, 후속 질문에서 재검색 없이 사용)
+    retrieval_memory: Optional[Dict[str, Any]]
+    retrieval_memory_used: Optional[bool]
+    retrieval_memory_answered: Optional[bool]
+
     # 응답 관련
     final_answer: Optional[str]
     confidence_score: Optional[float]
 
+    # LLM 호출별 사용량 기록 (노드, 모델, 입력/캐시/출력 토큰, 지연 시간)
+    llm_calls: Annotated[List[Dict[str, Any]], add]
+
+    # 모델 라우팅 결정 기록 (노드, 시작 모델, 사유, 신뢰도, gpt-4o 승격 여부)
+    model_routing: Annotated[List[Dict[str, Any]], add]
+
+    # 노드별 실행 시간 기록 (노드, 소요 시간)
+    node_timings: Annotated[List[Dict[str, Any]], add]
+
     # 대화 히스토리
     messages: Annotated[List[AIMessage | HumanMessage | SystemMessage | ToolMessage], add]
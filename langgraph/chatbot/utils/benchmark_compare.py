@@ -0,0 +1,199 @@
+import json
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import BENCHMARK_COMPARE_CONFIG
+
+
+def load_benchmark(path: str) -> Dict[str, Any]:
+    """벤치마크 결과 JSON 로드"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _collect_samples(benchmark: Dict[str, Any]) -> Tuple[Dict[str, List[float]], Dict[str, List[float]]]:
+    """
+    벤치마크 결과에서 성공한 실행의 지연 시간 샘플 추출
+
+    Returns:
+        (쿼리별 실행 시간 목록, 노드별 실행 시간 목록)
+        노드별 시간은 stage_timings가 기록된 벤치마크에만 존재
+    """
+    query_samples: Dict[str, List[float]] = {}
+    stage_samples: Dict[str, List[float]] = {}
+
+    for query_result in benchmark.get("results", []):
+        query = query_result["query"]
+        for run in query_result.get("iterations", []):
+            if not run.get("success"):
+                continue
+            query_samples.setdefault(query, []).append(run["execution_time"])
+            for stage, duration in (run.get("stage_timings") or {}).items():
+                stage_samples.setdefault(stage, []).append(duration)
+
+    return query_samples, stage_samples
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values)
+
+
+def bootstrap_delta_ci(
+    baseline: List[float],
+    candidate: List[float],
+    confidence: float,
+    resamples: int,
+    seed: int
+) -> Optional[Tuple[float, float]]:
+    """
+    평균 지연 시간 차이(candidate - baseline)의 bootstrap 신뢰 구간
+
+    지연 시간 분포는 꼬리가 길어 정규 근사 대신 percentile bootstrap을 사용합니다.
+    양쪽 샘플이 2개 미만이면 구간을 계산하지 않습니다 (None).
+    """
+    if len(baseline) < 2 or len(candidate) < 2:
+        return None
+
+    rng = random.Random(seed)
+    deltas = sorted(
+        _mean(rng.choices(candidate, k=len(candidate))) - _mean(rng.choices(baseline, k=len(baseline)))
+        for _ in range(resamples)
+    )
+    alpha = (1 - confidence) / 2
+    lower = deltas[int(alpha * (resamples - 1))]
+    upper = deltas[int((1 - alpha) * (resamples - 1))]
+    return lower, upper
+
+
+def compare_samples(
+    baseline: List[float],
+    candidate: List[float],
+    config: Dict[str, Any] = BENCHMARK_COMPARE_CONFIG
+) -> Dict[str, Any]:
+    """
+    샘플 두 집합의 지연 시간 비교
+
+    회귀 판정: 평균 증가율이 max_regression_ratio를 넘고, 증가량이 min_delta_seconds 이상이며,
+    신뢰 구간이 있으면 하한이 0보다 커야 함 (구간이 없으면 점추정으로 판정)
+    """
+    baseline_mean = _mean(baseline)
+    candidate_mean = _mean(candidate)
+    delta = candidate_mean - baseline_mean
+    delta_ratio = delta / baseline_mean if baseline_mean else None
+    ci = bootstrap_delta_ci(
+        baseline, candidate,
+        confidence=config["confidence"],
+        resamples=config["bootstrap_resamples"],
+        seed=config["seed"]
+    )
+
+    regression = (
+        delta_ratio is not None
+        and delta_ratio > config["max_regression_ratio"]
+        and delta >= config["min_delta_seconds"]
+        and (ci is None or ci[0] > 0)
+    )
+
+    return {
+        "baseline_mean": baseline_mean,
+        "candidate_mean": candidate_mean,
+        "baseline_runs": len(baseline),
+        "candidate_runs": len(candidate),
+        "delta": delta,
+        "delta_ratio": delta_ratio,
+        "ci": list(ci) if ci else None,
+        "regression": regression
+    }
+
+
+def compare_benchmarks(
+    paths: List[str],
+    config: Dict[str, Any] = BENCHMARK_COMPARE_CONFIG
+) -> Dict[str, Any]:
+    """
+    벤치마크 결과 비교 (첫 번째 파일이 기준선)
+
+    쿼리별, 노드(단계)별, 전체 지연 시간 차이와 신뢰 구간을 계산하고 회귀 여부를 판정합니다.
+    노드별 회귀는 gate_stages가 True일 때만 전체 회귀 판정에 포함됩니다.
+    """
+    if len(paths) < 2:
+        raise ValueError("비교하려면 벤치마크 결과 파일이 2개 이상 필요합니다")
+
+    baseline_queries, baseline_stages = _collect_samples(load_benchmark(paths[0]))
+    comparisons = []
+
+    for path in paths[1:]:
+        candidate_queries, candidate_stages = _collect_samples(load_benchmark(path))
+
+        queries = {
+            query: compare_samples(baseline_queries[query], candidate_queries[query], config)
+            for query in baseline_queries
+            if query in candidate_queries
+        }
+        stages = {
+            stage: compare_samples(baseline_stages[stage], candidate_stages[stage], config)
+            for stage in baseline_stages
+            if stage in candidate_stages
+        }
+
+        overall = None
+        if queries:
+            overall = compare_samples(
+                [t for query in queries for t in baseline_queries[query]],
+                [t for query in queries for t in candidate_queries[query]],
+                config
+            )
+
+        regressions = [f"query:{query}" for query, result in queries.items() if result["regression"]]
+        if config["gate_stages"]:
+            regressions += [f"stage:{stage}" for stage, result in stages.items() if result["regression"]]
+        if overall and overall["regression"]:
+            regressions.append("overall")
+
+        comparisons.append({
+            "file": path,
+            "queries": queries,
+            "stages": stages,
+            "overall": overall,
+            "unmatched_queries": sorted(set(baseline_queries) ^ set(candidate_queries)),
+            "regressions": regressions
+        })
+
+    return {
+        "baseline": paths[0],
+        "config": config,
+        "comparisons": comparisons,
+        "has_regression": any(c["regressions"] for c in comparisons)
+    }
+
+
+def format_comparison(result: Dict[str, Any]) -> str:
+    """비교 결과를 사람이 읽기 쉬운 표로 변환"""
+    def _line(name: str, item: Dict[str, Any]) -> str:
+        ratio = f"{item['delta_ratio']:+.1%}" if item["delta_ratio"] is not None else "n/a"
+        ci = f"[{item['ci'][0]:+.2f}, {item['ci'][1]:+.2f}]" if item["ci"] else "(샘플 부족)"
+        flag = " ❌ 회귀" if item["regression"] else ""
+        return (
+            f"    {name}: {item['baseline_mean']:.2f}초 → {item['candidate_mean']:.2f}초 "
+            f"({item['delta']:+.2f}초, {ratio}) CI {ci}{flag}"
+        )
+
+    confidence = result["config"]["confidence"]
+    lines = [f"📏 기준선: {result['baseline']}"]
+    for comparison in result["comparisons"]:
+        lines.append(f"\n📊 비교 대상: {comparison['file']} (신뢰 구간 {confidence:.0%})")
+        if comparison["overall"]:
+            lines.append(_line("전체", comparison["overall"]))
+        lines.append("  쿼리별:")
+        lines.extend(_line(query, item) for query, item in comparison["queries"].items())
+        if comparison["stages"]:
+            lines.append("  단계별:")
+            lines.extend(_line(stage, item) for stage, item in comparison["stages"].items())
+        if comparison["unmatched_queries"]:
+            lines.append(f"  ⚠️  한쪽에만 있는 쿼리: {comparison['unmatched_queries']}")
+        if comparison["regressions"]:
+            lines.append(f"  ❌ 회귀 감지: {', '.join(comparison['regressions'])}")
+        else:
+            lines.append("  ✅ 회귀 없음")
+
+    return "\n".join(lines)
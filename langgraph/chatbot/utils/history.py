@@ -0,0 +1,132 @@
+import json
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from config import HISTORY_COMPACTION_CONFIG
+from utils.token_counter import count_tokens
+
+# 도구 사용 요약 메시지 표시 (압축된 히스토리에서 일반 답변과 구분)
+TOOL_SUMMARY_PREFIX = "[도구 사용 기록]"
+
+
+def _message_text(message: BaseMessage) -> str:
+    """메모리/토큰 측정용 메시지 직렬화 (본문 + tool_calls)"""
+    text = message.content if isinstance(message.content, str) else json.dumps(message.content, ensure_ascii=False)
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        text += json.dumps(tool_calls, ensure_ascii=False, default=str)
+    return text
+
+
+def measure_messages(messages: List[BaseMessage]) -> Dict[str, int]:
+    """메시지 목록의 크기 (UTF-8 바이트, 프롬프트 토큰)"""
+    texts = [_message_text(message) for message in messages]
+    return {
+        "messages": len(messages),
+        "bytes": sum(len(text.encode("utf-8")) for text in texts),
+        "tokens": sum(count_tokens(text) for text in texts)
+    }
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    return text if len(text) <= max_chars else text[:max_chars] + "…"
+
+
+def _digest_result(content: str, max_chars: int) -> str:
+    """도구 결과 요약 (문서 본문 등 큰 값은 개수만 남김)"""
+    try:
+        result = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return _truncate(str(content), max_chars)
+
+    if not isinstance(result, dict):
+        return _truncate(json.dumps(result, ensure_ascii=False), max_chars)
+    if result.get("success") is False:
+        return _truncate(f"실패 - {result.get('error', '')}", max_chars)
+
+    parts = []
+    for key, value in result.items():
+        if key == "success":
+            continue
+        if isinstance(value, list):
+            parts.append(f"{key}: {len(value)}개")
+        elif isinstance(value, dict):
+            scalars = {k: v for k, v in value.items() if isinstance(v, (str, int, float, bool))}
+            if scalars:
+                parts.append(f"{key}: {json.dumps(scalars, ensure_ascii=False)}")
+        elif isinstance(value, (str, int, float, bool)):
+            parts.append(f"{key}: {value}")
+
+    return _truncate(", ".join(parts), max_chars)
+
+
+def _summarize_tool_exchange(
+    ai_message: AIMessage,
+    tool_messages: List[ToolMessage],
+    max_chars: int
+) -> AIMessage:
+    """tool_calls AIMessage + ToolMessage들을 요약 AIMessage 1개로 변환"""
+    results = {message.tool_call_id: message for message in tool_messages}
+    lines = [TOOL_SUMMARY_PREFIX]
+
+    for tool_call in ai_message.tool_calls:
+        args = ", ".join(f"{k}={_truncate(str(v), 60)}" for k, v in tool_call.get("args", {}).items())
+        result = results.get(tool_call.get("id"))
+        digest = _digest_result(result.content, max_chars) if result is not None else "결과 없음"
+        lines.append(f"- {tool_call.get('name')}({args}) → {digest}")
+
+    return AIMessage(content="\n".join(lines))
+
+
+def compact_history(
+    messages: List[BaseMessage],
+    config: Dict[str, Any] = HISTORY_COMPACTION_CONFIG
+) -> Tuple[List[BaseMessage], Dict[str, Any]]:
+    """
+    턴 종료 후 세션 히스토리 압축
+
+    - tool_calls가 있는 AIMessage와 그에 대한 ToolMessage들은 짧은 도구 사용 요약 메시지 1개로 대체
+      (검색/rerank 문서 본문 같은 원본 payload는 버림)
+    - 사용자/어시스턴트 대화는 유지하고, 최근 max_turns 턴만 보관
+    - 이미 압축된 히스토리에 다시 적용해도 결과가 같음
+
+    Returns:
+        (압축된 메시지 목록, 압축 전후 크기 통계)
+    """
+    before = measure_messages(messages)
+    compacted: List[BaseMessage] = []
+
+    i = 0
+    while i < len(messages):
+        message = messages[i]
+        if isinstance(message, AIMessage) and message.tool_calls:
+            tool_messages = []
+            i += 1
+            while i < len(messages) and isinstance(messages[i], ToolMessage):
+                tool_messages.append(messages[i])
+                i += 1
+            compacted.append(_summarize_tool_exchange(message, tool_messages, config["summary_max_chars"]))
+            continue
+
+        if isinstance(message, ToolMessage):
+            # 짝이 되는 tool_calls 메시지가 없는 ToolMessage는 버림
+            i += 1
+            continue
+
+        compacted.append(message)
+        i += 1
+
+    # 최근 max_turns 턴만 유지 (턴은 HumanMessage로 시작)
+    turn_starts = [index for index, message in enumerate(compacted) if isinstance(message, HumanMessage)]
+    if len(turn_starts) > config["max_turns"]:
+        compacted = compacted[turn_starts[-config["max_turns"]]:]
+
+    after = measure_messages(compacted)
+    stats = {
+        "before": before,
+        "after": after,
+        "saved_bytes": before["bytes"] - after["bytes"],
+        "saved_tokens": before["tokens"] - after["tokens"]
+    }
+    return compacted, stats
@@ -0,0 +1,116 @@
+import asyncio
+import importlib.util
+import os
+import weakref
+from typing import Any, Dict
+
+import httpx
+
+from config import HTTP_CLIENT_CONFIG
+from utils.logger import logger
+
+
+class SharedAsyncHTTPClient(httpx.AsyncClient):
+    """
+    LLM 클라이언트 공용 비동기 HTTP 클라이언트
+
+    모든 ChatOpenAI 인스턴스가 하나의 커넥션 풀(크기, keep-alive, HTTP/2 설정)을 공유합니다.
+    httpx 커넥션은 이벤트 루프에 묶이므로 실제 전송은 루프별 내부 클라이언트가 담당하고,
+    httpcore trace 확장으로 새 연결 수와 재사용 요청 수를 집계합니다.
+    """
+
+    def __init__(self, config: Dict[str, Any] = HTTP_CLIENT_CONFIG):
+        self.http2 = config["http2"] and importlib.util.find_spec("h2") is not None
+        if config["http2"] and not self.http2:
+            logger.warning("⚠️  h2 패키지가 없어 HTTP/1.1로 동작합니다 (pip install httpx[http2])")
+
+        self._client_kwargs = {
+            "http2": self.http2,
+            "limits": httpx.Limits(
+                max_connections=config["max_connections"],
+                max_keepalive_connections=config["max_keepalive_connections"],
+                keepalive_expiry=config["keepalive_expiry"]
+            ),
+            "timeout": httpx.Timeout(config["timeout"], connect=config["connect_timeout"])
+        }
+        # 요청 생성(build_request)용 - 전송은 루프별 클라이언트에서 수행
+        super().__init__(**self._client_kwargs)
+
+        self.warmup_config = config["warmup"]
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.warmed_connections = 0
+
+    def _client_for_loop(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                **self._client_kwargs,
+                event_hooks={"request": [self._attach_trace]}
+            )
+            self._loop_clients[loop] = client
+        return client
+
+    async def _attach_trace(self, request: httpx.Request):
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]):
+        """httpcore trace 이벤트 집계"""
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event_name.endswith("send_request_headers.started"):
+            self.requests += 1
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await self._client_for_loop().send(request, **kwargs)
+
+    async def warmup(self) -> int:
+        """
+        커넥션 미리 열기 (TLS 핸드셰이크를 첫 LLM 요청 전에 수행)
+
+        인증 없이 base URL에 요청을 보내 연결만 풀에 남깁니다 (응답 상태 코드는 무시).
+        """
+        if not self.warmup_config["enabled"]:
+            return 0
+
+        base_url = self.warmup_config["url"] or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+        # HTTP/2는 연결 하나로 다중화되므로 1개만 연결
+        count = 1 if self.http2 else self.warmup_config["connections"]
+        before = self.new_connections
+
+        async def _open():
+            try:
+                response = await self.send(self.build_request("GET", base_url))
+                await response.aclose()
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️  HTTP 커넥션 warm-up 실패: {e}")
+
+        await asyncio.gather(*(_open() for _ in range(count)))
+        opened = self.new_connections - before
+        self.warmed_connections += opened
+        logger.info(f"🔥 HTTP 커넥션 warm-up 완료: {opened}개 연결 ({base_url})")
+        return opened
+
+    def stats(self) -> Dict[str, Any]:
+        reused = max(0, self.requests - self.new_connections)
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "tls_handshakes": self.tls_handshakes,
+            "warmed_connections": self.warmed_connections,
+            "reused_requests": reused,
+            "reuse_rate": reused / self.requests if self.requests else 0.0
+        }
+
+
+# 전역 공용 HTTP 클라이언트 (모든 LLM 클라이언트에 주입)
+shared_http_client = SharedAsyncHTTPClient()
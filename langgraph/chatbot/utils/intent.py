@@ -0,0 +1,234 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from config import FAST_PATH_CONFIG
+from utils.text_processing import extract_pronouns_and_references
+from utils.logger import logger
+
+SUPPORTED_CITIES_URI = "weather://supported-cities"
+
+# weather://supported-cities 를 읽지 못했을 때 사용할 기본 목록 (weather_server와 동일)
+DEFAULT_SUPPORTED_CITIES = {
+    "korea": [
+        "Seoul", "Busan", "Incheon", "Daegu", "Daejeon",
+        "Gwangju", "Ulsan", "Suwon", "Changwon", "Seongnam"
+    ],
+    "international": [
+        "Tokyo", "Beijing", "Shanghai", "New York",
+        "London", "Paris", "Sydney", "Los Angeles"
+    ]
+}
+
+# 한국어 도시명 → 지원 도시명
+CITY_ALIASES = {
+    "서울": "Seoul", "부산": "Busan", "인천": "Incheon", "대구": "Daegu", "대전": "Daejeon",
+    "광주": "Gwangju", "울산": "Ulsan", "수원": "Suwon", "창원": "Changwon", "성남": "Seongnam",
+    "도쿄": "Tokyo", "동경": "Tokyo", "베이징": "Beijing", "북경": "Beijing", "상하이": "Shanghai",
+    "뉴욕": "New York", "런던": "London", "파리": "Paris", "시드니": "Sydney",
+    "로스앤젤레스": "Los Angeles", "엘에이": "Los Angeles", "LA": "Los Angeles"
+}
+
+# 해외 도시 시간대 (국내 도시는 기본 시간대 사용)
+CITY_TIMEZONES = {
+    "Tokyo": "Asia/Tokyo",
+    "Beijing": "Asia/Shanghai",
+    "Shanghai": "Asia/Shanghai",
+    "New York": "America/New_York",
+    "London": "Europe/London",
+    "Paris": "Europe/Paris",
+    "Sydney": "Australia/Sydney",
+    "Los Angeles": "America/Los_Angeles"
+}
+
+# 한국어 회사명 → 티커
+COMPANY_TICKERS = {
+    "애플": "AAPL", "테슬라": "TSLA", "엔비디아": "NVDA", "마이크로소프트": "MSFT",
+    "구글": "GOOGL", "알파벳": "GOOGL", "아마존": "AMZN", "메타": "META", "넷플릭스": "NFLX",
+    "삼성전자": "005930.KS", "SK하이닉스": "000660.KS", "하이닉스": "000660.KS",
+    "네이버": "035420.KS", "카카오": "035720.KS", "현대차": "005380.KS", "현대자동차": "005380.KS",
+    "LG전자": "066570.KS", "LG화학": "051910.KS", "LG에너지솔루션": "373220.KS",
+    "SK텔레콤": "017670.KS", "SK이노베이션": "096770.KS", "삼성SDI": "006400.KS",
+    "삼성바이오로직스": "207940.KS", "기아": "000270.KS", "셀트리온": "068270.KS",
+    "POSCO홀딩스": "005490.KS", "포스코홀딩스": "005490.KS", "KB금융": "105560.KS", "현대모비스": "012330.KS"
+}
+
+INTENT_PATTERNS = {
+    "time": re.compile(
+        r"몇\s*시(?!간)|(현재|지금)\s*시간|시간\s*(알려|좀)|오늘\s*(날짜|며칠)|몇\s*월\s*며칠|what\s+time",
+        re.IGNORECASE
+    ),
+    "weather": re.compile(r"날씨|기온|온도|weather", re.IGNORECASE),
+    "stock": re.compile(r"주가|주식|시세|stock\s*price|share\s*price", re.IGNORECASE)
+}
+
+# "몇 시", "시간 알려줘"는 "회의는 몇 시에 시작해?"처럼 문서 질문에도 쓰이므로
+# 현재 시각을 묻는 형태일 때만 time fast path 사용 (지금/현재 + 시간 표현, 또는 도시명을 뺀 나머지가 "몇 시야?"뿐인 질문)
+CURRENT_TIME_PATTERN = re.compile(
+    r"(현재|지금)\s*(몇\s*시(?!간)|시간|시각)|오늘\s*(날짜|며칠)|몇\s*월\s*며칠|"
+    r"(current|local)\s+time|time\s+now",
+    re.IGNORECASE
+)
+BARE_TIME_QUERY = re.compile(
+    r"^(?:지금|현재)?\s*(?:"
+    r"몇\s*시(?:야|예요|에요|이야|인가요|일까요?|니|냐|지|입니까)?"
+    r"|시간\s*(?:좀\s*)?(?:알려\s*(?:줘|주세요|줄래)?|좀)"
+    r")\s*[?？.!]*$"
+)
+CITY_PARTICLE_PATTERN = re.compile(r"^(?:은|는|의|에서는|에서|에선)(?=\s|$)")
+
+INTENT_TOOLS = {
+    "time": "get_current_time",
+    "weather": "get_current_weather",
+    "stock": "get_stock_price"
+}
+
+# 한글이 바로 붙은 영문 대문자("LG전자", "삼성SDI")는 회사명의 일부이므로 티커로 보지 않음
+# (뒤에 붙은 한글이 "주가/주식/시세"인 "TSLA주가"는 허용)
+TICKER_PATTERN = re.compile(
+    r"(?<![A-Za-z0-9가-힣])([A-Z]{1,5}(?:\.[A-Z]{1,2})?)(?![A-Za-z0-9])(?!(?!주가|주식|시세)[가-힣])"
+)
+KRX_CODE_PATTERN = re.compile(r"(?<!\d)(\d{6})(?!\d)")
+
+
+class IntentExtractor:
+    """
+    시간/날씨/주가 질문의 결정적 의도·슬롯 추출기
+
+    - 정규식 패턴으로 의도 판별, 도시 목록(weather://supported-cities + 한국어 별칭)과 티커로 슬롯 추출
+    - 의도가 하나이고 필요한 슬롯이 모두 확정될 때만 결과 반환 (애매하면 None → 기존 LLM 경로)
+    """
+
+    def __init__(self, config: Dict[str, Any] = FAST_PATH_CONFIG):
+        self.config = config
+        self.cities: Dict[str, str] = {}
+        self._build_gazetteer(DEFAULT_SUPPORTED_CITIES)
+
+    def _build_gazetteer(self, supported: Dict[str, List[str]]):
+        """지원 도시명(대소문자 무시)과 한국어 별칭 → 지원 도시명 테이블 구성"""
+        names = [city for cities in supported.values() for city in cities]
+        gazetteer = {name.lower(): name for name in names}
+        for alias, city in CITY_ALIASES.items():
+            if city in names:
+                gazetteer[alias.lower()] = city
+        self.cities = gazetteer
+
+    async def load_gazetteer(self, mcp_manager) -> bool:
+        """weather_server의 지원 도시 목록 리소스로 도시 목록 갱신 (실패 시 기본 목록 유지)"""
+        try:
+            blobs = await mcp_manager.client.get_resources("weather_server", uris=[SUPPORTED_CITIES_URI])
+            supported = json.loads(blobs[0].as_string())
+        except Exception as e:
+            logger.warning(f"[Intent] ⚠️ 지원 도시 목록 로드 실패 - 기본 목록 사용: {e}")
+            return False
+
+        self._build_gazetteer(supported)
+        logger.info(f"[Intent] ✅ 지원 도시 목록 로드: {len(self.cities)}개 (별칭 포함)")
+        return True
+
+    def _find_cities(self, query: str) -> List[str]:
+        lowered = query.lower()
+        found = []
+        # 긴 이름부터 매칭하여 "New York" 안의 부분 문자열 등 중복 매칭 방지
+        for name in sorted(self.cities, key=len, reverse=True):
+            if name.isascii():
+                matched = re.search(rf"(?<![a-z]){re.escape(name)}(?![a-z])", lowered)
+            else:
+                matched = name in lowered
+            if matched:
+                lowered = lowered.replace(name, " ")
+                if self.cities[name] not in found:
+                    found.append(self.cities[name])
+        return found
+
+    def _without_cities(self, query: str) -> str:
+        """도시명과 바로 뒤의 조사를 뺀 나머지 질문 (도쿄는 몇 시야? → 몇 시야?)"""
+        remaining = query.lower()
+        for name in sorted(self.cities, key=len, reverse=True):
+            if name.isascii():
+                remaining = re.sub(rf"(?<![a-z]){re.escape(name)}(?![a-z])", "\n", remaining)
+            else:
+                remaining = remaining.replace(name, "\n")
+        parts = [CITY_PARTICLE_PATTERN.sub("", part.strip()) for part in remaining.split("\n")]
+        return " ".join(part.strip() for part in parts if part.strip())
+
+    def _asks_current_time(self, query: str) -> bool:
+        return bool(CURRENT_TIME_PATTERN.search(query) or BARE_TIME_QUERY.match(self._without_cities(query)))
+
+    def _find_tickers(self, query: str) -> List[str]:
+        tickers = []
+        remaining = query
+        for company, ticker in sorted(COMPANY_TICKERS.items(), key=lambda item: len(item[0]), reverse=True):
+            if company in remaining:
+                remaining = remaining.replace(company, " ")
+                tickers.append(ticker)
+        tickers += [f"{code}.KS" for code in KRX_CODE_PATTERN.findall(remaining)]
+        tickers += TICKER_PATTERN.findall(remaining)
+        return list(dict.fromkeys(tickers))
+
+    def extract(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        질문에서 의도와 도구 인자 추출
+
+        Returns:
+            {"intent", "tool", "args"} 또는 None (fast path 대상 아님)
+        """
+        query = (query or "").strip()
+        if not self.config["enabled"] or not query or len(query) > self.config["max_query_chars"]:
+            return None
+        # 후속 질문("거기 날씨는?")은 히스토리 해석이 필요하므로 제외
+        if extract_pronouns_and_references(query):
+            return None
+
+        intents = [name for name, pattern in INTENT_PATTERNS.items() if pattern.search(query)]
+        if len(intents) != 1:
+            return None
+        intent = intents[0]
+
+        if intent == "time":
+            # 일정/시각을 묻는 문서 질문("출근은 몇 시까지?")은 RAG 경로로
+            if not self._asks_current_time(query):
+                return None
+            cities = self._find_cities(query)
+            if len(cities) > 1:
+                return None
+            timezone = CITY_TIMEZONES.get(cities[0], self.config["default_timezone"]) if cities \
+                else self.config["default_timezone"]
+            args = {"timezone": timezone}
+
+        elif intent == "weather":
+            cities = self._find_cities(query)
+            if len(cities) != 1:
+                return None
+            args = {"city": cities[0]}
+
+        else:
+            tickers = self._find_tickers(query)
+            if len(tickers) != 1:
+                return None
+            args = {"ticker": tickers[0]}
+
+        return {"intent": intent, "tool": INTENT_TOOLS[intent], "args": args}
+
+
+def format_template_answer(intent: Dict[str, Any], result: Dict[str, Any]) -> str:
+    """도구 결과를 고정 문장으로 변환 (formatter="template")"""
+    if intent["intent"] == "time":
+        return f"현재 {result.get('timezone')} 기준 시간은 {result.get('datetime')}입니다."
+
+    if intent["intent"] == "weather":
+        return (
+            f"현재 {result.get('city')}의 날씨는 {result.get('weather')}이며, "
+            f"기온은 {result.get('temperature')}{result.get('temperature_unit', '°C')}, "
+            f"풍속은 {result.get('wind_speed')}{result.get('wind_speed_unit', 'km/h')}입니다. "
+            f"(관측 시각: {result.get('time')})"
+        )
+
+    return (
+        f"{result.get('company_name')}({result.get('ticker')})의 현재 주가는 "
+        f"{result.get('price')} {result.get('currency')}입니다."
+    )
+
+
+# 전역 의도 추출기
+intent_extractor = IntentExtractor()
@@ -2,7 +2,9 @@ import asyncio
 
 from langchain_openai import ChatOpenAI
 
-from config import GPT_4O_MINI_CONFIG, GPT_4O_CONFIG
+from config import GPT_4O_MINI_CONFIG, GPT_4O_CONFIG, MODEL_ROUTING_CONFIG
+from utils.http_client import shared_http_client
+from utils.tracing import hide_trace_context
 from utils.logger import logger
 from mcp_client.client_manager import get_mcp_manager
 
@@ -33,17 +35,20 @@ def _load_mcp_tools():
 
 AVAILABLE_TOOLS = _load_mcp_tools()
 
-# LLM 클라이언트 초기화
-gpt_4o_mini = ChatOpenAI(**GPT_4O_MINI_CONFIG)
+# LLM 클라이언트 초기화 (공용 HTTP 커넥션 풀 사용)
+gpt_4o_mini = ChatOpenAI(**GPT_4O_MINI_CONFIG, http_async_client=shared_http_client)
 
-gpt_4o = ChatOpenAI(**GPT_4O_CONFIG)
+gpt_4o = ChatOpenAI(**GPT_4O_CONFIG, http_async_client=shared_http_client)
 
-# GPT-4o + MCP 도구 바인딩
+# GPT-4o + MCP 도구 바인딩 (trace_context 숨김 인자는 LLM 스키마에서 제거)
+# gpt-4o-mini는 모델 라우팅 신뢰도 검사용으로 응답 토큰 logprobs를 함께 요청
+MINI_CALL_OPTIONS = {"logprobs": True} if MODEL_ROUTING_CONFIG["use_logprobs"] else {}
 if AVAILABLE_TOOLS:
-    gpt_4o_mini_with_tools = gpt_4o_mini.bind_tools(AVAILABLE_TOOLS)
-    gpt_4o_with_tools = gpt_4o.bind_tools(AVAILABLE_TOOLS)
+    LLM_TOOLS = [hide_trace_context(tool) for tool in AVAILABLE_TOOLS]
+    gpt_4o_mini_with_tools = gpt_4o_mini.bind_tools(LLM_TOOLS, **MINI_CALL_OPTIONS)
+    gpt_4o_with_tools = gpt_4o.bind_tools(LLM_TOOLS)
     logger.info(f"✅ Bind Tools: {len(AVAILABLE_TOOLS)}개 도구 바인딩됨")
 else:
-    gpt_4o_mini_with_tools = gpt_4o_mini
+    gpt_4o_mini_with_tools = gpt_4o_mini.bind(**MINI_CALL_OPTIONS)
     gpt_4o_with_tools = gpt_4o
     logger.warning("⚠️  Bind Tools: 도구 없음")
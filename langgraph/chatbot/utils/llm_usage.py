@@ -0,0 +1,66 @@
+from typing import Any, Dict, List
+
+from utils.logger import logger
+
+
+def extract_usage(response: Any) -> Dict[str, int]:
+    """LLM 응답의 usage_metadata에서 토큰 사용량 추출 (캐시 적중 토큰 포함)"""
+    usage = getattr(response, "usage_metadata", None) or {}
+    input_details = usage.get("input_token_details") or {}
+
+    return {
+        "input_tokens": usage.get("input_tokens", 0),
+        "cached_tokens": input_details.get("cache_read", 0),
+        "output_tokens": usage.get("output_tokens", 0)
+    }
+
+
+def build_llm_call_record(node: str, model: str, response: Any, latency: float) -> Dict[str, Any]:
+    """
+    LLM 호출 1회의 사용량 기록 생성
+
+    Args:
+        node: 호출한 노드 이름
+        model: 모델 이름
+        response: LLM 응답 메시지
+        latency: 호출 소요 시간(초)
+    """
+    usage = extract_usage(response)
+    record = {
+        "node": node,
+        "model": model,
+        "latency": latency,
+        **usage
+    }
+
+    cache_ratio = usage["cached_tokens"] / usage["input_tokens"] if usage["input_tokens"] else 0.0
+    logger.info(
+        f"[LLM Usage] {node} ({model}): 입력 {usage['input_tokens']} 토큰 "
+        f"(캐시 {usage['cached_tokens']}, {cache_ratio:.0%}), 출력 {usage['output_tokens']} 토큰, "
+        f"{latency:.2f}초"
+    )
+    return record
+
+
+def summarize_llm_calls(llm_calls: List[Dict[str, Any]]) -> Dict[str, int]:
+    """쿼리 1건의 LLM 호출 사용량 합계"""
+    input_tokens = sum(call.get("input_tokens", 0) for call in llm_calls)
+    cached_tokens = sum(call.get("cached_tokens", 0) for call in llm_calls)
+    output_tokens = sum(call.get("output_tokens", 0) for call in llm_calls)
+
+    return {
+        "llm_call_count": len(llm_calls),
+        "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
+        "output_tokens": output_tokens
+    }
+
+
+def summarize_model_latency(llm_calls: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """쿼리 1건의 모델별 호출 수와 지연 시간 합계"""
+    summary: Dict[str, Dict[str, float]] = {}
+    for call in llm_calls:
+        entry = summary.setdefault(call["model"], {"calls": 0, "latency": 0.0})
+        entry["calls"] += 1
+        entry["latency"] += call["latency"]
+    return summary
@@ -0,0 +1,206 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import METRICS_CONFIG, PROCESSING_STAGES
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Iterable[str], values: Iterable[str], extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs += [f'{name}="{_escape(value)}"' for name, value in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 형식)"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = METRICS_CONFIG["latency_buckets"]
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[LabelValues, Dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._values[key] = entry
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["counts"][i] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, entry in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, entry["counts"]):
+                    labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(entry['sum'])}")
+                lines.append(f"{self.name}_count{labels} {entry['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 저장소 (Prometheus text exposition format 0.0.4로 출력)"""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace: str = METRICS_CONFIG["namespace"]):
+        self.namespace = namespace
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(f"{self.namespace}_{name}", documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = METRICS_CONFIG["latency_buckets"]
+    ) -> Histogram:
+        return self._register(Histogram(f"{self.namespace}_{name}", documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """현재 지표를 파일로 저장 (CLI 모드 종료 시)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+
+
+# 전역 지표 저장소와 지표 정의
+metrics_registry = MetricsRegistry()
+
+QUERIES_TOTAL = metrics_registry.counter(
+    "queries_total", "처리한 쿼리 수", ("status",)
+)
+QUERY_LATENCY = metrics_registry.histogram(
+    "query_latency_seconds", "쿼리 end-to-end 처리 시간"
+)
+NODE_LATENCY = metrics_registry.histogram(
+    "node_latency_seconds", "그래프 노드 실행 시간", ("node",)
+)
+LLM_CALLS_TOTAL = metrics_registry.counter(
+    "llm_calls_total", "LLM 호출 수", ("node", "model")
+)
+LLM_LATENCY = metrics_registry.histogram(
+    "llm_latency_seconds", "LLM 호출 시간 (재시도 포함)", ("model",)
+)
+LLM_TOKENS_TOTAL = metrics_registry.counter(
+    "llm_tokens_total", "LLM 토큰 사용량 (type: input, cached, output)", ("model", "type")
+)
+TOOL_CALLS_TOTAL = metrics_registry.counter(
+    "tool_calls_total", "MCP 도구 호출 수 (cache: hit, miss, prefetch, bypass)", ("server", "tool", "status", "cache")
+)
+TOOL_LATENCY = metrics_registry.histogram(
+    "tool_latency_seconds", "MCP 도구 호출 시간 (캐시 적중 포함)", ("server", "tool")
+)
+MAX_TOOL_CALLS_REACHED_TOTAL = metrics_registry.counter(
+    "max_tool_calls_reached_total", "tool_call_count가 max_tool_calls에 도달한 쿼리 수"
+)
+FORCE_FINAL_ANSWER_TOTAL = metrics_registry.counter(
+    "force_final_answer_total", "force_final_answer로 강제 답변한 쿼리 수"
+)
+MODEL_ROUTING_TOTAL = metrics_registry.counter(
+    "model_routing_total", "노드별 시작 모델 선택 수 (reason: 선택 사유)", ("node", "model", "reason")
+)
+MODEL_ESCALATIONS_TOTAL = metrics_registry.counter(
+    "model_escalations_total", "gpt-4o-mini 신뢰도 검사 실패로 gpt-4o를 다시 호출한 수", ("node", "reason")
+)
+FAST_PATH_TOTAL = metrics_registry.counter(
+    "fast_path_total", "fast path(결정적 의도 분류)로 답변한 쿼리 수", ("intent",)
+)
+
+
+def observe_query(final_state: Optional[Dict], execution_time: float, success: bool):
+    """쿼리 1건의 처리 결과를 지표에 반영 (도구 호출 지표는 ToolExecutor에서 기록)"""
+    QUERIES_TOTAL.inc(status="success" if success else "error")
+    QUERY_LATENCY.observe(execution_time)
+    if not final_state:
+        return
+
+    for timing in final_state.get("node_timings") or []:
+        NODE_LATENCY.observe(timing["duration"], node=timing["node"])
+
+    for call in final_state.get("llm_calls") or []:
+        LLM_CALLS_TOTAL.inc(node=call["node"], model=call["model"])
+        LLM_LATENCY.observe(call["latency"], model=call["model"])
+        for token_type in ("input", "cached", "output"):
+            LLM_TOKENS_TOTAL.inc(call.get(f"{token_type}_tokens", 0), model=call["model"], type=token_type)
+
+    if final_state.get("tool_call_count", 0) >= final_state.get("max_tool_calls", 3):
+        MAX_TOOL_CALLS_REACHED_TOTAL.inc()
+    if final_state.get("processing_stage") == PROCESSING_STAGES["FORCE_ANSWERED"]:
+        FORCE_FINAL_ANSWER_TOTAL.inc()
+    if final_state.get("fast_path_intent"):
+        FAST_PATH_TOTAL.inc(intent=final_state["fast_path_intent"])
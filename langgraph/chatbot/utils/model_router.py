@@ -0,0 +1,176 @@
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import MODEL_ROUTING_CONFIG, GPT_4O_MINI_CONFIG, GPT_4O_CONFIG
+from utils.llm_clients import gpt_4o_mini_with_tools, gpt_4o_with_tools
+from utils.streaming_dispatch import streaming_dispatcher
+from utils.resilient_llm import invoke_llm
+from utils.metrics import MODEL_ROUTING_TOTAL, MODEL_ESCALATIONS_TOTAL
+from utils.logger import logger
+
+MINI_MODEL = GPT_4O_MINI_CONFIG["model"]
+FULL_MODEL = GPT_4O_CONFIG["model"]
+
+ROUTED_LLMS = {
+    MINI_MODEL: gpt_4o_mini_with_tools,
+    FULL_MODEL: gpt_4o_with_tools
+}
+
+
+def response_confidence(response: Any) -> Optional[float]:
+    """응답 토큰 logprobs의 평균 확률 (logprobs가 없으면 None)"""
+    logprobs = (getattr(response, "response_metadata", None) or {}).get("logprobs") or {}
+    tokens = logprobs.get("content") or []
+    values = [token["logprob"] for token in tokens if token.get("logprob") is not None]
+    if not values:
+        return None
+    return math.exp(sum(values) / len(values))
+
+
+class ModelRouter:
+    """
+    노드별 모델 선택과 gpt-4o 승격 정책
+
+    - 질문 분류(단순 질문 여부), 참고 컨텍스트 크기, 도구 호출 반복 횟수로 시작 모델 결정
+    - gpt-4o-mini의 최종 답변이 신뢰도 검사(빈 답변, 불확실 문구, logprobs 평균 확률, 컨텍스트 대비 길이)를
+      통과하지 못하면 같은 프롬프트로 gpt-4o를 한 번 더 호출
+    - 라우팅 결정과 모델별 지연 시간을 누적하여 임계값 조정에 사용
+    """
+
+    def __init__(self, config: Dict[str, Any] = MODEL_ROUTING_CONFIG):
+        self.config = config
+        self._lock = threading.Lock()
+        self.decisions: Dict[str, int] = {}
+        self.escalations: Dict[str, int] = {}
+        self.model_latency: Dict[str, Dict[str, float]] = {}
+
+    def choose(self, node: str, state: Dict[str, Any], context_tokens: int = 0) -> Tuple[str, str]:
+        """시작 모델과 선택 사유 반환"""
+        if not self.config["enabled"] or node not in self.config["nodes"]:
+            return FULL_MODEL, "routing_disabled"
+        if context_tokens > self.config["max_mini_context_tokens"]:
+            return FULL_MODEL, "large_context"
+        if state.get("tool_call_count", 0) >= self.config["max_mini_tool_iterations"]:
+            return FULL_MODEL, "tool_iteration"
+        if state.get("is_simple_query"):
+            return MINI_MODEL, "simple_query"
+        return MINI_MODEL, "default"
+
+    def check_confidence(self, response: Any, has_context: bool) -> Tuple[bool, str, Optional[float]]:
+        """
+        gpt-4o-mini 응답 신뢰도 검사
+
+        Returns:
+            (통과 여부, 사유, logprobs 평균 확률)
+        """
+        confidence = response_confidence(response)
+        # 도구 호출은 결과를 받아 다음 호출에서 다시 판단하므로 통과
+        if getattr(response, "tool_calls", None):
+            return True, "tool_calls", confidence
+
+        answer = (response.content or "").strip() if isinstance(response.content, str) else ""
+        if not answer:
+            return False, "empty_answer", confidence
+        if any(phrase.lower() in answer.lower() for phrase in self.config["uncertain_phrases"]):
+            return False, "uncertain_answer", confidence
+        if confidence is not None and confidence < self.config["min_confidence"]:
+            return False, "low_confidence", confidence
+        if has_context and len(answer) < self.config["min_context_answer_chars"]:
+            return False, "short_answer", confidence
+        return True, "passed", confidence
+
+    def record(self, node: str, decision: Dict[str, Any], llm_calls: List[Dict[str, Any]]):
+        """라우팅 결정과 모델별 지연 시간 누적 (지표 포함)"""
+        MODEL_ROUTING_TOTAL.inc(node=node, model=decision["model"], reason=decision["reason"])
+        if decision["escalated"]:
+            MODEL_ESCALATIONS_TOTAL.inc(node=node, reason=decision["escalation_reason"])
+
+        with self._lock:
+            key = f"{node}:{decision['model']}:{decision['reason']}"
+            self.decisions[key] = self.decisions.get(key, 0) + 1
+            if decision["escalated"]:
+                self.escalations[node] = self.escalations.get(node, 0) + 1
+            for call in llm_calls:
+                entry = self.model_latency.setdefault(call["model"], {"calls": 0, "total_latency": 0.0})
+                entry["calls"] += 1
+                entry["total_latency"] += call["latency"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routed = sum(self.decisions.values())
+            escalated = sum(self.escalations.values())
+            return {
+                "decisions": dict(self.decisions),
+                "escalations": dict(self.escalations),
+                "escalation_rate": escalated / routed if routed else 0.0,
+                "model_latency": {
+                    model: {
+                        "calls": entry["calls"],
+                        "avg_latency": entry["total_latency"] / entry["calls"] if entry["calls"] else 0.0
+                    }
+                    for model, entry in self.model_latency.items()
+                }
+            }
+
+
+async def invoke_routed(
+    node: str,
+    state: Dict[str, Any],
+    prompt: List,
+    context_tokens: int = 0
+) -> Tuple[Any, List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    모델 라우팅을 적용한 도구 바인딩 LLM 호출 (direct_answer, generate 공용)
+
+    Returns:
+        (응답 메시지, LLM 호출 기록 목록, 라우팅 결정 기록)
+    """
+    # 스트리밍 도구 선행 실행은 이번 호출 후에도 최대 도구 호출 횟수를 넘지 않을 때만 허용
+    # (선행 실행 중에는 헤징하면 도구가 중복 실행되므로 헤징하지 않음)
+    allow_dispatch = state.get("tool_call_count", 0) + 1 <= state.get("max_tool_calls", 3)
+
+    async def call(model: str):
+        llm = ROUTED_LLMS[model]
+        return await invoke_llm(
+            node, model, prompt,
+            request_factory=lambda: streaming_dispatcher.ainvoke(
+                llm, prompt, session_id=state.get("session_id"), allow_dispatch=allow_dispatch
+            ),
+            deadline=state.get("deadline"),
+            hedge=not streaming_dispatcher.enabled
+        )
+
+    model, reason = model_router.choose(node, state, context_tokens)
+    response, llm_call = await call(model)
+    llm_calls = [llm_call]
+    decision = {
+        "node": node,
+        "model": model,
+        "reason": reason,
+        "context_tokens": context_tokens,
+        "confidence": None,
+        "escalated": False,
+        "escalation_reason": None
+    }
+
+    if model == MINI_MODEL:
+        passed, check_reason, confidence = model_router.check_confidence(response, has_context=context_tokens > 0)
+        decision["confidence"] = confidence
+        if not passed:
+            logger.info(f"[Model Router] ⬆️ {node}: {MINI_MODEL} 신뢰도 검사 실패({check_reason}) → {FULL_MODEL}")
+            decision["escalated"] = True
+            decision["escalation_reason"] = check_reason
+            response, llm_call = await call(FULL_MODEL)
+            llm_calls.append(llm_call)
+
+    logger.info(
+        f"[Model Router] {node}: {model} ({reason})"
+        + (f" → {FULL_MODEL} ({decision['escalation_reason']})" if decision["escalated"] else "")
+    )
+    model_router.record(node, decision, llm_calls)
+    return response, llm_calls, decision
+
+
+# 전역 모델 라우터
+model_router = ModelRouter()
@@ -0,0 +1,44 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, List
+
+from utils.tracing import tracer
+
+
+def _with_timing(result: Any, node: str, start_time: float) -> Any:
+    """노드 반환값(상태 업데이트)에 실행 시간 기록 추가"""
+    if not isinstance(result, dict):
+        return result
+    return {**result, "node_timings": [{"node": node, "duration": time.time() - start_time}]}
+
+
+def timed_node(node: str, func: Callable) -> Callable:
+    """
+    노드 실행 시간을 state["node_timings"]에 기록하고 node span을 남기는 래퍼
+    (동기/비동기 노드 모두 지원)
+    """
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state):
+            with tracer.span(node, kind="node"):
+                start_time = time.time()
+                result = await func(state)
+                return _with_timing(result, node, start_time)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state):
+        with tracer.span(node, kind="node"):
+            start_time = time.time()
+            result = func(state)
+            return _with_timing(result, node, start_time)
+    return wrapper
+
+
+def summarize_node_timings(node_timings: List[Dict[str, Any]]) -> Dict[str, float]:
+    """쿼리 1건의 노드별 실행 시간 합계 (tools → generate 반복 등 재실행 포함)"""
+    totals: Dict[str, float] = {}
+    for timing in node_timings:
+        totals[timing["node"]] = totals.get(timing["node"], 0.0) + timing["duration"]
+    return totals
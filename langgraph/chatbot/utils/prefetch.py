@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import ToolMessage
+
+from config import PREFETCH_CONFIG
+from utils.logger import logger
+from utils.tool_executor import ToolExecutor, tool_executor
+
+
+class RetrievalPrefetcher:
+    """
+    검색 선행 실행기 (speculative prefetch)
+
+    재작성 쿼리가 준비되는 즉시 retrieve_documents를 백그라운드로 실행하고,
+    이후 인자가 일치하는 retrieve_documents 호출이 오면 선행 결과로 응답합니다.
+    사용되지 않은 선행 실행은 단순 질문 판별 시점이나 쿼리 처리 종료 시 취소됩니다.
+    """
+
+    TOOL_NAME = "retrieve_documents"
+
+    def __init__(self, executor: ToolExecutor, config: Dict[str, Any] = PREFETCH_CONFIG):
+        self.executor = executor
+        self.enabled = config["enabled"]
+        self.collection_name = config["collection_name"]
+        self.top_k = config["top_k"]
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._session_results: Dict[str, Dict[str, Any]] = {}
+        self.started = 0
+        self.hits = 0
+        self.mismatches = 0
+        self.cancelled = 0
+        self.saved_seconds = 0.0
+
+    def start(self, session_id: str, query: str):
+        """재작성 쿼리로 선행 검색 시작"""
+        if not self.enabled or not query:
+            return
+        if self.TOOL_NAME not in self.executor.tools:
+            return
+
+        # 같은 세션의 이전 선행 실행은 대체
+        self.cancel(session_id, reason="replaced")
+
+        args = {
+            "query": query,
+            "collection_name": self.collection_name,
+            "top_k": self.top_k
+        }
+        entry = {
+            "key": self.executor.cache.make_key(self.TOOL_NAME, args),
+            "started_at": time.time(),
+            "finished_at": None
+        }
+
+        task = asyncio.create_task(
+            self.executor.invoke(self.TOOL_NAME, args, tool_call_id=f"prefetch_{session_id}")
+        )
+        task.add_done_callback(lambda _: entry.__setitem__("finished_at", time.time()))
+        entry["task"] = task
+
+        self._pending[session_id] = entry
+        self._session_results[session_id] = {"started": True, "hit": False, "saved_seconds": 0.0}
+        self.started += 1
+        logger.info(f"[Prefetch] 🚀 선행 검색 시작 [{session_id}]: {query}")
+
+    async def take(self, session_id: str, tool_name: str, args: Dict[str, Any]) -> Optional[ToolMessage]:
+        """인자가 일치하는 선행 검색 결과 반환 (없거나 실패하면 None)"""
+        if tool_name != self.TOOL_NAME or session_id not in self._pending:
+            return None
+
+        entry = self._pending[session_id]
+        if entry["key"] != self.executor.cache.make_key(tool_name, args):
+            self.mismatches += 1
+            logger.info(f"[Prefetch] 인자 불일치 - 선행 검색 미사용 [{session_id}]")
+            return None
+
+        del self._pending[session_id]
+        requested_at = time.time()
+
+        try:
+            message = await entry["task"]
+        except asyncio.CancelledError:
+            return None
+
+        if message.status == "error":
+            return None
+
+        # 절약 시간 = (요청 시점부터 새로 실행했을 때의 완료 시각) - (실제 결과 수신 시각)
+        finished_at = entry["finished_at"] or time.time()
+        duration = finished_at - entry["started_at"]
+        saved = max(0.0, (requested_at + duration) - max(finished_at, requested_at))
+
+        self.hits += 1
+        self.saved_seconds += saved
+        self._session_results[session_id].update({"hit": True, "saved_seconds": saved})
+        logger.info(f"[Prefetch] ✅ 선행 검색 적중 [{session_id}] (절약: {saved:.2f}초)")
+        return message
+
+    def cancel(self, session_id: str, reason: str = "unused"):
+        """사용되지 않은 선행 검색 취소"""
+        entry = self._pending.pop(session_id, None)
+        if entry is None:
+            return
+
+        if not entry["task"].done():
+            entry["task"].cancel()
+        self.cancelled += 1
+        self._session_results.setdefault(session_id, {})["cancelled"] = reason
+        logger.info(f"[Prefetch] ⊘ 선행 검색 취소 [{session_id}] ({reason})")
+
+    def finish(self, session_id: str) -> Dict[str, Any]:
+        """쿼리 처리 종료 - 남은 선행 검색 취소 후 이번 쿼리의 결과 반환"""
+        self.cancel(session_id, reason="query_finished")
+        return self._session_results.pop(session_id, {"started": False})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "started": self.started,
+            "hits": self.hits,
+            "mismatches": self.mismatches,
+            "cancelled": self.cancelled,
+            "hit_rate": self.hits / self.started if self.started else 0.0,
+            "saved_seconds": self.saved_seconds
+        }
+
+
+# 전역 선행 검색 실행기 (도구 실행기에 연결)
+retrieval_prefetcher = RetrievalPrefetcher(tool_executor)
+tool_executor.prefetcher = retrieval_prefetcher
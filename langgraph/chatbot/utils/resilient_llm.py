@@ -0,0 +1,233 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError, InternalServerError, RateLimitError
+
+from config import LLM_RESILIENCE_CONFIG
+from utils.llm_usage import build_llm_call_record
+from utils.logger import logger
+from utils.tracing import tracer
+
+
+class LLMDeadlineExceeded(asyncio.TimeoutError):
+    """쿼리 deadline 안에 LLM 응답을 받지 못한 경우"""
+
+
+# 재시도 대상: 타임아웃, 연결 오류, 429, 5xx (인증/요청 형식 오류 등은 재시도해도 같은 결과이므로 즉시 전파)
+RETRYABLE_ERRORS = (asyncio.TimeoutError, APITimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+class ResilientLLMCaller:
+    """
+    LLM 호출 안정화 래퍼
+
+    - 호출별 타임아웃: min(call_timeout, 쿼리 deadline까지 남은 시간)
+    - 재시도: 일시적 오류(is_retryable)만 최대 max_retries회, 지수 백오프 + full jitter (deadline 안에서만)
+    - 헤징(선택): 모델별 최근 지연 시간의 hedge_percentile 분위수가 지나도 응답이 없으면
+      동일 요청을 한 번 더 보내고 먼저 도착한 응답을 사용 (나머지는 취소)
+    """
+
+    def __init__(self, config: Dict[str, Any] = LLM_RESILIENCE_CONFIG):
+        self.call_timeout = config["call_timeout"]
+        self.max_retries = config["max_retries"]
+        self.backoff_base = config["backoff_base"]
+        self.backoff_max = config["backoff_max"]
+        self.hedge_enabled = config["hedge_enabled"]
+        self.hedge_percentile = config["hedge_percentile"]
+        self.hedge_min_samples = config["hedge_min_samples"]
+        self.hedge_initial_delay = config["hedge_initial_delay"]
+        self.latency_window = config["latency_window"]
+        self._latencies: Dict[str, deque] = {}
+
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self, model: str) -> float:
+        """헤징 요청을 보내기까지 대기 시간 (최근 지연 시간 분위수)"""
+        latencies = self._latencies.get(model)
+        if not latencies or len(latencies) < self.hedge_min_samples:
+            return self.hedge_initial_delay
+
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return ordered[index]
+
+    def _record_latency(self, model: str, latency: float):
+        self._latencies.setdefault(model, deque(maxlen=self.latency_window)).append(latency)
+
+    async def _attempt(
+        self,
+        request_factory: Callable[[], Awaitable[Any]],
+        model: str,
+        timeout: float,
+        hedge: bool
+    ) -> Tuple[Any, bool, bool]:
+        """1회 시도 (헤징 포함). 반환: (응답, 헤징 발생 여부, 헤징 요청 승리 여부)"""
+        start_time = time.time()
+        end_time = start_time + timeout
+        primary = asyncio.create_task(request_factory())
+        hedge_task = None
+
+        try:
+            delay = self.hedge_delay(model) if hedge and self.hedge_enabled else None
+            if delay is not None and delay < timeout:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    hedge_task = asyncio.create_task(request_factory())
+                    self.hedges_fired += 1
+                    logger.info(f"[Resilient LLM] 🪁 {model} 헤징 요청 전송 ({delay:.2f}초 경과)")
+
+            pending = {task for task in (primary, hedge_task) if task is not None}
+            last_error = None
+
+            while pending:
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+
+                for task in done:
+                    if task.exception() is None:
+                        hedge_won = task is hedge_task
+                        if hedge_won:
+                            self.hedges_won += 1
+                        self._record_latency(model, time.time() - start_time)
+                        return task.result(), hedge_task is not None, hedge_won
+                    last_error = task.exception()
+
+            if last_error is not None and not pending:
+                raise last_error
+
+            self.timeouts += 1
+            raise asyncio.TimeoutError(f"{model} 응답 시간 초과 ({timeout:.1f}초)")
+
+        finally:
+            for task in (primary, hedge_task):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def call(
+        self,
+        request_factory: Callable[[], Awaitable[Any]],
+        model: str,
+        deadline: Optional[float] = None,
+        hedge: bool = True
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        LLM 호출 (타임아웃, 재시도, 헤징 적용)
+
+        Args:
+            request_factory: 호출할 때마다 새 요청 coroutine을 만드는 함수
+            model: 모델 이름 (지연 시간 통계 키)
+            deadline: 쿼리 deadline (time.time() 기준 절대 시각)
+            hedge: 헤징 허용 여부 (부수 효과가 있는 요청은 False)
+        """
+        self.calls += 1
+        attempts = 0
+
+        while True:
+            timeout = self.call_timeout
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise LLMDeadlineExceeded(f"{model} 호출 전 쿼리 deadline 초과")
+                timeout = min(timeout, remaining)
+
+            attempts += 1
+            try:
+                response, hedged, hedge_won = await self._attempt(request_factory, model, timeout, hedge)
+                return response, {"attempts": attempts, "hedged": hedged, "hedge_won": hedge_won}
+
+            except Exception as e:
+                if not is_retryable(e):
+                    logger.error(f"[Resilient LLM] ❌ {model} 호출 실패 (재시도 대상 아님): {type(e).__name__}: {e}")
+                    raise
+                if attempts > self.max_retries:
+                    logger.error(f"[Resilient LLM] ❌ {model} 호출 실패 ({attempts}회 시도): {e}")
+                    raise
+
+                backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1))))
+                if deadline is not None and time.time() + backoff >= deadline:
+                    logger.error(f"[Resilient LLM] ❌ {model} 재시도 불가 - 쿼리 deadline 임박: {e}")
+                    raise
+
+                self.retries += 1
+                logger.warning(
+                    f"[Resilient LLM] ⚠️ {model} 호출 실패, {backoff:.2f}초 후 재시도 "
+                    f"({attempts}/{self.max_retries}): {e}"
+                )
+                await asyncio.sleep(backoff)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "hedge_fire_rate": self.hedges_fired / self.calls if self.calls else 0.0,
+            "hedge_win_rate": self.hedges_won / self.hedges_fired if self.hedges_fired else 0.0,
+            "hedge_delays": {model: self.hedge_delay(model) for model in self._latencies}
+        }
+
+
+# 전역 LLM 호출 래퍼 (모든 노드 공용)
+llm_caller = ResilientLLMCaller()
+
+
+async def invoke_llm(
+    node: str,
+    model: str,
+    prompt: List,
+    llm=None,
+    request_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+    deadline: Optional[float] = None,
+    hedge: bool = True
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    노드 공용 LLM 호출
+
+    Args:
+        node: 호출한 노드 이름 (사용량 기록용)
+        model: 모델 이름
+        prompt: 프롬프트 메시지 목록
+        llm: 호출할 LLM (request_factory가 없을 때 llm.ainvoke(prompt) 사용)
+        request_factory: 요청 coroutine 생성 함수 (스트리밍 등 별도 호출 방식)
+        deadline: 쿼리 deadline
+        hedge: 헤징 허용 여부
+
+    Returns:
+        (응답 메시지, LLM 호출 기록)
+    """
+    if request_factory is None:
+        request_factory = lambda: llm.ainvoke(prompt)  # noqa: E731
+
+    with tracer.span(f"llm.{node}", kind="llm", model=model) as span:
+        start_time = time.time()
+        response, call_info = await llm_caller.call(request_factory, model, deadline=deadline, hedge=hedge)
+        record = build_llm_call_record(node, model, response, time.time() - start_time)
+        record.update(call_info)
+        span.set(
+            input_tokens=record["input_tokens"],
+            cached_tokens=record["cached_tokens"],
+            output_tokens=record["output_tokens"],
+            **call_info
+        )
+        return response, record
@@ -0,0 +1,104 @@
+import re
+from typing import Any, Dict, Optional
+
+from config import RETRIEVAL_MEMORY_CONFIG
+
+# 메모리로 대체되는 도구 왕복 (retrieve_documents → rerank_documents)
+SAVED_TOOL_CALLS_PER_HIT = 2
+
+# 후속 질문 표지 (이전 턴 검색 결과를 가리키는 지시어/연결어)
+# - 한국어 지시어는 조사가 붙은 형태도 인식 (그거는, 그것도, 거기에서, 해당 내용을 ...)
+# - 관형사 "이/그"는 뒤에 띄어쓰기가 올 때만 인식 ("이 절차", "그 방법"), "저"는 1인칭과 구분되지 않아 제외
+# - 영어는 일반 인칭 대명사(I, you, we 등)를 제외하고 앞 내용을 가리키는 표현만 사용
+FOLLOW_UP_MARKERS_KO = (
+    "그거", "그것", "이거", "이것", "저거", "저것", "거기", "여기", "그건", "이건", "그게", "이게",
+    "해당", "위", "앞", "방금", "아까", "그럼", "그러면", "그리고", "그래서", "또", "더"
+)
+FOLLOW_UP_DETERMINERS_KO = ("이", "그", "위의", "앞의")
+FOLLOW_UP_MARKERS_EN = (
+    "it", "its", "that", "this", "these", "those", "they", "them", "there",
+    "above", "previous", "mentioned", "what about", "how about", "more detail", "more details"
+)
+KOREAN_PARTICLES = (
+    "에서는", "에서", "에는", "으로", "로", "에", "은", "는", "이", "가", "을", "를",
+    "도", "만", "의", "랑", "이랑", "하고", "보다", "처럼", "까지", "부터", "요"
+)
+
+_FOLLOW_UP_KO = re.compile(
+    r"(?:^|(?<=[\s\"'(]))(?:"
+    rf"(?:{'|'.join(map(re.escape, FOLLOW_UP_MARKERS_KO))})"
+    rf"(?:{'|'.join(map(re.escape, KOREAN_PARTICLES))})?(?=[\s?.!,~]|$)"
+    rf"|(?:{'|'.join(map(re.escape, FOLLOW_UP_DETERMINERS_KO))})\s"
+    r")"
+)
+_FOLLOW_UP_EN = re.compile(
+    rf"\b(?:{'|'.join(map(re.escape, FOLLOW_UP_MARKERS_EN))})\b",
+    re.IGNORECASE
+)
+
+
+def is_follow_up(query: str) -> bool:
+    """이전 턴 검색 결과를 가리키는 후속 질문인지 여부 (FOLLOW_UP_MARKERS_* 기준)"""
+    query = (query or "").strip()
+    return bool(_FOLLOW_UP_KO.search(query) or _FOLLOW_UP_EN.search(query))
+
+
+def can_use_memory(state: Dict[str, Any]) -> bool:
+    """
+    이번 턴에서 세션 검색 메모리로 먼저 답변할지 여부
+
+    후속 질문(지시어/연결어 포함, is_follow_up)이고, 유효한 메모리가 있으며, 이번 턴에 새로 검색한 컨텍스트가 없을 때만 사용
+    """
+    if not RETRIEVAL_MEMORY_CONFIG["enabled"]:
+        return False
+
+    memory = state.get("retrieval_memory")
+    if not memory or not memory.get("contexts"):
+        return False
+    if state.get("reranked_context") or state.get("result_set_id"):
+        return False
+
+    return is_follow_up(state.get("user_query", ""))
+
+
+def update_memory(
+    final_state: Dict[str, Any],
+    previous: Optional[Dict[str, Any]],
+    turn: int
+) -> Optional[Dict[str, Any]]:
+    """
+    턴 종료 후 세션 검색 메모리 갱신
+
+    이번 턴에 rerank된 청크가 있으면 교체하고, 없으면 이전 메모리를 max_age_turns 동안 유지
+    """
+    contexts = final_state.get("reranked_context") or []
+    if final_state.get("is_reranked") and contexts and final_state.get("result_set_id"):
+        return {
+            "query": final_state.get("rewritten_query") or final_state.get("user_query"),
+            "chunk_ids": final_state.get("reranked_chunk_ids") or [],
+            "contexts": contexts,
+            "turn": turn
+        }
+
+    if previous and turn - previous["turn"] < RETRIEVAL_MEMORY_CONFIG["max_age_turns"]:
+        return previous
+    return None
+
+
+def memory_outcome(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    이번 턴의 메모리 사용 결과
+
+    - hit: 메모리 컨텍스트를 넣은 generate 호출이 최종 답변을 생성 (retrieve → rerank 왕복 절약)
+    - fallback: 메모리가 부족하여 LLM이 다시 검색
+    - 둘 다 아님: 메모리를 시도했지만 답변이 다른 경로(최대 도구 호출 강제 종료, 오류 등)로 끝남
+    """
+    used = bool(final_state.get("retrieval_memory_used"))
+    fallback = used and bool(final_state.get("result_set_id"))
+    hit = used and not fallback and bool(final_state.get("retrieval_memory_answered"))
+    return {
+        "used": used,
+        "hit": hit,
+        "fallback": fallback,
+        "saved_tool_calls": SAVED_TOOL_CALLS_PER_HIT if hit else 0
+    }
@@ -0,0 +1,108 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from langchain_core.messages import AIMessage, message_chunk_to_message
+
+from config import STREAMING_DISPATCH_CONFIG
+from utils.logger import logger
+from utils.tool_executor import ToolExecutor, tool_executor
+
+
+class StreamingToolDispatcher:
+    """
+    스트리밍 중 도구 선행 실행기
+
+    LLM 응답을 스트리밍으로 받으면서, 다음 tool call 청크가 시작되어 인자가 확정된
+    tool call부터 즉시 도구 실행을 시작합니다. 도구 실행 시간이 나머지 응답 생성과 겹칩니다.
+    tool_call 노드는 ToolExecutor.execute에서 선행 실행된 결과를 tool_calls 순서대로 사용합니다.
+    """
+
+    def __init__(self, executor: ToolExecutor, enabled: bool = STREAMING_DISPATCH_CONFIG["enabled"]):
+        self.executor = executor
+        self.enabled = enabled
+        self._tasks: Dict[str, Dict[str, asyncio.Task]] = {}
+        self.dispatched = 0
+
+    def _dispatch(self, session_id: str, tool_call_chunk: Dict[str, Any]) -> bool:
+        """인자가 완성된 tool call 청크의 도구 실행 시작"""
+        tool_call_id = tool_call_chunk.get("id")
+        name = tool_call_chunk.get("name")
+        if not tool_call_id or not name:
+            return False
+
+        try:
+            args = json.loads(tool_call_chunk.get("args") or "{}")
+        except json.JSONDecodeError:
+            return False
+
+        session_tasks = self._tasks.setdefault(session_id, {})
+        if tool_call_id in session_tasks:
+            return False
+
+        session_tasks[tool_call_id] = asyncio.create_task(
+            self.executor.invoke(name, args, tool_call_id, session_id=session_id)
+        )
+        self.dispatched += 1
+        logger.info(f"[Streaming Dispatch] ⚡ 스트리밍 중 도구 실행 시작: {name}({args})")
+        return True
+
+    async def ainvoke(self, llm, prompt: List, session_id: str, allow_dispatch: bool = True) -> AIMessage:
+        """
+        LLM 호출 (활성화 시 스트리밍 + 도구 선행 실행)
+
+        Args:
+            llm: 도구가 바인딩된 LLM
+            prompt: 프롬프트 메시지 목록
+            session_id: 세션 ID (선행 실행 결과 조회 키)
+            allow_dispatch: False이면 스트리밍만 하고 도구는 실행하지 않음
+                (최대 도구 호출 횟수 도달 등)
+        """
+        if not self.enabled or not session_id:
+            return await llm.ainvoke(prompt)
+
+        aggregated = None
+        dispatched_indices = set()
+
+        async for chunk in llm.astream(prompt):
+            aggregated = chunk if aggregated is None else aggregated + chunk
+
+            if not allow_dispatch or not chunk.tool_call_chunks:
+                continue
+
+            # 새 index의 청크가 도착하면 그보다 앞선 tool call의 인자는 확정된 상태
+            current_index = max(
+                (c.get("index") or 0) for c in chunk.tool_call_chunks
+            )
+            for tool_call_chunk in aggregated.tool_call_chunks:
+                index = tool_call_chunk.get("index") or 0
+                if index < current_index and index not in dispatched_indices:
+                    if self._dispatch(session_id, tool_call_chunk):
+                        dispatched_indices.add(index)
+
+        if aggregated is None:
+            return await llm.ainvoke(prompt)
+
+        # 마지막 tool call은 스트림 종료 시점에 확정
+        if allow_dispatch:
+            for tool_call_chunk in aggregated.tool_call_chunks:
+                index = tool_call_chunk.get("index") or 0
+                if index not in dispatched_indices and self._dispatch(session_id, tool_call_chunk):
+                    dispatched_indices.add(index)
+
+        return message_chunk_to_message(aggregated)
+
+    def pop_tasks(self, session_id: str) -> Dict[str, asyncio.Task]:
+        """선행 실행된 도구 task 반환 (tool_call_id → task)"""
+        return self._tasks.pop(session_id, {})
+
+    def cancel(self, session_id: str):
+        """사용되지 않은 선행 실행 취소 (강제 답변 경로, 쿼리 종료 등)"""
+        for task in self.pop_tasks(session_id).values():
+            if not task.done():
+                task.cancel()
+
+
+# 전역 스트리밍 도구 실행기 (도구 실행기에 연결)
+streaming_dispatcher = StreamingToolDispatcher(tool_executor)
+tool_executor.dispatcher = streaming_dispatcher
@@ -29,7 +29,7 @@ def extract_pronouns_and_references(text: str) -> List[str]:
         "너", "당신", "너희", "당신들"
     ]
     demonstratives_en = ["this", "that", "these", "those"]
-    demonstratives_ko = ["이것", "저것", "그것", "이", "그", "저"]
+    demonstratives_ko = ["이것", "저것", "그것", "이거", "저거", "그거", "이", "그", "저", "해당"]
 
     vocab = pronouns_en + pronouns_ko + demonstratives_en + demonstratives_ko
 
@@ -0,0 +1,138 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config import TOOL_CACHE_CONFIG
+
+
+def canonicalize_args(value: Any) -> Any:
+    """캐시 키 생성을 위한 인자 정규화 (dict 키 정렬, 문자열 공백 정리)"""
+    if isinstance(value, dict):
+        return {k: canonicalize_args(v) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize_args(v) for v in value]
+    if isinstance(value, str):
+        return " ".join(value.split())
+    return value
+
+
+class ToolResultCache:
+    """
+    도구 결과 캐시 (LRU + 도구별 TTL 정책)
+
+    - 키: 도구 이름 + 정규화된 인자
+    - 정책: ttl(초, 0이면 캐시 안 함), invalidate_on_collection_change
+    - 컬렉션 변경 감지: rag_ingest가 갱신하는 collection_versions.json의 내용
+    - 결과 세트 만료 감지: rerank가 알린 result_set_id를 담은 항목 무효화
+    """
+
+    def __init__(
+        self,
+        policies: Dict[str, Dict[str, Any]] = None,
+        max_entries: int = TOOL_CACHE_CONFIG["max_entries"],
+        collection_versions_path: str = TOOL_CACHE_CONFIG["collection_versions_path"],
+        enabled: bool = TOOL_CACHE_CONFIG["enabled"]
+    ):
+        self.policies = policies if policies is not None else TOOL_CACHE_CONFIG["policies"]
+        self.max_entries = max_entries
+        self.collection_versions_path = collection_versions_path
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._collection_version_mtime = None
+        self._collection_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        policy = self.policies.get(tool_name)
+        return self.enabled and bool(policy) and policy.get("ttl", 0) > 0
+
+    def make_key(self, tool_name: str, args: Dict[str, Any]) -> str:
+        canonical = canonicalize_args(args or {})
+        return f"{tool_name}:{json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(',', ':'))}"
+
+    def _current_collection_version(self) -> Optional[str]:
+        """collection_versions.json 내용 (mtime이 바뀔 때만 다시 읽음)"""
+        try:
+            mtime = os.stat(self.collection_versions_path).st_mtime_ns
+        except OSError:
+            return None
+
+        if mtime != self._collection_version_mtime:
+            try:
+                with open(self.collection_versions_path, "r", encoding="utf-8") as f:
+                    self._collection_version = f.read()
+            except OSError:
+                self._collection_version = None
+            self._collection_version_mtime = mtime
+
+        return self._collection_version
+
+    def get(self, tool_name: str, args: Dict[str, Any]) -> Optional[str]:
+        """캐시된 도구 결과(content) 조회, 없거나 만료되면 None"""
+        if not self.is_cacheable(tool_name):
+            return None
+
+        key = self.make_key(tool_name, args)
+        entry = self._entries.get(key)
+        policy = self.policies[tool_name]
+
+        valid = entry is not None and entry["expires_at"] > time.time()
+        if valid and policy.get("invalidate_on_collection_change"):
+            valid = entry["collection_version"] == self._current_collection_version()
+
+        if not valid:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["content"]
+
+    def put(self, tool_name: str, args: Dict[str, Any], content: str):
+        """도구 결과 저장 (최대 개수 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        if not self.is_cacheable(tool_name):
+            return
+
+        policy = self.policies[tool_name]
+        key = self.make_key(tool_name, args)
+        try:
+            result = json.loads(content)
+        except (json.JSONDecodeError, TypeError):
+            result = None
+        self._entries[key] = {
+            "content": content,
+            "result_set_id": result.get("result_set_id") if isinstance(result, dict) else None,
+            "expires_at": time.time() + policy["ttl"],
+            "collection_version": (
+                self._current_collection_version()
+                if policy.get("invalidate_on_collection_change") else None
+            )
+        }
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_result_set(self, result_set_id: str) -> int:
+        """저장소에서 사라진 result_set_id를 반환하는 항목 제거 (제거한 항목 수 반환)"""
+        stale = [key for key, entry in self._entries.items() if entry.get("result_set_id") == result_set_id]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
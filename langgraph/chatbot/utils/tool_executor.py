@@ -0,0 +1,262 @@
+import asyncio
+import json
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import ToolMessage
+
+from config import TOOL_EXECUTION_CONFIG
+from utils.logger import logger
+from utils.llm_clients import AVAILABLE_TOOLS
+from utils.tool_cache import ToolResultCache
+from utils.tracing import tracer, accepts_trace_context, TRACE_CONTEXT_ARG
+from utils.metrics import TOOL_CALLS_TOTAL, TOOL_LATENCY
+
+
+def stringify_tool_output(output: Any) -> str:
+    """MCP 도구 출력(str, content 리스트, dict)을 ToolMessage용 문자열로 변환"""
+    if isinstance(output, str):
+        return output
+    if isinstance(output, list):
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in output
+        )
+    return json.dumps(output, ensure_ascii=False, default=str)
+
+
+def parse_tool_message(message: ToolMessage) -> Optional[Dict[str, Any]]:
+    """ToolMessage content를 dict로 파싱 (JSON이 아니면 None)"""
+    try:
+        result = json.loads(message.content)
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return result if isinstance(result, dict) else None
+
+
+class ToolExecutor:
+    """
+    MCP 도구 실행기
+
+    - 도구 테이블을 한 번만 구성하여 재사용
+    - 한 턴의 독립적인 tool call들을 동시 실행 (동시 실행 수 제한)
+    - 도구별 타임아웃 적용, 초과 시 취소 후 구조화된 에러 ToolMessage 반환
+    - 도구별 TTL 정책에 따른 결과 캐시 (ToolMessage.artifact["cache"]에 hit/miss 기록)
+    """
+
+    def __init__(
+        self,
+        tools: List,
+        max_concurrency: int = TOOL_EXECUTION_CONFIG["max_concurrency"],
+        default_timeout: float = TOOL_EXECUTION_CONFIG["default_timeout"],
+        timeouts: Optional[Dict[str, float]] = None,
+        cache: Optional[ToolResultCache] = None
+    ):
+        self.tools = {tool.name: tool for tool in tools}
+        # trace_context 숨김 인자를 받는 도구 (서버 측 단계 span 기록)
+        self.traceable_tools = {tool.name for tool in tools if accepts_trace_context(tool)}
+        self.cache = cache if cache is not None else ToolResultCache()
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts if timeouts is not None else TOOL_EXECUTION_CONFIG["timeouts"]
+        # 선행 검색 실행기 (utils.prefetch에서 연결)
+        self.prefetcher = None
+        # 스트리밍 도구 선행 실행기 (utils.streaming_dispatch에서 연결)
+        self.dispatcher = None
+        # asyncio.Semaphore는 이벤트 루프에 묶이므로 루프별로 생성
+        self._semaphores: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def get_timeout(self, tool_name: str) -> float:
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    def _error_message(
+        self,
+        tool_name: str,
+        tool_call_id: str,
+        error: str,
+        error_type: str,
+        **extra
+    ) -> ToolMessage:
+        content = {
+            "success": False,
+            "error": error,
+            "error_type": error_type,
+            "tool_name": tool_name,
+            **extra
+        }
+        return ToolMessage(
+            content=json.dumps(content, ensure_ascii=False),
+            tool_call_id=tool_call_id,
+            name=tool_name,
+            status="error"
+        )
+
+    async def invoke(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        tool_call_id: str,
+        session_id: Optional[str] = None
+    ) -> ToolMessage:
+        """단일 도구 실행 (타임아웃 초과 시 취소), 실행마다 tool span과 서버별 지표 기록"""
+        tool = self.tools.get(tool_name)
+        server = ((tool.metadata or {}).get("mcp_server") if tool is not None else None) or "unknown"
+
+        with tracer.span(f"tool.{tool_name}", kind="tool", tool_name=tool_name, server=server) as span:
+            start_time = time.time()
+            message = await self._invoke(tool_name, args, tool_call_id, session_id)
+            cache_status = (message.artifact or {}).get("cache", "none")
+
+            TOOL_CALLS_TOTAL.inc(server=server, tool=tool_name, status=message.status, cache=cache_status)
+            TOOL_LATENCY.observe(time.time() - start_time, server=server, tool=tool_name)
+
+            span.set(cache=cache_status)
+            if message.status == "error":
+                span.status = "error"
+            return message
+
+    async def _invoke(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        tool_call_id: str,
+        session_id: Optional[str] = None
+    ) -> ToolMessage:
+        tool = self.tools.get(tool_name)
+        if tool is None:
+            logger.error(f"[Tool Executor] 알 수 없는 도구: {tool_name}")
+            return self._error_message(
+                tool_name, tool_call_id,
+                f"'{tool_name}' 도구를 찾을 수 없습니다.",
+                "unknown_tool",
+                available_tools=list(self.tools.keys())
+            )
+
+        # 선행 검색 결과가 있으면 우선 사용
+        if session_id and self.prefetcher is not None:
+            prefetched = await self.prefetcher.take(session_id, tool_name, args)
+            if prefetched is not None:
+                return ToolMessage(
+                    content=prefetched.content,
+                    tool_call_id=tool_call_id,
+                    name=tool_name,
+                    artifact={"cache": "prefetch"}
+                )
+
+        cacheable = self.cache.is_cacheable(tool_name)
+        if cacheable:
+            cached_content = self.cache.get(tool_name, args)
+            if cached_content is not None:
+                logger.info(f"[Tool Executor] 💾 {tool_name} 캐시 적중")
+                return ToolMessage(
+                    content=cached_content,
+                    tool_call_id=tool_call_id,
+                    name=tool_name,
+                    artifact={"cache": "hit"}
+                )
+
+        timeout = self.get_timeout(tool_name)
+        start_time = time.time()
+
+        # 서버 측 span의 부모 정보 전달 (캐시 키에는 포함하지 않음)
+        call_args = args
+        trace_context = tracer.current_context()
+        if trace_context and tool_name in self.traceable_tools:
+            call_args = {**args, TRACE_CONTEXT_ARG: trace_context}
+
+        try:
+            async with self._get_semaphore():
+                output = await asyncio.wait_for(tool.ainvoke(call_args), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[Tool Executor] ⏱️ {tool_name} 타임아웃 ({timeout:.1f}초) - 취소됨")
+            return self._error_message(
+                tool_name, tool_call_id,
+                f"'{tool_name}' 도구 응답 시간 초과 ({timeout:.1f}초)",
+                "timeout",
+                timeout=timeout
+            )
+        except Exception as e:
+            logger.error(f"[Tool Executor] {tool_name} 실행 오류: {e}", exc_info=True)
+            return self._error_message(
+                tool_name, tool_call_id,
+                f"도구 실행 중 오류가 발생했습니다: {str(e)}",
+                "exception"
+            )
+
+        logger.info(f"[Tool Executor] ✅ {tool_name} 완료 ({time.time() - start_time:.2f}초)")
+        message = ToolMessage(
+            content=stringify_tool_output(output),
+            tool_call_id=tool_call_id,
+            name=tool_name,
+            artifact={"cache": "miss" if cacheable else "bypass"}
+        )
+
+        # 성공한 결과만 캐시
+        result = parse_tool_message(message)
+        if cacheable and (result is None or result.get("success", True)):
+            self.cache.put(tool_name, args, message.content)
+
+        # 결과 세트가 만료/제거되었으면 해당 id를 반환하던 retrieve 캐시를 무효화 (다음 retrieve는 캐시 미스)
+        if result is not None and result.get("error_type") == "result_set_not_found":
+            removed = self.cache.invalidate_result_set(result.get("result_set_id"))
+            logger.info(f"[Tool Executor] 🗑️ 만료된 결과 세트 {result.get('result_set_id')} 캐시 무효화 ({removed}개)")
+
+        return message
+
+    async def execute(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        session_id: Optional[str] = None
+    ) -> List[ToolMessage]:
+        """
+        여러 tool call 동시 실행 (결과 순서는 tool_calls 순서 유지)
+
+        스트리밍 중 이미 실행이 시작된 tool call은 해당 task의 결과를 사용합니다.
+        """
+        dispatched = {}
+        if session_id and self.dispatcher is not None:
+            dispatched = self.dispatcher.pop_tasks(session_id)
+
+        tasks = []
+        for tool_call in tool_calls:
+            tool_call_id = tool_call.get("id", "unknown")
+            if tool_call_id in dispatched:
+                tasks.append(dispatched.pop(tool_call_id))
+            else:
+                tasks.append(self.invoke(
+                    tool_call.get("name", "unknown"),
+                    tool_call.get("args", {}),
+                    tool_call_id,
+                    session_id=session_id
+                ))
+
+        # 최종 메시지에 없는 선행 실행은 취소
+        for task in dispatched.values():
+            task.cancel()
+
+        return list(await asyncio.gather(*tasks))
+
+
+def count_cache_results(messages: List[ToolMessage]) -> Dict[str, int]:
+    """ToolMessage 목록의 캐시 적중/미스 횟수 집계"""
+    counts = {"hits": 0, "misses": 0}
+    for message in messages:
+        cache_status = (getattr(message, "artifact", None) or {}).get("cache")
+        if cache_status == "hit":
+            counts["hits"] += 1
+        elif cache_status == "miss":
+            counts["misses"] += 1
+    return counts
+
+
+# 전역 도구 실행기 (도구 테이블 1회 구성)
+tool_executor = ToolExecutor(AVAILABLE_TOOLS)
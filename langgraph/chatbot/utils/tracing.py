@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from config import TRACING_CONFIG
+from utils.logger import logger
+
+
+# MCP 도구에 trace 부모 정보를 전달하는 숨김 인자 (LLM에 바인딩되는 스키마에서는 제거)
+TRACE_CONTEXT_ARG = "trace_context"
+
+
+class Span:
+    """trace span 1개 (종료 시 JSONL 한 줄로 기록)"""
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def context(self) -> Dict[str, str]:
+        """하위 span(서버 포함)에 전달할 부모 정보"""
+        return {"trace_id": self.trace_id, "span_id": self.span_id}
+
+    def to_record(self, service: str) -> Dict[str, Any]:
+        duration = time.perf_counter() - self._perf_start
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": service,
+            "start": self.start,
+            "end": self.start + duration,
+            "duration": duration,
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class _NoopSpan:
+    """트레이싱 비활성화 시 사용하는 빈 span"""
+
+    trace_id = None
+    span_id = None
+    status = "ok"
+
+    def set(self, **attributes):
+        pass
+
+    def context(self) -> Optional[Dict[str, str]]:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    경량 트레이서
+
+    그래프 노드, LLM 호출, MCP 도구 호출마다 span을 만들고 부모/자식 관계를 contextvars로 추적합니다.
+    asyncio task는 생성 시점의 context를 복사하므로 동시 실행되는 도구 호출도 올바른 부모를 가집니다.
+    span은 종료 시 JSONL 파일에 기록되며, MCP 서버도 같은 파일에 서버 측 단계 span을 남깁니다.
+    """
+
+    def __init__(self, config: Dict[str, Any] = TRACING_CONFIG):
+        self.enabled = config["enabled"]
+        self.path = config["path"]
+        self.service = config["service"]
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            logger.info(f"🧭 트레이싱 활성화: {self.path}")
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attributes) -> Iterator[Span]:
+        """현재 span의 자식 span 생성 (현재 span이 없으면 새 trace 시작)"""
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+
+        parent = _current_span.get()
+        span = Span(
+            name,
+            kind,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+
+        try:
+            yield span
+        except asyncio.CancelledError:
+            span.status = "cancelled"
+            raise
+        except Exception as e:
+            span.status = "error"
+            span.set(error=str(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            self._export(span)
+
+    def current_context(self) -> Optional[Dict[str, str]]:
+        """현재 span의 부모 정보 (MCP 도구 호출의 trace_context 인자로 전달)"""
+        span = _current_span.get()
+        return span.context() if self.enabled and span else None
+
+    def _export(self, span: Span):
+        line = json.dumps(span.to_record(self.service), ensure_ascii=False, default=str)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️  trace 기록 실패: {e}")
+
+
+def hide_trace_context(tool):
+    """LLM에 바인딩할 도구 스키마에서 trace_context 인자 제거 (실행용 도구는 그대로 유지)"""
+    schema = getattr(tool, "args_schema", None)
+    if not isinstance(schema, dict) or TRACE_CONTEXT_ARG not in schema.get("properties", {}):
+        return tool
+
+    properties = {k: v for k, v in schema["properties"].items() if k != TRACE_CONTEXT_ARG}
+    required = [name for name in schema.get("required", []) if name != TRACE_CONTEXT_ARG]
+    return tool.model_copy(update={"args_schema": {**schema, "properties": properties, "required": required}})
+
+
+def accepts_trace_context(tool) -> bool:
+    """도구가 trace_context 인자를 받는지 여부"""
+    schema = getattr(tool, "args_schema", None)
+    return isinstance(schema, dict) and TRACE_CONTEXT_ARG in schema.get("properties", {})
+
+
+# 전역 트레이서
+tracer = Tracer()
@@ -0,0 +1,24 @@
+from .result_store import ResultSetStore
+from .tracing import ServerTracer
+from .query_cache import LRUCache, CollectionVersionWatcher, normalize_query
+from .lexical_index import LexicalIndex, LexicalIndexLoader
+from .inference import load_embedder, load_reranker
+from .embedding_client import EmbeddingServiceClient
+from .histogram import BucketHistogram
+from .exact_index import ExactIndex, ExactIndexLoader
+
+__all__ = [
+    "ResultSetStore",
+    "ServerTracer",
+    "LRUCache",
+    "CollectionVersionWatcher",
+    "normalize_query",
+    "LexicalIndex",
+    "LexicalIndexLoader",
+    "load_embedder",
+    "load_reranker",
+    "EmbeddingServiceClient",
+    "BucketHistogram",
+    "ExactIndex",
+    "ExactIndexLoader"
+]
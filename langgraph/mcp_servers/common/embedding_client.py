@@ -0,0 +1,150 @@
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# 임베딩 서비스 사용 방식 (auto: 소켓이 있고 같은 모델이면 사용, off: 항상 로컬 모델, required: 서비스 없으면 오류)
+EMBEDDING_SERVICE_MODE = os.getenv("EMBEDDING_SERVICE", "auto")
+EMBEDDING_SERVICE_SOCKET = Path(os.getenv(
+    "EMBEDDING_SERVICE_SOCKET",
+    str(Path(tempfile.gettempdir()) / "langgraph_embedding.sock")
+))
+EMBEDDING_SERVICE_TIMEOUT = float(os.getenv("EMBEDDING_SERVICE_TIMEOUT", "120"))
+
+# 프레임: (헤더 JSON 길이, payload 길이) 4바이트씩 + 헤더 JSON + payload (임베딩은 float32 원시 바이트)
+FRAME_PREFIX = struct.Struct("!II")
+
+
+def encode_frame(header: Dict[str, Any], payload: bytes = b"") -> bytes:
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    return FRAME_PREFIX.pack(len(header_bytes), len(payload)) + header_bytes + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("임베딩 서비스 연결 종료")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    header_size, payload_size = FRAME_PREFIX.unpack(_recv_exactly(sock, FRAME_PREFIX.size))
+    header = json.loads(_recv_exactly(sock, header_size).decode("utf-8"))
+    return header, _recv_exactly(sock, payload_size) if payload_size else b""
+
+
+class EmbeddingServiceClient:
+    """
+    로컬 임베딩 서비스 클라이언트 (SentenceTransformer.encode 호환 인터페이스)
+
+    스레드마다 연결 하나를 유지하므로 여러 스레드에서 동시에 호출하면
+    서비스가 요청들을 하나의 micro-batch로 묶어 처리합니다.
+    """
+
+    def __init__(self, socket_path: Path = EMBEDDING_SERVICE_SOCKET, timeout: float = EMBEDDING_SERVICE_TIMEOUT):
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def request(self, header: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        """요청 1건 (연결이 끊겼으면 한 번 재연결)"""
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                sock.sendall(encode_frame(header))
+                response, payload = recv_frame(sock)
+                break
+            except (ConnectionError, BrokenPipeError):
+                self._close()
+                if attempt:
+                    raise
+            except Exception:
+                # 타임아웃 등으로 응답 경계를 잃은 연결은 재사용하지 않음
+                self._close()
+                raise
+
+        if response.get("error"):
+            raise RuntimeError(f"임베딩 서비스 오류: {response['error']}")
+        return response, payload
+
+    def info(self) -> Dict[str, Any]:
+        return self.request({"op": "info"})[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({"op": "stats"})[0]
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        normalize_embeddings: bool = True,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True
+    ) -> np.ndarray:
+        # batch_size는 서비스의 micro-batch 크기가 결정하므로 사용하지 않음
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        response, payload = self.request({"op": "encode", "texts": texts})
+        vectors = np.frombuffer(payload, dtype=np.float32).reshape(response["shape"]).copy()
+
+        if normalize_embeddings and len(vectors):
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors[0] if single else vectors
+
+
+def connect_service(model_name: str, backend: Optional[str] = None) -> Optional[EmbeddingServiceClient]:
+    """
+    실행 중인 임베딩 서비스 연결 (EMBEDDING_SERVICE 설정 적용)
+
+    서비스가 없거나 다른 모델/백엔드를 서빙하면 None (required 모드에서는 오류)
+    """
+    if EMBEDDING_SERVICE_MODE == "off":
+        return None
+
+    problem = None
+    if not EMBEDDING_SERVICE_SOCKET.exists():
+        problem = f"{EMBEDDING_SERVICE_SOCKET} 없음"
+    else:
+        client = EmbeddingServiceClient()
+        try:
+            info = client.info()
+        except (OSError, RuntimeError) as e:
+            problem = f"연결 실패: {e}"
+        else:
+            if info.get("model") != model_name:
+                problem = f"서비스 모델({info.get('model')})이 요청 모델({model_name})과 다름"
+            elif backend and info.get("backend") != backend:
+                problem = f"서비스 백엔드({info.get('backend')})가 요청 백엔드({backend})와 다름"
+            else:
+                print(f"🔌 임베딩 서비스 사용: {EMBEDDING_SERVICE_SOCKET} ({model_name}, {info.get('backend')})", file=sys.stderr)
+                return client
+
+    if EMBEDDING_SERVICE_MODE == "required":
+        raise RuntimeError(f"임베딩 서비스를 사용할 수 없습니다: {problem}")
+    return None
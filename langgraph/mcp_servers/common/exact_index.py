@@ -0,0 +1,260 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # langgraph/
+
+# rag_ingest가 컬렉션별 임베딩 행렬과 sidecar를 기록하는 위치 (.chroma/exact/{collection}.npy, .json)
+EXACT_INDEX_DIR = PROJECT_ROOT / ".chroma" / "exact"
+
+# 행렬 곱을 나누어 계산하는 행 수 (float16 행렬을 float32로 바꾸는 임시 메모리 상한)
+SCAN_BLOCK_ROWS = int(os.getenv("EXACT_SEARCH_BLOCK_ROWS", "16384"))
+
+# where 절별 허용 행 마스크 캐시 크기
+MASK_CACHE_SIZE = 32
+
+
+def index_paths(collection_name: str, directory: Path = EXACT_INDEX_DIR) -> Tuple[Path, Path]:
+    """(임베딩 행렬 .npy, id/메타데이터 sidecar .json) 경로"""
+    directory = Path(directory)
+    return directory / f"{collection_name}.npy", directory / f"{collection_name}.json"
+
+
+def _compare(value: Any, condition: Any) -> bool:
+    if not isinstance(condition, dict):
+        return value == condition
+    for op, operand in condition.items():
+        if op == "$eq" and not value == operand:
+            return False
+        if op == "$ne" and not value != operand:
+            return False
+        if op == "$in" and value not in operand:
+            return False
+        if op == "$nin" and value in operand:
+            return False
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None:
+                return False
+            if op == "$gt" and not value > operand:
+                return False
+            if op == "$gte" and not value >= operand:
+                return False
+            if op == "$lt" and not value < operand:
+                return False
+            if op == "$lte" and not value <= operand:
+                return False
+    return True
+
+
+def matches_where(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Chroma where 절 평가 ($and, $or, $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte)"""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif not _compare(metadata.get(key), condition):
+            return False
+    return True
+
+
+class ExactIndex:
+    """
+    컬렉션 단위 정확(brute-force) cosine 검색 인덱스
+
+    rag_ingest가 Chroma 적재 후 정규화된 임베딩 행렬(.npy, float16/float32)과
+    id/문서/메타데이터 sidecar(.json)를 내보내고, retrieve 서버가 행렬을 memory-map으로 로드합니다.
+    query/get은 Chroma Collection과 같은 결과 형식을 반환하므로 검색 경로에서 그대로 대체할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        info: Optional[Dict[str, Any]] = None
+    ):
+        self.matrix = matrix
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.info = info or {}
+        self._positions = {chunk_id: i for i, chunk_id in enumerate(ids)}
+        self._masks: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    # ==================== 내보내기/로드 ====================
+    @staticmethod
+    def save(
+        collection_name: str,
+        ids: Sequence[str],
+        embeddings: np.ndarray,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        directory: Path = EXACT_INDEX_DIR,
+        dtype: str = "float16",
+        info: Optional[Dict[str, Any]] = None
+    ):
+        matrix_path, sidecar_path = index_paths(collection_name, directory)
+        matrix_path.parent.mkdir(parents=True, exist_ok=True)
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if len(matrix):
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+        # 검색 중인 서버가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체 (sidecar를 마지막에 교체)
+        tmp_matrix = matrix_path.with_suffix(".npy.tmp")
+        with open(tmp_matrix, "wb") as f:
+            np.save(f, matrix.astype(dtype))
+        tmp_matrix.replace(matrix_path)
+
+        sidecar = {
+            **(info or {}),
+            "dtype": dtype,
+            "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+            "count": len(ids),
+            "ids": list(ids),
+            "documents": list(documents),
+            "metadatas": list(metadatas)
+        }
+        tmp_sidecar = sidecar_path.with_suffix(".json.tmp")
+        tmp_sidecar.write_text(json.dumps(sidecar, ensure_ascii=False), encoding="utf-8")
+        tmp_sidecar.replace(sidecar_path)
+
+    @classmethod
+    def load(cls, collection_name: str, directory: Path = EXACT_INDEX_DIR) -> Optional["ExactIndex"]:
+        """인덱스 로드 (행렬은 memory-map, 파일이 없거나 행 수가 맞지 않으면 None)"""
+        matrix_path, sidecar_path = index_paths(collection_name, directory)
+        try:
+            sidecar = json.loads(sidecar_path.read_text(encoding="utf-8"))
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if matrix.shape[0] != len(sidecar["ids"]):
+            return None
+
+        info = {k: v for k, v in sidecar.items() if k not in ("ids", "documents", "metadatas")}
+        return cls(matrix, sidecar["ids"], sidecar["documents"], sidecar["metadatas"], info)
+
+    # ==================== 검색 ====================
+    def _allowed(self, where: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """where 절을 만족하는 행 마스크 (where가 없으면 None, 같은 where는 캐시)"""
+        if not where:
+            return None
+        key = json.dumps(where, sort_keys=True, ensure_ascii=False)
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+
+        mask = np.fromiter((matches_where(m or {}, where) for m in self.metadatas), dtype=bool, count=len(self.metadatas))
+        with self._lock:
+            self._masks[key] = mask
+            while len(self._masks) > MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        return mask
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """(행 수 × 쿼리 수) cosine similarity, 행렬을 블록 단위로 float32 변환하여 계산"""
+        scores = np.empty((len(self.ids), len(queries)), dtype=np.float32)
+        for start in range(0, len(self.ids), SCAN_BLOCK_ROWS):
+            block = np.asarray(self.matrix[start:start + SCAN_BLOCK_ROWS], dtype=np.float32)
+            scores[start:start + len(block)] = block @ queries.T
+        return scores
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("documents", "metadatas", "distances")
+    ) -> Dict[str, List[List[Any]]]:
+        """Chroma Collection.query와 같은 형식의 top-k 결과 (distance = 1 - cosine similarity)"""
+        queries = np.array(query_embeddings, dtype=np.float32)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if not len(self.ids):
+            for key in result:
+                result[key] = [[] for _ in queries]
+            return result
+
+        scores = self._scores(queries)
+        allowed = self._allowed(where)
+        if allowed is not None:
+            scores[~allowed] = -np.inf
+        n_allowed = int(allowed.sum()) if allowed is not None else len(self.ids)
+        k = min(n_results, n_allowed)
+
+        for column in range(len(queries)):
+            column_scores = scores[:, column]
+            if k <= 0:
+                top = np.empty(0, dtype=np.int64)
+            elif k < len(column_scores):
+                top = np.argpartition(-column_scores, k - 1)[:k]
+                top = top[np.argsort(-column_scores[top])]
+            else:
+                top = np.argsort(-column_scores)[:k]
+            result["ids"].append([self.ids[i] for i in top])
+            result["documents"].append([self.documents[i] for i in top])
+            result["metadatas"].append([self.metadatas[i] for i in top])
+            result["distances"].append([float(1.0 - column_scores[i]) for i in top])
+
+        return {key: value for key, value in result.items() if key == "ids" or key in include}
+
+    def get(
+        self,
+        ids: Sequence[str],
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = ("documents", "metadatas")
+    ) -> Dict[str, List[Any]]:
+        """Chroma Collection.get과 같은 형식의 id 조회 (where 적용)"""
+        positions = [self._positions[chunk_id] for chunk_id in ids if chunk_id in self._positions]
+        if where:
+            positions = [i for i in positions if matches_where(self.metadatas[i] or {}, where)]
+
+        result = {
+            "ids": [self.ids[i] for i in positions],
+            "documents": [self.documents[i] for i in positions],
+            "metadatas": [self.metadatas[i] for i in positions],
+            "embeddings": [np.asarray(self.matrix[i], dtype=np.float32) for i in positions]
+        }
+        return {key: value for key, value in result.items() if key == "ids" or key in include}
+
+
+class ExactIndexLoader:
+    """컬렉션별 인덱스 로더 (sidecar mtime이 바뀌면 다시 로드)"""
+
+    def __init__(self, directory: Path = EXACT_INDEX_DIR):
+        self.directory = Path(directory)
+        self._indexes: Dict[str, Tuple[Optional[int], Optional[ExactIndex]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> Optional[ExactIndex]:
+        _, sidecar_path = index_paths(collection_name, self.directory)
+        try:
+            mtime = os.stat(sidecar_path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            cached_mtime, index = self._indexes.get(collection_name, (None, None))
+            if cached_mtime != mtime:
+                index = ExactIndex.load(collection_name, self.directory)
+                self._indexes[collection_name] = (mtime, index)
+            return index
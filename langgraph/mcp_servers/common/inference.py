@@ -0,0 +1,278 @@
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # langgraph/
+
+# 추론 백엔드 선택 (torch: PyTorch fp32, onnx-int8: 동적 int8 양자화 ONNX Runtime)
+# 같은 컬렉션의 적재(rag_ingest)와 검색(retrieve 서버)은 같은 임베딩 백엔드를 쓰는 것을 권장
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "torch")
+BACKENDS = ("torch", "onnx-int8")
+
+# 내보낸 ONNX 모델 위치 (.models/onnx/{모델 이름}/model_int8.onnx + tokenizer)
+ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", str(PROJECT_ROOT / ".models" / "onnx")))
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0: ONNX Runtime 기본값 (물리 코어 수)
+
+EMBEDDING_MAX_LENGTH = 8192  # bge-m3 최대 입력 길이
+RERANKER_MAX_LENGTH = 512    # FlagReranker 기본값과 동일
+
+QUANTIZED_FILENAME = "model_int8.onnx"
+
+
+def onnx_model_dir(model_name: str, directory: Path = ONNX_MODEL_DIR) -> Path:
+    """모델 이름별 ONNX 디렉터리 (BAAI/bge-m3 → .models/onnx/BAAI__bge-m3)"""
+    return Path(directory) / model_name.replace("/", "__")
+
+
+def _warn(message: str):
+    # stdio MCP 서버는 stdout이 프로토콜 채널이므로 stderr에 기록
+    print(message, file=sys.stderr)
+
+
+# ==================== ONNX 내보내기 ====================
+def export_quantized(model_name: str, kind: str, directory: Path = ONNX_MODEL_DIR) -> Path:
+    """
+    Hugging Face 모델을 ONNX로 내보내고 가중치를 동적 int8 양자화
+
+    - kind="embedding": 마지막 hidden state의 CLS 벡터 출력 (bge-m3 dense 임베딩, 정규화는 추론 시)
+    - kind="reranker": 분류 logit 출력 (FlagReranker.compute_score와 같은 점수)
+
+    Returns:
+        양자화된 모델 경로
+    """
+    import torch
+    from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as e:
+        raise RuntimeError("ONNX 양자화에는 onnx, onnxruntime 패키지가 필요합니다 (pip install onnx onnxruntime)") from e
+
+    if kind not in ("embedding", "reranker"):
+        raise ValueError(f"지원하지 않는 모델 종류: {kind}")
+
+    output_dir = onnx_model_dir(model_name, directory)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if kind == "embedding":
+        base = AutoModel.from_pretrained(model_name)
+
+        class Wrapper(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state[:, 0]
+
+        output_name = "embedding"
+    else:
+        base = AutoModelForSequenceClassification.from_pretrained(model_name)
+
+        class Wrapper(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask).logits[:, 0]
+
+        output_name = "score"
+
+    model = Wrapper(base).eval()
+    sample = tokenizer(["내보내기 예시 문장", "export sample"], padding=True, return_tensors="pt")
+
+    # fp32 모델은 2GB를 넘을 수 있어 별도 디렉터리에 외부 데이터 형식으로 저장 후 양자화
+    fp32_dir = output_dir / "fp32"
+    fp32_dir.mkdir(exist_ok=True)
+    fp32_path = fp32_dir / "model.onnx"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(fp32_path),
+            input_names=["input_ids", "attention_mask"],
+            output_names=[output_name],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                output_name: {0: "batch"}
+            },
+            opset_version=17
+        )
+
+    quantized_path = output_dir / QUANTIZED_FILENAME
+    quantize_dynamic(str(fp32_path), str(quantized_path), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(str(output_dir))
+    return quantized_path
+
+
+# ==================== ONNX Runtime 추론 ====================
+def _session(model_path: Path):
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if ONNX_INTRA_OP_THREADS:
+        options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+    return ort.InferenceSession(str(model_path), sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _length_sorted_batches(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    """길이순으로 정렬한 인덱스 배치 (배치 내 패딩 최소화)"""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+class OnnxEmbedder:
+    """
+    int8 ONNX 임베딩 모델 (SentenceTransformer.encode 호환 인터페이스)
+
+    export_quantized(kind="embedding")로 만든 디렉터리를 로드합니다.
+    """
+
+    def __init__(self, model_dir: Path, max_length: int = EMBEDDING_MAX_LENGTH):
+        from transformers import AutoTokenizer
+
+        self.model_dir = Path(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        self.session = _session(self.model_dir / QUANTIZED_FILENAME)
+        self.max_length = max_length
+
+    def encode(
+        self,
+        sentences,
+        batch_size: int = 32,
+        normalize_embeddings: bool = True,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        lengths = [len(text) for text in texts]
+        output: Optional[np.ndarray] = None
+        for batch in _length_sorted_batches(lengths, batch_size):
+            encoded = self.tokenizer(
+                [texts[i] for i in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            vectors = self.session.run(None, {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": encoded["attention_mask"].astype(np.int64)
+            })[0]
+            if output is None:
+                output = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            output[batch] = vectors
+
+        if normalize_embeddings:
+            output /= np.maximum(np.linalg.norm(output, axis=1, keepdims=True), 1e-12)
+        return output[0] if single else output
+
+
+class OnnxReranker:
+    """
+    int8 ONNX cross-encoder reranker (FlagReranker.compute_score 호환 인터페이스)
+
+    export_quantized(kind="reranker")로 만든 디렉터리를 로드합니다.
+    """
+
+    def __init__(self, model_dir: Path, max_length: int = RERANKER_MAX_LENGTH, batch_size: int = 32):
+        from transformers import AutoTokenizer
+
+        self.model_dir = Path(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_dir))
+        self.session = _session(self.model_dir / QUANTIZED_FILENAME)
+        self.max_length = max_length
+        self.batch_size = batch_size
+
+    def compute_score(self, sentence_pairs, normalize: bool = False, batch_size: Optional[int] = None) -> List[float]:
+        if not sentence_pairs:
+            return []
+        pairs = [sentence_pairs] if isinstance(sentence_pairs[0], str) else list(sentence_pairs)
+        scores = np.empty(len(pairs), dtype=np.float32)
+
+        lengths = [len(query) + len(passage) for query, passage in pairs]
+        for batch in _length_sorted_batches(lengths, batch_size or self.batch_size):
+            encoded = self.tokenizer(
+                [pairs[i][0] for i in batch],
+                [pairs[i][1] for i in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            scores[batch] = self.session.run(None, {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": encoded["attention_mask"].astype(np.int64)
+            })[0]
+
+        if normalize:
+            scores = 1.0 / (1.0 + np.exp(-scores))
+        return scores.tolist()
+
+
+# ==================== 백엔드 선택 ====================
+def _resolve_backend(backend: str, model_name: str) -> Tuple[str, Optional[Path]]:
+    """요청한 백엔드를 사용할 수 없으면 torch로 대체 (경고 기록)"""
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 추론 백엔드: {backend} (가능: {', '.join(BACKENDS)})")
+    if backend == "torch":
+        return "torch", None
+
+    model_dir = onnx_model_dir(model_name)
+    if not ONNXRUNTIME_AVAILABLE:
+        _warn(f"⚠️ onnxruntime 미설치 - {model_name}은 torch 백엔드로 실행")
+        return "torch", None
+    if not (model_dir / QUANTIZED_FILENAME).exists():
+        _warn(
+            f"⚠️ {model_dir / QUANTIZED_FILENAME} 없음 - {model_name}은 torch 백엔드로 실행 "
+            f"(python -m rag_ingest.export_onnx로 먼저 내보내세요)"
+        )
+        return "torch", None
+    return backend, model_dir
+
+
+def load_embedder(model_name: str, device: str = "cpu", backend: Optional[str] = None, use_service: bool = True):
+    """
+    설정된 백엔드의 임베딩 모델 (encode(sentences, batch_size, normalize_embeddings, ...) 제공)
+
+    같은 모델을 서빙하는 로컬 임베딩 서비스가 실행 중이면 모델을 로드하지 않고 서비스 클라이언트를 반환합니다.
+    """
+    if use_service:
+        from .embedding_client import connect_service
+        client = connect_service(model_name, backend)
+        if client is not None:
+            return client
+
+    backend, model_dir = _resolve_backend(backend or EMBEDDING_BACKEND, model_name)
+    if backend == "onnx-int8":
+        return OnnxEmbedder(model_dir)
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device=device)
+
+
+def load_reranker(model_name: str, device: str = "cpu", backend: Optional[str] = None):
+    """설정된 백엔드의 reranker (compute_score(pairs, normalize) 제공)"""
+    backend, model_dir = _resolve_backend(backend or RERANKER_BACKEND, model_name)
+    if backend == "onnx-int8":
+        return OnnxReranker(model_dir)
+
+    from FlagEmbedding import FlagReranker
+    # CPU에서 fp16은 이득이 없고 오히려 느려지므로 GPU에서만 사용
+    return FlagReranker(model_name, use_fp16=device != "cpu", devices=device)
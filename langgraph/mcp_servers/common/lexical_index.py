@@ -0,0 +1,150 @@
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # langgraph/
+
+# rag_ingest가 컬렉션별 인덱스를 기록하는 위치 (.chroma/lexical/{collection}.json)
+LEXICAL_INDEX_DIR = PROJECT_ROOT / ".chroma" / "lexical"
+
+# 인덱스와 검색 쿼리가 같은 토큰화 규칙을 쓰는지 확인하기 위한 이름 (규칙을 바꾸면 올리고 재적재)
+TOKENIZER_NAME = "ko-char-bigram+identifier-v1"
+
+# 식별자: 영문/숫자가 -, _, ., / 로 이어진 토큰 (IRE-10041, v8.0.5.0, file_server)
+IDENTIFIER_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)+")
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+HANGUL_PATTERN = re.compile(r"[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어 인식 BM25 토큰화
+
+    - 식별자는 원형 그대로 1개 토큰 + 영문/숫자 조각 토큰 (부분 일치도 점수에 반영)
+    - 영문/숫자 단어는 소문자 토큰
+    - 한글은 어절 내 글자 bigram (조사/어미가 붙어도 어간 bigram이 일치, 1글자 어절은 unigram)
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = IDENTIFIER_PATTERN.findall(text)
+    tokens += WORD_PATTERN.findall(text)
+    for word in HANGUL_PATTERN.findall(text):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens += [word[i:i + 2] for i in range(len(word) - 1)]
+    return tokens
+
+
+def index_path(collection_name: str, directory: Path = LEXICAL_INDEX_DIR) -> Path:
+    return Path(directory) / f"{collection_name}.json"
+
+
+class LexicalIndex:
+    """
+    컬렉션 단위 BM25(Okapi) 역색인
+
+    rag_ingest가 Chroma 적재 후 컬렉션 전체로 build → save 하고,
+    retrieve 서버가 load하여 dense 검색과 함께 사용합니다.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids: List[str] = []
+        self.doc_lengths: List[int] = []
+        self.avg_length = 0.0
+        self.postings: Dict[str, List[List[int]]] = {}
+
+    @classmethod
+    def build(cls, ids: List[str], texts: List[str], k1: float = 1.5, b: float = 0.75) -> "LexicalIndex":
+        index = cls(k1=k1, b=b)
+        index.doc_ids = list(ids)
+        for doc_index, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            index.doc_lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                index.postings.setdefault(term, []).append([doc_index, tf])
+        index.avg_length = sum(index.doc_lengths) / len(index.doc_lengths) if index.doc_lengths else 0.0
+        return index
+
+    def search(self, query: str, top_k: int) -> List[Tuple[str, float]]:
+        """BM25 점수 상위 top_k (chunk_id, score)"""
+        n_docs = len(self.doc_ids)
+        if not n_docs:
+            return []
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_index, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_index] / (self.avg_length or 1.0))
+                scores[doc_index] = scores.get(doc_index, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        return [(self.doc_ids[doc_index], score) for doc_index, score in best]
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "tokenizer": TOKENIZER_NAME,
+            "k1": self.k1,
+            "b": self.b,
+            "doc_ids": self.doc_ids,
+            "doc_lengths": self.doc_lengths,
+            "avg_length": self.avg_length,
+            "postings": self.postings
+        }
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["LexicalIndex"]:
+        """인덱스 로드 (파일이 없거나 토큰화 규칙이 다르면 None)"""
+        try:
+            payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if payload.get("tokenizer") != TOKENIZER_NAME:
+            return None
+
+        index = cls(k1=payload["k1"], b=payload["b"])
+        index.doc_ids = payload["doc_ids"]
+        index.doc_lengths = payload["doc_lengths"]
+        index.avg_length = payload["avg_length"]
+        index.postings = payload["postings"]
+        return index
+
+
+class LexicalIndexLoader:
+    """컬렉션별 인덱스 로더 (파일 mtime이 바뀌면 다시 로드)"""
+
+    def __init__(self, directory: Path = LEXICAL_INDEX_DIR):
+        self.directory = Path(directory)
+        self._indexes: Dict[str, Tuple[Optional[int], Optional[LexicalIndex]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> Optional[LexicalIndex]:
+        path = index_path(collection_name, self.directory)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            cached_mtime, index = self._indexes.get(collection_name, (None, None))
+            if cached_mtime != mtime:
+                index = LexicalIndex.load(path)
+                self._indexes[collection_name] = (mtime, index)
+            return index
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # langgraph/
+
+# rag_ingest가 컬렉션을 갱신할 때마다 기록하는 변경 파일 (챗봇 도구 캐시와 같은 파일)
+COLLECTION_VERSIONS_PATH = PROJECT_ROOT / ".chroma" / "collection_versions.json"
+
+DEFAULT_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
+DEFAULT_RESULT_CACHE_SIZE = int(os.getenv("RETRIEVE_RESULT_CACHE_SIZE", "256"))
+DEFAULT_RESULT_CACHE_TTL = float(os.getenv("RETRIEVE_RESULT_CACHE_TTL", "300"))
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 쿼리 정규화 (유니코드 NFKC, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+class LRUCache:
+    """
+    스레드 안전 LRU 캐시 (선택적 TTL, 적중/미스 카운터)
+
+    항목마다 version을 함께 저장하고, 조회 시 version이 다르면 미스로 처리합니다.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, version: Any = None) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            valid = (
+                entry is not None
+                and entry["version"] == version
+                and (entry["expires_at"] is None or entry["expires_at"] > time.time())
+            )
+            if not valid:
+                if entry is not None:
+                    del self._entries[key]
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+    def put(self, key: Hashable, value: Any, version: Any = None):
+        with self._lock:
+            self._entries[key] = {
+                "value": value,
+                "version": version,
+                "expires_at": time.time() + self.ttl_seconds if self.ttl_seconds else None
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+def version_key(entry: Dict[str, Any]) -> str:
+    """collection_versions.json 항목의 버전 문자열 (exact 인덱스 sidecar에도 같은 형식으로 기록)"""
+    return f"v{entry.get('version')}:{entry.get('count')}"
+
+
+class CollectionVersionWatcher:
+    """
+    컬렉션 내용 변경 감지
+
+    - collection_versions.json(rag_ingest가 갱신)에 컬렉션 항목이 있으면 그 version/count 사용
+      (파일 mtime이 바뀔 때만 다시 읽음)
+    - 항목이 없으면 컬렉션 문서 수(count_fn)를 version으로 사용
+    """
+
+    def __init__(self, path: Path = COLLECTION_VERSIONS_PATH):
+        self.path = Path(path)
+        self._mtime = None
+        self._versions: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return {}
+
+        if mtime != self._mtime:
+            try:
+                self._versions = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self._versions = {}
+            self._mtime = mtime
+        return self._versions
+
+    def version(self, collection_name: str, count_fn: Optional[Callable[[], int]] = None) -> Any:
+        with self._lock:
+            entry = self._load().get(collection_name)
+        if entry:
+            return version_key(entry)
+        return f"count:{count_fn()}" if count_fn is not None else None
+
+    def versions(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._load())
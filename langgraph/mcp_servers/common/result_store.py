@@ -0,0 +1,105 @@
+from contextlib import closing
+import json
+import os
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+COMMON_DIR = Path(__file__).resolve().parent   # mcp_servers/common/
+PROJECT_ROOT = COMMON_DIR.parent.parent        # langgraph/
+
+# 서버 프로세스 간 공유 저장소 경로 (retrieve / rerank 서버가 같은 파일을 사용)
+DEFAULT_STORE_PATH = PROJECT_ROOT / ".cache" / "result_sets.sqlite3"
+DEFAULT_TTL_SECONDS = float(os.getenv("RESULT_SET_TTL_SECONDS", "1800"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("RESULT_SET_MAX_ENTRIES", "256"))
+
+
+class ResultSetStore:
+    """
+    검색 결과 세트 공유 저장소 (SQLite 기반)
+
+    retrieve_documents가 검색 결과를 저장하고 result_set_id만 반환하면,
+    rerank_documents는 해당 id로 문서를 서버 측에서 조회합니다.
+    LLM이 문서 전체를 tool 인자로 다시 생성할 필요가 없어집니다.
+
+    - TTL이 지난 항목은 조회/저장 시점에 제거
+    - 최대 항목 수를 넘으면 오래된 항목부터 제거
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_STORE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS result_sets (
+                    id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    payload TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_result_sets_created ON result_sets(created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # 여러 서버 프로세스가 동시에 접근하므로 짧은 busy timeout 설정
+        # (sqlite3 연결의 with 블록은 commit만 하고 닫지 않으므로 호출부에서 closing으로 감쌈)
+        return sqlite3.connect(str(self.path), timeout=5.0)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """만료 항목 및 최대 개수 초과 항목 제거"""
+        conn.execute(
+            "DELETE FROM result_sets WHERE created_at < ?",
+            (now - self.ttl_seconds,)
+        )
+        conn.execute(
+            """
+            DELETE FROM result_sets WHERE id IN (
+                SELECT id FROM result_sets
+                ORDER BY created_at DESC
+                LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        )
+
+    def put(self, payload: Dict[str, Any]) -> str:
+        """결과 세트를 저장하고 result_set_id 반환"""
+        result_set_id = f"rs_{uuid.uuid4().hex[:16]}"
+        now = time.time()
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO result_sets (id, created_at, payload) VALUES (?, ?, ?)",
+                (result_set_id, now, json.dumps(payload, ensure_ascii=False))
+            )
+            self._evict(conn, now)
+
+        return result_set_id
+
+    def get(self, result_set_id: str) -> Optional[Dict[str, Any]]:
+        """result_set_id로 결과 세트 조회 (없거나 만료되면 None)"""
+        now = time.time()
+
+        with closing(self._connect()) as conn, conn:
+            self._evict(conn, now)
+            row = conn.execute(
+                "SELECT payload FROM result_sets WHERE id = ?",
+                (result_set_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return json.loads(row[0])
@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent  # langgraph/
+
+# 챗봇 트레이서와 같은 파일에 기록 (TRACING_CONFIG["path"] 기본값과 동일)
+TRACE_FILE = PROJECT_ROOT / ".cache" / "traces.jsonl"
+
+
+class ServerSpan:
+    """서버 측 단계 span"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time()
+        self._perf_start = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def context(self) -> Dict[str, str]:
+        return {"trace_id": self.trace_id, "span_id": self.span_id}
+
+
+class _NoopSpan:
+    """trace_context가 없는 호출(트레이싱 비활성화)에서 사용하는 빈 span"""
+
+    status = "ok"
+
+    def set(self, **attributes):
+        pass
+
+    def context(self) -> Optional[Dict[str, str]]:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class ServerTracer:
+    """
+    MCP 서버용 트레이서
+
+    챗봇이 도구 인자(trace_context)로 넘긴 부모 span 정보가 있을 때만 span을 기록합니다.
+    하위 단계는 상위 span의 context()를 parent로 넘겨 중첩합니다.
+    """
+
+    def __init__(self, service: str, path: Path = TRACE_FILE):
+        self.service = service
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Dict[str, str]], **attributes) -> Iterator[ServerSpan]:
+        if not parent or not parent.get("trace_id"):
+            yield _NOOP_SPAN
+            return
+
+        span = ServerSpan(name, parent["trace_id"], parent.get("span_id"), attributes)
+        try:
+            yield span
+        except Exception as e:
+            span.status = "error"
+            span.set(error=str(e))
+            raise
+        finally:
+            self._export(span)
+
+    def _export(self, span: ServerSpan):
+        duration = time.perf_counter() - span._perf_start
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "kind": "server",
+            "service": self.service,
+            "start": span.start,
+            "end": span.start + duration,
+            "duration": duration,
+            "status": span.status,
+            "attributes": span.attributes
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError:
+            # 트레이스 기록 실패가 도구 응답에 영향을 주지 않도록 무시
+            pass
@@ -1,44 +1,263 @@
-from typing import List, Dict, Any
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+import time
 
 from fastmcp import FastMCP
-from FlagEmbedding import FlagReranker
+
+SERVER_DIR = Path(__file__).resolve().parent  # mcp_servers/rerank_server/
+
+# mcp_servers/common 공유 모듈 사용
+sys.path.insert(0, str(SERVER_DIR.parent))
+from common.result_store import ResultSetStore  # noqa: E402
+from common.tracing import ServerTracer  # noqa: E402
+from common.inference import RERANKER_MAX_LENGTH, load_reranker  # noqa: E402
+from common.histogram import BucketHistogram  # noqa: E402
 
 mcp = FastMCP("RerankServer")
 
+# retrieve 서버와 공유하는 검색 결과 저장소
+_result_store = ResultSetStore()
+
+# 서버 측 단계 span 기록 (trace_context가 전달된 호출만)
+_tracer = ServerTracer("rerank_server")
+
 # 글로벌 reranker 모델 (싱글톤)
 _reranker = None
 
+# 요청 micro-batch 설정
+# - 첫 요청 후 RERANK_MAX_WAIT_MS 동안 다른 세션의 요청을 모아(최대 RERANK_MAX_COLLECT_PAIRS 쌍) 함께 처리
+# - 모은 쌍을 토큰 길이순으로 정렬하여 (배치 크기 × 최장 길이)가 RERANK_TOKEN_BUDGET 이하인 배치로 분할
+RERANK_MAX_WAIT_MS = float(os.getenv("RERANK_MAX_WAIT_MS", "10"))
+RERANK_MAX_COLLECT_PAIRS = int(os.getenv("RERANK_MAX_COLLECT_PAIRS", "256"))
+RERANK_TOKEN_BUDGET = int(os.getenv("RERANK_TOKEN_BUDGET", "16384"))
+RERANK_MAX_BATCH_PAIRS = int(os.getenv("RERANK_MAX_BATCH_PAIRS", "64"))
+
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+BATCH_TOKEN_BUCKETS = (512, 1024, 2048, 4096, 8192, 16384, 32768)
+
 
 def _get_reranker():
-    """Reranker 싱글톤 로드"""
+    """Reranker 싱글톤 로드 (RERANKER_BACKEND 환경 변수로 PyTorch / int8 ONNX Runtime 선택)"""
     global _reranker
     if _reranker is None:
-        _reranker = FlagReranker(
-            "BAAI/bge-reranker-v2-m3",
-            use_fp16=True
-        )
+        _reranker = load_reranker("BAAI/bge-reranker-v2-m3")
     return _reranker
 
 
+@dataclass
+class RerankJob:
+    pairs: List[List[str]]
+    future: Future
+    enqueued_at: float
+
+
+class RerankBatcher:
+    """
+    rerank 요청 큐와 전용 worker 스레드
+
+    MCP 이벤트 루프는 쌍을 큐에 넣고 결과 Future만 기다리므로 다른 요청 처리가 막히지 않습니다.
+    worker는 동시에 들어온 요청들의 쌍을 모아 길이순 토큰 예산 배치로 점수를 계산합니다.
+    이미 취소된 요청(클라이언트 타임아웃, MCP 취소)은 계산하지 않고 건너뜁니다.
+    """
+
+    def __init__(self, load_model: Callable[[], Any] = _get_reranker):
+        self._load_model = load_model
+        self._queue: "queue.Queue[RerankJob]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.queue_wait = BucketHistogram(QUEUE_WAIT_BUCKETS)
+        self.batch_size = BucketHistogram(BATCH_SIZE_BUCKETS)
+        self.batch_tokens = BucketHistogram(BATCH_TOKEN_BUCKETS)
+        self.jobs_per_cycle = BucketHistogram(BATCH_SIZE_BUCKETS)
+
+    def submit(self, pairs: List[List[str]]) -> Future:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="rerank-worker", daemon=True)
+                self._thread.start()
+        future = Future()
+        self._queue.put(RerankJob(pairs, future, time.perf_counter()))
+        return future
+
+    def _collect(self) -> List[RerankJob]:
+        jobs = [self._queue.get()]
+        n_pairs = len(jobs[0].pairs)
+        deadline = time.perf_counter() + RERANK_MAX_WAIT_MS / 1000
+        while n_pairs < RERANK_MAX_COLLECT_PAIRS:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs.append(job)
+            n_pairs += len(job.pairs)
+        return jobs
+
+    @staticmethod
+    def _token_lengths(reranker, pairs: List[List[str]]) -> List[int]:
+        """쌍별 토큰 길이 (토크나이저가 없으면 문자 수로 추정)"""
+        tokenizer = getattr(reranker, "tokenizer", None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(
+                    [query for query, _ in pairs],
+                    [passage for _, passage in pairs],
+                    truncation=True,
+                    max_length=RERANKER_MAX_LENGTH
+                )
+                return [len(ids) for ids in encoded["input_ids"]]
+            except Exception:
+                pass
+        return [min(RERANKER_MAX_LENGTH, (len(query) + len(passage)) // 2 + 4) for query, passage in pairs]
+
+    @staticmethod
+    def _plan_batches(lengths: List[int]) -> List[List[int]]:
+        """길이 내림차순으로 (배치 크기 × 최장 길이) ≤ 토큰 예산인 배치 구성"""
+        batches, current, current_max = [], [], 0
+        for index in sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True):
+            longest = max(current_max, lengths[index])
+            if current and (
+                (len(current) + 1) * longest > RERANK_TOKEN_BUDGET or len(current) >= RERANK_MAX_BATCH_PAIRS
+            ):
+                batches.append(current)
+                current, longest = [], lengths[index]
+            current.append(index)
+            current_max = longest
+        if current:
+            batches.append(current)
+        return batches
+
+    def _run(self):
+        # worker 스레드가 종료되면 이후 모든 rerank 요청이 응답을 받지 못하므로 어떤 예외도 루프를 끝내지 않음
+        while True:
+            try:
+                self._process(self._collect())
+            except Exception as e:
+                print(f"⚠️ rerank worker 오류 (계속 실행): {e}", file=sys.stderr)
+
+    def _process(self, jobs: List[RerankJob]):
+        started = time.perf_counter()
+        for job in jobs:
+            self.queue_wait.observe(started - job.enqueued_at)
+        self.jobs_per_cycle.observe(len(jobs))
+
+        # 취소된 요청은 제외하고, 남은 요청은 running으로 표시하여 계산 중 취소(set_result 충돌)를 막음
+        jobs = [job for job in jobs if job.future.set_running_or_notify_cancel()]
+        if not jobs:
+            return
+
+        try:
+            reranker = self._load_model()
+            pairs = [pair for job in jobs for pair in job.pairs]
+            lengths = self._token_lengths(reranker, pairs)
+            scores = [0.0] * len(pairs)
+            for batch in self._plan_batches(lengths):
+                batch_scores = reranker.compute_score(
+                    [pairs[i] for i in batch], normalize=True, batch_size=len(batch)
+                )
+                # 쌍이 1개면 float 하나를 반환하는 구현 대응
+                if not isinstance(batch_scores, list):
+                    batch_scores = [batch_scores]
+                for i, score in zip(batch, batch_scores):
+                    scores[i] = float(score)
+                self.batch_size.observe(len(batch))
+                self.batch_tokens.observe(len(batch) * max(lengths[i] for i in batch))
+        except Exception as e:
+            for job in jobs:
+                job.future.set_exception(e)
+            return
+
+        offset = 0
+        for job in jobs:
+            job.future.set_result(scores[offset:offset + len(job.pairs)])
+            offset += len(job.pairs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_wait_ms": RERANK_MAX_WAIT_MS,
+            "token_budget": RERANK_TOKEN_BUDGET,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+            "batch_size_pairs": self.batch_size.snapshot(),
+            "batch_padded_tokens": self.batch_tokens.snapshot(),
+            "requests_per_cycle": self.jobs_per_cycle.snapshot()
+        }
+
+
+_batcher = RerankBatcher()
+
+
+@mcp.resource("rerank://stats")
+def get_rerank_stats() -> str:
+    """rerank 요청 큐 대기 시간, 배치 크기(쌍 수/패딩 토큰 수), 처리 주기당 요청 수 히스토그램을 제공합니다."""
+    return json.dumps(_batcher.stats(), ensure_ascii=False, indent=2)
+
+
 @mcp.tool()
-def rerank_documents(
+async def rerank_documents(
     query: str,
-    documents: List[Dict[str, Any]],
-    top_k: int = 5
+    result_set_id: Optional[str] = None,
+    documents: Optional[List[Dict[str, Any]]] = None,
+    top_k: int = 5,
+    trace_context: Optional[Dict[str, str]] = None
 ) -> dict:
     """
     state내에 is_rerank가 False이면서, retrieve_results에 검색된 문서가 존재하는 상태에서는 반드시 rerank 과정을 우선적으로 수행합니다.
     검색된 문서들을 쿼리와의 관련성에 따라 재정렬합니다.
 
+    retrieve_documents가 반환한 result_set_id를 전달하세요.
+    문서 본문은 서버에서 조회하므로 documents 인자로 다시 보내지 마세요.
+
     Args:
         query: 사용자 쿼리
-        documents: 재정렬할 문서 리스트 (각 문서는 'text' 필드 필수)
+        result_set_id: retrieve_documents 결과의 result_set_id
+        documents: (하위 호환용) 재정렬할 문서 리스트, result_set_id가 없을 때만 사용
         top_k: 반환할 상위 문서 수 (기본값: 5)
 
     Returns:
         재정렬된 문서 리스트
     """
+    with _tracer.span("rerank_documents", trace_context, top_k=top_k) as span:
+        return await _rerank_documents(query, result_set_id, documents, top_k, span)
+
+
+async def _rerank_documents(
+    query: str,
+    result_set_id: Optional[str],
+    documents: Optional[List[Dict[str, Any]]],
+    top_k: int,
+    span
+) -> dict:
     try:
+        if result_set_id:
+            with _tracer.span("rerank.result_set_lookup", span.context()):
+                result_set = _result_store.get(result_set_id)
+            if result_set is None:
+                return {
+                    "success": False,
+                    "error": (
+                        f"result_set_id '{result_set_id}'를 찾을 수 없습니다 (만료 또는 잘못된 id). "
+                        "retrieve_documents를 다시 호출하세요."
+                    ),
+                    "error_type": "result_set_not_found",
+                    "result_set_id": result_set_id,
+                    "query": query,
+                    "reranked_documents": [],
+                    "count": 0
+                }
+            documents = result_set.get("documents", [])
+
         if not documents:
             return {
                 "success": True,
@@ -54,9 +273,9 @@ def rerank_documents(
         # Query-document 쌍 생성
         pairs = [[query, text] for text in doc_texts]
 
-        # Reranking 수행
-        reranker = _get_reranker()
-        scores = reranker.compute_score(pairs, normalize=True)
+        # Reranking 수행 (worker 스레드에서 다른 요청과 함께 배치 처리)
+        with _tracer.span("rerank.compute", span.context(), pairs=len(pairs)):
+            scores = await asyncio.wrap_future(_batcher.submit(pairs))
 
         # 점수와 문서를 결합하여 정렬
         scored_docs = []
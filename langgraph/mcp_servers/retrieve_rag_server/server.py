@@ -1,18 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
 import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
 
 from fastmcp import FastMCP
 from chromadb import PersistentClient
-from sentence_transformers import SentenceTransformer
 from chromadb import Documents, EmbeddingFunction, Embeddings
 
+SERVER_DIR = Path(__file__).resolve().parent  # mcp_servers/retrieve_rag_server/
+PROJECT_ROOT = SERVER_DIR.parent.parent       # langgraph/
+
+# mcp_servers/common 공유 모듈 사용
+sys.path.insert(0, str(SERVER_DIR.parent))
+from common.result_store import ResultSetStore  # noqa: E402
+from common.tracing import ServerTracer  # noqa: E402
+from common.query_cache import (  # noqa: E402
+    LRUCache,
+    CollectionVersionWatcher,
+    normalize_query,
+    DEFAULT_EMBEDDING_CACHE_SIZE,
+    DEFAULT_RESULT_CACHE_SIZE,
+    DEFAULT_RESULT_CACHE_TTL
+)
+from common.lexical_index import LexicalIndexLoader  # noqa: E402
+from common.inference import load_embedder  # noqa: E402
+from common.embedding_client import EmbeddingServiceClient  # noqa: E402
+from common.exact_index import ExactIndexLoader  # noqa: E402
+
 mcp = FastMCP("RetrieveServer")
 
 
 # ==================== Embedding Function ====================
 class CustomSentenceTransformerEmbedding(EmbeddingFunction):
     def __init__(self, model_name: str = "BAAI/bge-m3", device: str = "cpu"):
-        self.model = SentenceTransformer(model_name, device=device)
+        # EMBEDDING_BACKEND 환경 변수로 PyTorch / int8 ONNX Runtime 선택
+        self.model = load_embedder(model_name, device=device)
         self.batch_size = 64
         self.normalize_embeddings = True
 
@@ -32,12 +61,57 @@ _client = None
 _embedding_function = None
 _collections_cache = {}
 
-SERVER_DIR = Path(__file__).resolve().parent  # mcp_servers/retrieve_rag_server/
-PROJECT_ROOT = SERVER_DIR.parent.parent       # langgraph/
+# rerank 서버와 공유하는 검색 결과 저장소
+_result_store = ResultSetStore()
+
+# 서버 측 단계 span 기록 (trace_context가 전달된 호출만)
+_tracer = ServerTracer("retrieve_rag_server")
 
 # ChromaDB 경로 (절대 경로)
 CHROMA_DIR = PROJECT_ROOT / ".chroma"
 
+# 쿼리 임베딩 LRU 캐시 (정규화된 쿼리 → 임베딩) / 검색 결과 캐시 ((컬렉션, 쿼리, top_k) → 결과, 짧은 TTL)
+# 두 캐시 모두 컬렉션 내용이 바뀌면 무효화 (collection_versions.json 또는 문서 수로 감지)
+_embedding_cache = LRUCache(DEFAULT_EMBEDDING_CACHE_SIZE)
+_result_cache = LRUCache(DEFAULT_RESULT_CACHE_SIZE, ttl_seconds=DEFAULT_RESULT_CACHE_TTL)
+_version_watcher = CollectionVersionWatcher(CHROMA_DIR / "collection_versions.json")
+_seen_versions: Dict[str, str] = {}
+
+# Reciprocal Rank Fusion 상수 (retrieve_documents_batch 병합 목록)
+RRF_K = 60
+
+# 하이브리드 검색 (dense + BM25) 설정
+# - 컬렉션의 BM25 역색인(rag_ingest가 .chroma/lexical/에 생성)이 있을 때만 사용, 없으면 dense 검색만 수행
+# - 두 검색에서 각각 top_k × HYBRID_CANDIDATE_FACTOR개 후보를 뽑아 정규화 점수의 가중 합으로 top_k 선택
+HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+HYBRID_ALPHA = float(os.getenv("HYBRID_ALPHA", "0.5"))  # dense 점수 가중치 (1 - alpha: BM25)
+HYBRID_CANDIDATE_FACTOR = int(os.getenv("HYBRID_CANDIDATE_FACTOR", "3"))
+
+_lexical_loader = LexicalIndexLoader(CHROMA_DIR / "lexical")
+
+# 컬렉션별 문서 목록 (document_id → 제목, 출처 형식, 버전), 컬렉션 버전이 바뀔 때만 다시 조회
+_catalog_cache: Dict[str, Tuple[str, Dict[str, dict]]] = {}
+
+# 컬렉션 자동 탐색: collection_versions.json이 바뀌거나 TTL이 지나면 Chroma에서 목록을 다시 조회
+COLLECTION_DISCOVERY_TTL = float(os.getenv("COLLECTION_DISCOVERY_TTL", "60"))
+_discovery_lock = threading.Lock()
+_discovered: Dict[str, object] = {"checked_at": 0.0, "versions": None, "collections": {}}
+
+# 검색 백엔드 (컬렉션별 선택)
+# - chroma: Chroma HNSW 검색 / exact: rag_ingest가 내보낸 memory-map 임베딩 행렬의 정확 cosine 검색
+# - 우선순위: RETRIEVE_BACKEND_OVERRIDES("innorules=exact,docs=chroma") > 컬렉션 메타데이터 search_backend > 기본값
+# - exact 인덱스가 없거나 sidecar의 collection_version이 현재 컬렉션 버전과 다르면(내보내기 없이 재적재) chroma로 대체
+DEFAULT_SEARCH_BACKEND = os.getenv("RETRIEVE_DEFAULT_BACKEND", "chroma")
+SEARCH_BACKEND_OVERRIDES = dict(
+    item.split("=", 1) for item in os.getenv("RETRIEVE_BACKEND_OVERRIDES", "").split(",") if "=" in item
+)
+_exact_loader = ExactIndexLoader(CHROMA_DIR / "exact")
+_exact_stale_warned: Dict[str, str] = {}
+
+# 여러 컬렉션 동시 검색 (retrieve_documents_multi)
+FANOUT_MAX_WORKERS = int(os.getenv("RETRIEVE_FANOUT_WORKERS", "4"))
+_fanout_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="retrieve-fanout")
+
 
 def _get_client():
     """ChromaDB 클라이언트 초기화 (싱글톤)"""
@@ -66,17 +140,56 @@ def _get_collection(collection_name: str):
     return _collections_cache[collection_name]
 
 
-# ==================== Collection 메타데이터 정의 ====================
-COLLECTION_METADATA = {
-    "innorules": {
-        "name": "innorules",
-        "description": "이노룰즈 제품, 사내 규정 및 정책 문서 컬렉션. 인사, 복지, 휴가, 출장, 업무 프로세스 등에 관한 공식 문서",
-        # "categories": ["policy", "hr", "internal"],
-        "language": "ko"
-    }
+# ==================== Collection 메타데이터 ====================
+# 적재 시 설명을 기록하지 않은(rag_ingest --description 이전) 컬렉션용 기본 설명
+DEFAULT_COLLECTION_DESCRIPTIONS = {
+    "innorules": "이노룰즈 제품, 사내 규정 및 정책 문서 컬렉션. 인사, 복지, 휴가, 출장, 업무 프로세스 등에 관한 공식 문서"
 }
 
 
+def _discover_collections() -> Dict[str, dict]:
+    """Chroma 클라이언트의 컬렉션 목록과 컬렉션 메타데이터(description, language)로 컬렉션 정보 구성"""
+    client = _get_client()
+    collections = {}
+    for entry in client.list_collections():
+        # Chroma 버전에 따라 컬렉션 객체 또는 이름만 반환
+        name = getattr(entry, "name", entry)
+        metadata = getattr(entry, "metadata", None)
+        if isinstance(entry, str):
+            metadata = _get_collection(name).metadata
+        metadata = metadata or {}
+        collections[name] = {
+            "name": name,
+            "description": metadata.get("description") or DEFAULT_COLLECTION_DESCRIPTIONS.get(name, ""),
+            "language": metadata.get("language", "ko"),
+            "search_backend": SEARCH_BACKEND_OVERRIDES.get(
+                name, metadata.get("search_backend", DEFAULT_SEARCH_BACKEND)
+            )
+        }
+    return collections
+
+
+def _collection_metadata(refresh: bool = False) -> Dict[str, dict]:
+    """탐색된 컬렉션 정보 (collection_versions.json 변경, TTL 만료, refresh 시 다시 탐색)"""
+    versions = _version_watcher.versions()
+    with _discovery_lock:
+        stale = (
+            refresh
+            or _discovered["versions"] != versions
+            or time.time() - _discovered["checked_at"] > COLLECTION_DISCOVERY_TTL
+        )
+        if stale:
+            _discovered["collections"] = _discover_collections()
+            _discovered["versions"] = versions
+            _discovered["checked_at"] = time.time()
+        return _discovered["collections"]
+
+
+def _known_collection(collection_name: str) -> bool:
+    """컬렉션 존재 여부 (목록에 없으면 최근 적재를 반영하도록 한 번 다시 탐색)"""
+    return collection_name in _collection_metadata() or collection_name in _collection_metadata(refresh=True)
+
+
 # ==================== Resource: 컬렉션 목록 ====================
 @mcp.resource("collections://list")
 def list_collections() -> str:
@@ -84,12 +197,14 @@ def list_collections() -> str:
     사용 가능한 ChromaDB 컬렉션 목록과 설명을 제공합니다.
     이 리소스를 참고하여 어느 컬렉션에서 검색할지 결정하세요.
     """
+    collections = _collection_metadata()
     collections_info = {
-        "available_collections": COLLECTION_METADATA,
-        "total_count": len(COLLECTION_METADATA),
+        "available_collections": collections,
+        "total_count": len(collections),
         "usage_guide": {
             "description": "retrieve_documents 툴을 사용할 때 collection_name 파라미터에 위 컬렉션 이름을 지정하세요",
-            "example": "innorules 관련 질문이면 collection_name='innorules'를 사용"
+            "example": "innorules 관련 질문이면 collection_name='innorules'를 사용",
+            "multi_collection": "여러 컬렉션에 걸친 질문이면 retrieve_documents_multi로 한 번에 검색하세요"
         }
     }
     return json.dumps(collections_info, ensure_ascii=False, indent=2)
@@ -103,15 +218,15 @@ def get_collection_info(collection_name: str) -> str:
     Args:
         collection_name: 조회할 컬렉션 이름
     """
-    if collection_name not in COLLECTION_METADATA:
+    if not _known_collection(collection_name):
         return json.dumps({
             "error": f"Collection '{collection_name}' not found",
-            "available_collections": list(COLLECTION_METADATA.keys())
+            "available_collections": list(_collection_metadata().keys())
         }, ensure_ascii=False)
 
     try:
         collection = _get_collection(collection_name)
-        metadata = COLLECTION_METADATA[collection_name]
+        metadata = _collection_metadata()[collection_name]
 
         info = {
             "name": collection_name,
@@ -127,71 +242,458 @@ def get_collection_info(collection_name: str) -> str:
         }, ensure_ascii=False)
 
 
+# ==================== Resource: 캐시 통계 ====================
+@mcp.resource("collections://stats")
+def get_cache_stats() -> str:
+    """쿼리 임베딩 캐시와 검색 결과 캐시의 적중/미스 통계, 현재 컬렉션 버전, 임베딩 서비스 micro-batch 통계를 제공합니다."""
+    stats = {
+        "embedding_cache": _embedding_cache.stats(),
+        "result_cache": _result_cache.stats(),
+        "collection_versions": dict(_seen_versions)
+    }
+    model = getattr(_embedding_function, "model", None)
+    if isinstance(model, EmbeddingServiceClient):
+        try:
+            stats["embedding_service"] = model.stats()
+        except (OSError, RuntimeError) as e:
+            stats["embedding_service"] = {"error": str(e)}
+    return json.dumps(stats, ensure_ascii=False, indent=2)
+
+
+def _collection_version(collection_name: str, collection) -> str:
+    """
+    컬렉션 현재 버전 (변경이 감지되면 쿼리 임베딩 캐시도 비움)
+
+    쿼리 임베딩 자체는 컬렉션 내용과 무관하지만, 재적재 시 임베딩 모델/설정이 바뀌었을 수 있으므로 함께 무효화
+    """
+    version = _version_watcher.version(collection_name, count_fn=collection.count)
+    previous = _seen_versions.get(collection_name)
+    if previous is not None and previous != version:
+        print(f"[Retrieve] 컬렉션 변경 감지 ({collection_name}: {previous} → {version}) - 캐시 무효화", file=sys.stderr)
+        _embedding_cache.clear()
+    _seen_versions[collection_name] = version
+    return version
+
+
+def _embed_queries(queries: List[str]) -> List[list]:
+    """정규화된 쿼리들의 임베딩 (캐시에 없는 쿼리만 한 번의 batch forward pass로 인코딩)"""
+    embeddings = [_embedding_cache.get(query) for query in queries]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        encoded = _embedding_function([queries[i] for i in missing])
+        for i, embedding in zip(missing, encoded):
+            embeddings[i] = embedding
+            _embedding_cache.put(queries[i], embedding)
+    return embeddings
+
+
+def _embed_query(query: str) -> list:
+    """정규화된 쿼리 임베딩 (LRU 캐시)"""
+    return _embed_queries([query])[0]
+
+
+def _format_results(raw_results: dict, index: int, collection_name: str) -> List[dict]:
+    """ChromaDB 쿼리 결과 중 index번째 쿼리의 결과를 문서 목록으로 변환"""
+    results = []
+    if raw_results["documents"] and len(raw_results["documents"][index]) > 0:
+        for i in range(len(raw_results["documents"][index])):
+            results.append({
+                "chunk_id": raw_results["ids"][index][i],
+                "text": raw_results["documents"][index][i],
+                "metadata": raw_results["metadatas"][index][i] if raw_results["metadatas"] else {},
+                "distance": raw_results["distances"][index][i] if raw_results["distances"] else 0.0,
+                "rank": i + 1,
+                "collection": collection_name
+            })
+    return results
+
+
+# ==================== 메타데이터 필터 ====================
+def _document_catalog(collection_name: str, collection, version: str) -> Dict[str, dict]:
+    """컬렉션의 문서 목록 (청크 메타데이터에서 document_id별 제목, 출처 형식, 버전 집계)"""
+    cached = _catalog_cache.get(collection_name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    catalog: Dict[str, dict] = {}
+    for metadata in collection.get(include=["metadatas"])["metadatas"] or []:
+        entry = catalog.setdefault(metadata.get("document_id"), {
+            "title": metadata.get("title", ""),
+            "source_type": metadata.get("source_type"),
+            "versions": set()
+        })
+        entry["versions"].add(metadata.get("version", 0))
+
+    _catalog_cache[collection_name] = (version, catalog)
+    return catalog
+
+
+def _filters_key(filters: Dict) -> str:
+    """결과 캐시 키용 필터 직렬화 (지정되지 않은 필터 제외)"""
+    return json.dumps({k: v for k, v in sorted(filters.items()) if v}, ensure_ascii=False, sort_keys=True)
+
+
+def _build_where(collection_name: str, collection, version: str, filters: Dict) -> Tuple[Optional[dict], Optional[int]]:
+    """
+    검색 필터를 ChromaDB where 절로 변환
+
+    - titles / exclude_titles: 제목 부분 일치(대소문자 무시)로 document_id를 찾아 $in / $nin
+    - document_ids / exclude_document_ids: document_id $in / $nin
+    - source_type: 출처 형식 일치 (pdf, txt)
+    - updated_after: ISO 날짜/시각 이후 갱신된 청크 (적재 시 기록한 updated_ts 숫자 비교)
+    - latest_version_only: 문서별 최신 version 청크만 (문서, 버전) 쌍으로 제한
+
+    Returns:
+        (where 절 또는 None, 필터에 해당하는 문서 수 또는 None(문서 단위 필터 없음))
+    """
+    clauses = []
+    document_scope = None
+
+    if filters.get("titles") or filters.get("exclude_titles") or filters.get("latest_version_only"):
+        catalog = _document_catalog(collection_name, collection, version)
+
+        def title_matches(document_id: str, patterns: List[str]) -> bool:
+            title = (catalog[document_id]["title"] or "").lower()
+            return any(pattern.lower() in title for pattern in patterns)
+
+        document_scope = set(catalog)
+        if filters.get("titles"):
+            document_scope = {d for d in document_scope if title_matches(d, filters["titles"])}
+        if filters.get("exclude_titles"):
+            document_scope = {d for d in document_scope if not title_matches(d, filters["exclude_titles"])}
+        if filters.get("document_ids"):
+            document_scope &= set(filters["document_ids"])
+        if filters.get("exclude_document_ids"):
+            document_scope -= set(filters["exclude_document_ids"])
+        if filters.get("source_type"):
+            document_scope = {d for d in document_scope if catalog[d]["source_type"] == filters["source_type"]}
+
+        if filters.get("latest_version_only") and any(len(catalog[d]["versions"]) > 1 for d in document_scope):
+            pairs = [
+                {"$and": [{"document_id": d}, {"version": max(catalog[d]["versions"])}]}
+                for d in sorted(document_scope)
+            ]
+            clauses.append(pairs[0] if len(pairs) == 1 else {"$or": pairs})
+        else:
+            clauses.append({"document_id": {"$in": sorted(document_scope) or ["__no_document__"]}})
+    else:
+        if filters.get("document_ids"):
+            clauses.append({"document_id": {"$in": list(filters["document_ids"])}})
+        if filters.get("exclude_document_ids"):
+            clauses.append({"document_id": {"$nin": list(filters["exclude_document_ids"])}})
+
+    if filters.get("source_type"):
+        clauses.append({"source_type": filters["source_type"]})
+
+    if filters.get("updated_after"):
+        updated_after = datetime.fromisoformat(filters["updated_after"]).timestamp()
+        clauses.append({"updated_ts": {"$gt": updated_after}})
+
+    if not clauses:
+        return None, None
+    where = clauses[0] if len(clauses) == 1 else {"$and": clauses}
+    return where, len(document_scope) if document_scope is not None else None
+
+
+def _dense_store(collection_name: str, collection):
+    """
+    컬렉션의 dense 검색 대상 (ExactIndex 또는 Chroma Collection, 같은 query/get 형식)
+
+    Returns:
+        (검색 대상, 사용 백엔드 이름)
+    """
+    backend = SEARCH_BACKEND_OVERRIDES.get(collection_name) or (
+        _collection_metadata().get(collection_name, {}).get("search_backend", DEFAULT_SEARCH_BACKEND)
+    )
+    if backend != "exact":
+        return collection, "chroma"
+
+    index = _exact_loader.get(collection_name)
+    if index is None:
+        return collection, "chroma"
+
+    # 내보낼 때 기록한 컬렉션 버전과 현재 버전 비교 (exact 인덱스를 다시 내보내지 않은 적재 감지,
+    # 청크 수가 같아도 내용이 바뀐 재적재를 놓치지 않음)
+    version = _collection_version(collection_name, collection)
+    if index.info.get("collection_version") == version:
+        return index, "exact"
+
+    if _exact_stale_warned.get(collection_name) != version:
+        print(
+            f"⚠️ {collection_name} exact 인덱스 버전({index.info.get('collection_version')})이 "
+            f"컬렉션 버전({version})과 다름 - chroma로 검색",
+            file=sys.stderr
+        )
+        _exact_stale_warned[collection_name] = version
+    return collection, "chroma"
+
+
+def _fetch_lexical_only(
+    collection,
+    chunk_ids: List[str],
+    query_embedding: list,
+    collection_name: str,
+    where: Optional[dict] = None
+) -> Dict[str, dict]:
+    """BM25에서만 찾은 청크를 조회하고 쿼리와의 cosine distance 계산 (dense 결과와 같은 형식, 필터 적용)"""
+    if not chunk_ids:
+        return {}
+
+    fetched = collection.get(ids=chunk_ids, where=where, include=["documents", "metadatas", "embeddings"])
+    query_vector = np.asarray(query_embedding, dtype=np.float32)
+    docs = {}
+    for i, chunk_id in enumerate(fetched["ids"]):
+        vector = np.asarray(fetched["embeddings"][i], dtype=np.float32)
+        similarity = float(vector @ query_vector / ((np.linalg.norm(vector) * np.linalg.norm(query_vector)) or 1.0))
+        docs[chunk_id] = {
+            "chunk_id": chunk_id,
+            "text": fetched["documents"][i],
+            "metadata": fetched["metadatas"][i] if fetched["metadatas"] else {},
+            "distance": 1.0 - similarity,
+            "collection": collection_name
+        }
+    return docs
+
+
+def _fuse_hybrid(
+    dense: List[dict],
+    lexical_hits: List[Tuple[str, float]],
+    lexical_docs: Dict[str, dict],
+    top_k: int
+) -> List[dict]:
+    """
+    dense 결과와 BM25 결과를 정규화 점수의 가중 합으로 병합
+
+    dense 점수: cosine similarity(1 - distance)를 후보 내 min-max 정규화
+    BM25 점수: 후보 내 최고 점수로 나눈 값 (검색되지 않은 청크는 0)
+    """
+    docs = {doc["chunk_id"]: dict(doc) for doc in dense}
+    for chunk_id, doc in lexical_docs.items():
+        docs.setdefault(chunk_id, doc)
+    # 필터에 맞는 청크가 없으면 후보가 비어 있음
+    if not docs:
+        return []
+
+    similarities = {chunk_id: 1.0 - doc["distance"] for chunk_id, doc in docs.items()}
+    low, high = min(similarities.values()), max(similarities.values())
+    lexical_scores = dict(lexical_hits)
+    max_lexical = max(lexical_scores.values(), default=0.0) or 1.0
+
+    for chunk_id, doc in docs.items():
+        dense_score = (similarities[chunk_id] - low) / (high - low) if high > low else 1.0
+        lexical_score = lexical_scores.get(chunk_id, 0.0) / max_lexical
+        doc["dense_score"] = dense_score
+        doc["lexical_score"] = lexical_score
+        doc["hybrid_score"] = HYBRID_ALPHA * dense_score + (1 - HYBRID_ALPHA) * lexical_score
+
+    fused = sorted(docs.values(), key=lambda doc: doc["hybrid_score"], reverse=True)[:top_k]
+    for rank, doc in enumerate(fused, 1):
+        doc["rank"] = rank
+    return fused
+
+
+def _search(
+    collection,
+    collection_name: str,
+    queries: List[str],
+    query_embeddings: List[list],
+    top_k: int,
+    span,
+    where: Optional[dict] = None
+) -> List[List[dict]]:
+    """
+    쿼리들의 검색 결과 (한 번의 다중 쿼리 dense 검색 + BM25 역색인이 있으면 하이브리드 병합)
+
+    dense 검색은 컬렉션 백엔드에 따라 ChromaDB 또는 exact 인덱스로 수행하며,
+    where 절(메타데이터 필터)은 dense 검색과 BM25 후보 조회 모두에 적용
+    """
+    lexical_index = _lexical_loader.get(collection_name) if HYBRID_SEARCH_ENABLED else None
+    n_candidates = top_k * HYBRID_CANDIDATE_FACTOR if lexical_index is not None else top_k
+    store, backend = _dense_store(collection_name, collection)
+    span.set(hybrid=lexical_index is not None, backend=backend)
+
+    with _tracer.span(f"retrieve.{backend}_query", span.context(), n_results=n_candidates, queries=len(queries)):
+        raw_results = store.query(
+            query_embeddings=query_embeddings,
+            n_results=n_candidates,
+            where=where,
+            include=["documents", "metadatas", "distances"]
+        )
+
+    if lexical_index is None:
+        return [_format_results(raw_results, index, collection_name) for index in range(len(queries))]
+
+    results = []
+    with _tracer.span("retrieve.lexical_search", span.context(), n_results=n_candidates, queries=len(queries)):
+        for index, query in enumerate(queries):
+            dense = _format_results(raw_results, index, collection_name)
+            lexical_hits = lexical_index.search(query, n_candidates)
+            dense_ids = {doc["chunk_id"] for doc in dense}
+            lexical_docs = _fetch_lexical_only(
+                store,
+                [chunk_id for chunk_id, _ in lexical_hits if chunk_id not in dense_ids],
+                query_embeddings[index],
+                collection_name,
+                where
+            )
+            # 필터에서 제외된 BM25 후보는 점수 정규화에서도 제외
+            allowed = dense_ids | set(lexical_docs)
+            lexical_hits = [(chunk_id, score) for chunk_id, score in lexical_hits if chunk_id in allowed]
+            results.append(_fuse_hybrid(dense, lexical_hits, lexical_docs, top_k))
+    return results
+
+
+def reciprocal_rank_fusion(result_lists: Dict[str, List[dict]], top_k: int, k: int = RRF_K) -> List[dict]:
+    """
+    쿼리별 검색 결과를 Reciprocal Rank Fusion으로 병합
+
+    score(doc) = Σ 1 / (k + rank), 여러 쿼리에서 상위에 나온 문서일수록 높은 점수
+    """
+    fused: Dict[str, dict] = {}
+    for query, results in result_lists.items():
+        for doc in results:
+            entry = fused.get(doc["chunk_id"])
+            if entry is None:
+                entry = {**doc, "rrf_score": 0.0, "matched_queries": []}
+                fused[doc["chunk_id"]] = entry
+            entry["rrf_score"] += 1.0 / (k + doc["rank"])
+            entry["matched_queries"].append(query)
+            entry["distance"] = min(entry["distance"], doc["distance"])
+
+    merged = sorted(fused.values(), key=lambda doc: doc["rrf_score"], reverse=True)[:top_k]
+    for rank, doc in enumerate(merged, 1):
+        doc["rank"] = rank
+    return merged
+
+
 # ==================== Tool: 문서 검색 ====================
 @mcp.tool()
 def retrieve_documents(
     query: str,
     collection_name: str,
-    top_k: int = 10
+    top_k: int = 10,
+    titles: Optional[List[str]] = None,
+    exclude_titles: Optional[List[str]] = None,
+    document_ids: Optional[List[str]] = None,
+    exclude_document_ids: Optional[List[str]] = None,
+    source_type: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    latest_version_only: bool = False,
+    trace_context: Optional[Dict[str, str]] = None
 ) -> dict:
     """
     지정된 ChromaDB 컬렉션에서 관련 문서를 검색합니다.
 
     먼저 'collections://list' 리소스를 참고하여 적절한 컬렉션을 선택하세요.
+    반환되는 result_set_id를 rerank_documents에 전달하면 문서를 다시 보낼 필요가 없습니다.
+    질문이 특정 문서/형식/기간에 한정되면 필터를 지정하세요 (검색 범위가 줄어 더 빠르고 정확합니다).
 
     Args:
         query: 검색할 쿼리 텍스트
-        collection_name: 검색할 컬렉션 이름 (현재 innorules 하나만 존재)
+        collection_name: 검색할 컬렉션 이름 ('collections://list' 참고)
         top_k: 반환할 최대 문서 수 (기본값: 10)
+        titles: 이 문자열을 제목에 포함하는 문서만 검색 (예: ["Release Note"])
+        exclude_titles: 이 문자열을 제목에 포함하는 문서는 제외
+        document_ids: 검색할 document_id 목록
+        exclude_document_ids: 제외할 document_id 목록
+        source_type: 문서 형식 (pdf 또는 txt)
+        updated_after: 이 날짜(ISO 형식, 예: 2025-01-01) 이후 갱신된 문서만 검색
+        latest_version_only: 문서별 최신 버전만 검색
 
     Returns:
         검색 결과를 담은 딕셔너리
     """
+    filters = {
+        "titles": titles,
+        "exclude_titles": exclude_titles,
+        "document_ids": document_ids,
+        "exclude_document_ids": exclude_document_ids,
+        "source_type": source_type,
+        "updated_after": updated_after,
+        "latest_version_only": latest_version_only
+    }
+    with _tracer.span("retrieve_documents", trace_context, collection=collection_name, top_k=top_k) as span:
+        return _retrieve_documents(query, collection_name, top_k, filters, span)
+
+
+def _search_collection(
+    collection_name: str,
+    normalized_query: str,
+    embed: Callable[[], list],
+    top_k: int,
+    filters: Dict,
+    span
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    한 컬렉션 검색 (필터 → 결과 캐시 → 임베딩 + ChromaDB/BM25 검색)
+
+    embed는 결과 캐시 미스일 때만 호출됩니다.
+
+    Returns:
+        (검색 결과, 필터에 해당하는 문서 수 또는 None)
+    """
+    collection = _get_collection(collection_name)
+    version = _collection_version(collection_name, collection)
+    where, matched_documents = _build_where(collection_name, collection, version, filters)
+    span.set(filtered=where is not None)
+
+    # 같은 쿼리의 최근 검색 결과가 있으면 임베딩/ChromaDB 쿼리 생략
+    cache_key = (collection_name, normalized_query, top_k, _filters_key(filters))
+    results = _result_cache.get(cache_key, version)
+    span.set(result_cache="hit" if results is not None else "miss")
+
+    if results is None:
+        # ChromaDB 쿼리 (+ BM25 하이브리드 병합)
+        results = _search(collection, collection_name, [normalized_query], [embed()], top_k, span, where)[0]
+        _result_cache.put(cache_key, results, version)
+    return results, matched_documents
+
+
+def _retrieve_documents(query: str, collection_name: str, top_k: int, filters: Dict, span) -> dict:
     try:
         # 컬렉션 존재 여부 확인
-        if collection_name not in COLLECTION_METADATA:
+        if not _known_collection(collection_name):
             return {
                 "success": False,
                 "error": f"Unknown collection: {collection_name}",
-                "available_collections": list(COLLECTION_METADATA.keys()),
+                "available_collections": list(_collection_metadata().keys()),
                 "query": query,
                 "results": [],
                 "count": 0
             }
 
-        # 컬렉션 가져오기
-        collection = _get_collection(collection_name)
+        normalized_query = normalize_query(query)
 
-        # ChromaDB 쿼리 실행
-        raw_results = collection.query(
-            query_texts=[query],
-            n_results=top_k,
-            include=["documents", "metadatas", "distances"]
-        )
+        def embed() -> list:
+            # 쿼리 임베딩 (단계별 시간 측정을 위해 ChromaDB 쿼리와 분리)
+            with _tracer.span("retrieve.embedding", span.context()):
+                return _embed_query(normalized_query)
 
-        # 결과 포맷팅
-        results = []
-        if raw_results["documents"] and len(raw_results["documents"][0]) > 0:
-            for i in range(len(raw_results["documents"][0])):
-                results.append({
-                    "text": raw_results["documents"][0][i],
-                    "metadata": raw_results["metadatas"][0][i] if raw_results["metadatas"] else {},
-                    "distance": raw_results["distances"][0][i] if raw_results["distances"] else 0.0,
-                    "rank": i + 1,
-                    "collection": collection_name
-                })
+        results, matched_documents = _search_collection(
+            collection_name, normalized_query, embed, top_k, filters, span
+        )
 
         for i, doc in enumerate(results[:3]):  # 상위 3개만 로깅
             preview = doc["text"][:80] + "..." if len(doc["text"]) > 80 else doc["text"]
-            print(preview)
+            print(preview, file=sys.stderr)
+
+        # rerank_documents가 id로 조회할 수 있도록 결과 세트 저장
+        result_set_id = _result_store.put({
+            "query": query,
+            "collection": collection_name,
+            "documents": results
+        })
 
         return {
             "success": True,
             "query": query,
+            "result_set_id": result_set_id,
             "collection": collection_name,
-            "collection_description": COLLECTION_METADATA[collection_name]["description"],
+            "collection_description": _collection_metadata()[collection_name]["description"],
             "retrieve_results": results,
-            "count": len(results)
+            "count": len(results),
+            "filters": {k: v for k, v in filters.items() if v},
+            "filter_matched_documents": matched_documents
         }
 
     except Exception as e:
@@ -205,5 +707,312 @@ def retrieve_documents(
         }
 
 
+# ==================== Tool: 다중 쿼리 일괄 검색 ====================
+@mcp.tool()
+def retrieve_documents_batch(
+    queries: List[str],
+    collection_name: str,
+    top_k: int = 10,
+    merge: bool = True,
+    titles: Optional[List[str]] = None,
+    exclude_titles: Optional[List[str]] = None,
+    document_ids: Optional[List[str]] = None,
+    exclude_document_ids: Optional[List[str]] = None,
+    source_type: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    latest_version_only: bool = False,
+    trace_context: Optional[Dict[str, str]] = None
+) -> dict:
+    """
+    여러 쿼리(쿼리 확장, 여러 측면을 묻는 질문)를 한 번에 검색합니다.
+
+    retrieve_documents를 쿼리마다 여러 번 호출하는 대신 이 도구를 한 번 호출하세요.
+    merge=True이면 쿼리별 결과를 Reciprocal Rank Fusion으로 병합한 목록을 retrieve_results로 반환하며,
+    함께 반환되는 result_set_id를 rerank_documents에 전달할 수 있습니다.
+
+    Args:
+        queries: 검색할 쿼리 텍스트 목록
+        collection_name: 검색할 컬렉션 이름 ('collections://list' 참고)
+        top_k: 쿼리별(및 병합 목록) 최대 문서 수 (기본값: 10)
+        merge: 쿼리별 결과를 하나의 목록으로 병합할지 여부 (기본값: True)
+        titles, exclude_titles, document_ids, exclude_document_ids,
+        source_type, updated_after, latest_version_only: retrieve_documents와 같은 필터 (모든 쿼리에 적용)
+
+    Returns:
+        쿼리별 검색 결과와 병합 결과를 담은 딕셔너리
+    """
+    filters = {
+        "titles": titles,
+        "exclude_titles": exclude_titles,
+        "document_ids": document_ids,
+        "exclude_document_ids": exclude_document_ids,
+        "source_type": source_type,
+        "updated_after": updated_after,
+        "latest_version_only": latest_version_only
+    }
+    with _tracer.span(
+        "retrieve_documents_batch", trace_context,
+        collection=collection_name, top_k=top_k, queries=len(queries)
+    ) as span:
+        return _retrieve_documents_batch(queries, collection_name, top_k, merge, filters, span)
+
+
+def _retrieve_documents_batch(
+    queries: List[str],
+    collection_name: str,
+    top_k: int,
+    merge: bool,
+    filters: Dict,
+    span
+) -> dict:
+    try:
+        if not _known_collection(collection_name):
+            return {
+                "success": False,
+                "error": f"Unknown collection: {collection_name}",
+                "available_collections": list(_collection_metadata().keys()),
+                "queries": queries,
+                "retrieve_results": [],
+                "count": 0
+            }
+
+        # 정규화 후 중복 쿼리 제거 (입력 순서 유지)
+        normalized_queries = list(dict.fromkeys(q for q in (normalize_query(q) for q in queries) if q))
+        if not normalized_queries:
+            return {
+                "success": False,
+                "error": "queries가 비어 있습니다",
+                "queries": queries,
+                "retrieve_results": [],
+                "count": 0
+            }
+
+        collection = _get_collection(collection_name)
+        version = _collection_version(collection_name, collection)
+        where, matched_documents = _build_where(collection_name, collection, version, filters)
+        filters_key = _filters_key(filters)
+        span.set(filtered=where is not None)
+
+        # 결과 캐시에 없는 쿼리만 임베딩 + 한 번의 다중 쿼리 ChromaDB 검색
+        per_query = {
+            query: _result_cache.get((collection_name, query, top_k, filters_key), version)
+            for query in normalized_queries
+        }
+        pending = [query for query, results in per_query.items() if results is None]
+        span.set(result_cache_hits=len(normalized_queries) - len(pending))
+
+        if pending:
+            with _tracer.span("retrieve.embedding", span.context(), batch_size=len(pending)):
+                query_embeddings = _embed_queries(pending)
+
+            searched = _search(collection, collection_name, pending, query_embeddings, top_k, span, where)
+            for query, results in zip(pending, searched):
+                per_query[query] = results
+                _result_cache.put((collection_name, query, top_k, filters_key), per_query[query], version)
+
+        response = {
+            "success": True,
+            "queries": normalized_queries,
+            "collection": collection_name,
+            "collection_description": _collection_metadata()[collection_name]["description"],
+            "filters": {k: v for k, v in filters.items() if v},
+            "filter_matched_documents": matched_documents,
+            "per_query_results": [
+                {"query": query, "retrieve_results": results, "count": len(results)}
+                for query, results in per_query.items()
+            ]
+        }
+
+        if merge:
+            merged = reciprocal_rank_fusion(per_query, top_k)
+            # rerank_documents가 병합 목록을 id로 조회할 수 있도록 결과 세트 저장
+            response["result_set_id"] = _result_store.put({
+                "query": " / ".join(normalized_queries),
+                "collection": collection_name,
+                "documents": merged
+            })
+            response["retrieve_results"] = merged
+            response["count"] = len(merged)
+
+        return response
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "queries": queries,
+            "collection": collection_name,
+            "retrieve_results": [],
+            "count": 0
+        }
+
+
+# ==================== Tool: 여러 컬렉션 동시 검색 ====================
+def merge_by_similarity(per_collection: Dict[str, List[dict]], top_k: int) -> List[dict]:
+    """
+    컬렉션별 검색 결과를 cosine similarity(1 - distance) 기준으로 병합
+
+    컬렉션 내 하이브리드 점수는 후보 집합 안에서만 정규화된 값이라 컬렉션 간 비교가 불가능하므로,
+    모든 컬렉션이 같은 임베딩 모델/cosine 공간을 쓰는 dense similarity를 공통 점수로 사용합니다.
+    """
+    merged = [
+        {**doc, "similarity": 1.0 - doc["distance"]}
+        for results in per_collection.values()
+        for doc in results
+    ]
+    merged.sort(key=lambda doc: doc["similarity"], reverse=True)
+    merged = merged[:top_k]
+    for rank, doc in enumerate(merged, 1):
+        doc["rank"] = rank
+    return merged
+
+
+@mcp.tool()
+def retrieve_documents_multi(
+    query: str,
+    collection_names: Optional[List[str]] = None,
+    top_k: int = 10,
+    titles: Optional[List[str]] = None,
+    exclude_titles: Optional[List[str]] = None,
+    document_ids: Optional[List[str]] = None,
+    exclude_document_ids: Optional[List[str]] = None,
+    source_type: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    latest_version_only: bool = False,
+    trace_context: Optional[Dict[str, str]] = None
+) -> dict:
+    """
+    여러 컬렉션을 동시에 검색하고 결과를 하나의 목록으로 병합합니다.
+
+    질문이 여러 컬렉션에 걸쳐 있거나 어느 컬렉션인지 불분명할 때 retrieve_documents를
+    컬렉션마다 호출하는 대신 이 도구를 한 번 호출하세요. 반환되는 result_set_id를 rerank_documents에 전달할 수 있습니다.
+
+    Args:
+        query: 검색할 쿼리 텍스트
+        collection_names: 검색할 컬렉션 이름 목록 (생략하면 'collections://list'의 모든 컬렉션)
+        top_k: 컬렉션별 후보 수이자 병합 목록의 최대 문서 수 (기본값: 10)
+        titles, exclude_titles, document_ids, exclude_document_ids,
+        source_type, updated_after, latest_version_only: retrieve_documents와 같은 필터 (모든 컬렉션에 적용)
+
+    Returns:
+        병합된 검색 결과와 컬렉션별 상태(status, count, error)를 담은 딕셔너리
+        (한 컬렉션이라도 검색에 성공하면 success, 병합 결과가 비어 있으면 result_set_id는 None)
+    """
+    filters = {
+        "titles": titles,
+        "exclude_titles": exclude_titles,
+        "document_ids": document_ids,
+        "exclude_document_ids": exclude_document_ids,
+        "source_type": source_type,
+        "updated_after": updated_after,
+        "latest_version_only": latest_version_only
+    }
+    with _tracer.span("retrieve_documents_multi", trace_context, top_k=top_k) as span:
+        return _retrieve_documents_multi(query, collection_names, top_k, filters, span)
+
+
+def _retrieve_documents_multi(
+    query: str,
+    collection_names: Optional[List[str]],
+    top_k: int,
+    filters: Dict,
+    span
+) -> dict:
+    try:
+        available = _collection_metadata(refresh=bool(collection_names))
+        targets = list(dict.fromkeys(collection_names or available.keys()))
+        unknown = [name for name in targets if name not in available]
+        targets = [name for name in targets if name in available]
+        if not targets:
+            return {
+                "success": False,
+                "error": f"Unknown collections: {unknown}" if unknown else "검색할 컬렉션이 없습니다",
+                "available_collections": list(available.keys()),
+                "query": query,
+                "retrieve_results": [],
+                "count": 0
+            }
+        span.set(collections=len(targets))
+
+        # 쿼리 임베딩은 한 번만 계산하여 모든 컬렉션 검색에 사용
+        normalized_query = normalize_query(query)
+        with _tracer.span("retrieve.embedding", span.context()):
+            query_embedding = _embed_query(normalized_query)
+
+        def search(collection_name: str):
+            with _tracer.span("retrieve.collection", span.context(), collection=collection_name) as child:
+                return _search_collection(
+                    collection_name, normalized_query, lambda: query_embedding, top_k, filters, child
+                )
+
+        futures = {name: _fanout_executor.submit(search, name) for name in targets}
+        per_collection: Dict[str, List[dict]] = {}
+        collection_errors: Dict[str, str] = {name: "Unknown collection" for name in unknown}
+        for name, future in futures.items():
+            try:
+                per_collection[name] = future.result()[0]
+            except Exception as e:
+                collection_errors[name] = str(e)
+
+        # 모든 컬렉션 검색이 실패하면 실패로 응답 (일부만 실패하면 성공한 컬렉션 결과로 응답하고 오류는 함께 보고)
+        succeeded = [name for name in targets if name in per_collection]
+        if not succeeded:
+            return {
+                "success": False,
+                "error": f"모든 컬렉션 검색 실패: {collection_errors}",
+                "query": query,
+                "collection_errors": collection_errors,
+                "retrieve_results": [],
+                "count": 0
+            }
+
+        merged = merge_by_similarity(per_collection, top_k)
+
+        # rerank_documents가 병합 목록을 id로 조회할 수 있도록 결과 세트 저장 (빈 목록은 저장하지 않음)
+        result_set_id = None
+        if merged:
+            result_set_id = _result_store.put({
+                "query": query,
+                "collection": ",".join(succeeded),
+                "documents": merged
+            })
+
+        return {
+            "success": True,
+            "query": query,
+            "result_set_id": result_set_id,
+            "collections": {
+                name: (
+                    {
+                        "description": available[name]["description"],
+                        "status": "ok",
+                        "count": len(per_collection[name])
+                    }
+                    if name in per_collection else
+                    {
+                        "description": available[name]["description"],
+                        "status": "error",
+                        "error": collection_errors[name],
+                        "count": 0
+                    }
+                )
+                for name in targets
+            },
+            "collection_errors": collection_errors,
+            "retrieve_results": merged,
+            "count": len(merged),
+            "filters": {k: v for k, v in filters.items() if v}
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "query": query,
+            "retrieve_results": [],
+            "count": 0
+        }
+
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
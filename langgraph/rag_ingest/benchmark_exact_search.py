@@ -0,0 +1,121 @@
+import argparse
+from datetime import datetime
+from pathlib import Path
+import json
+import sys
+import time
+
+import numpy as np
+from chromadb import PersistentClient
+from rich import print
+
+from .benchmark_inference import DEFAULT_QUERIES, _latency_stats
+
+# retrieve 서버와 같은 인덱스/임베딩 로더 사용 (mcp_servers/common 공유 모듈)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.exact_index import ExactIndex  # noqa: E402
+from common.inference import load_embedder  # noqa: E402
+from common.query_cache import CollectionVersionWatcher  # noqa: E402
+
+
+def _time_queries(store, query_vectors: np.ndarray, top_k: int, where, iterations: int):
+    """쿼리 1건씩 검색 지연 시간과 마지막 결과 id 목록"""
+    latencies, ids = [], []
+    for iteration in range(iterations):
+        for vector in query_vectors:
+            start = time.perf_counter()
+            result = store.query(
+                query_embeddings=[vector.tolist()],
+                n_results=top_k,
+                where=where,
+                include=["documents", "metadatas", "distances"]
+            )
+            latencies.append(time.perf_counter() - start)
+            if iteration == iterations - 1:
+                ids.append(result["ids"][0])
+    return latencies, ids
+
+
+def main():
+    parser = argparse.ArgumentParser("Exact Search Benchmark")
+    parser.add_argument("--chroma-dir", type=str, default="./.chroma", help="ChromaDB 경로")
+    parser.add_argument("--collection", type=str, default="innorules", help="컬렉션 이름")
+    parser.add_argument("--queries", type=str, default=None, help="쿼리 파일 (한 줄에 하나, 기본값: 내장 예시)")
+    parser.add_argument("--model", type=str, default="BAAI/bge-m3", help="임베딩 모델")
+    parser.add_argument("--top-k", type=int, default=30, help="검색 수 (retrieve 서버 하이브리드 후보 수 기본값)")
+    parser.add_argument("--where", type=str, default=None, help='메타데이터 필터 JSON (예: {"source_type": "pdf"})')
+    parser.add_argument("--iterations", type=int, default=5, help="지연 시간 측정 반복 횟수")
+    args = parser.parse_args()
+
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        queries = [line.strip() for line in Path(args.queries).read_text(encoding="utf-8").splitlines() if line.strip()]
+    where = json.loads(args.where) if args.where else None
+
+    collection = PersistentClient(path=args.chroma_dir).get_collection(args.collection)
+
+    start = time.perf_counter()
+    index = ExactIndex.load(args.collection, Path(args.chroma_dir) / "exact")
+    load_time = time.perf_counter() - start
+    if index is None:
+        print(f"❌ {args.collection} exact 인덱스 없음 - python -m rag_ingest.run으로 먼저 적재하세요")
+        return
+    version = CollectionVersionWatcher(Path(args.chroma_dir) / "collection_versions.json").version(
+        args.collection, count_fn=collection.count
+    )
+    if index.info.get("collection_version") != version:
+        print(
+            f"⚠️ exact 인덱스 버전({index.info.get('collection_version')})이 컬렉션 버전({version})과 다릅니다 "
+            f"(retrieve 서버는 이 인덱스 대신 Chroma로 검색)"
+        )
+
+    print(f"📚 {args.collection}: 청크 {index.count()}개 ({index.info.get('dtype')}), 쿼리 {len(queries)}개")
+    query_vectors = np.asarray(load_embedder(args.model).encode(queries, normalize_embeddings=True), dtype=np.float32)
+
+    # 첫 검색은 memory-map 페이지 적재 비용 포함
+    start = time.perf_counter()
+    index.query(query_embeddings=[query_vectors[0].tolist()], n_results=args.top_k, where=where)
+    first_query_time = time.perf_counter() - start
+
+    print("⏱️ chroma")
+    chroma_latencies, chroma_ids = _time_queries(collection, query_vectors, args.top_k, where, args.iterations)
+    print("⏱️ exact")
+    exact_latencies, exact_ids = _time_queries(index, query_vectors, args.top_k, where, args.iterations)
+
+    # exact 결과를 정답으로 한 Chroma HNSW recall
+    recalls = [
+        len(set(chroma) & set(exact)) / len(exact)
+        for chroma, exact in zip(chroma_ids, exact_ids) if exact
+    ]
+
+    result = {
+        "timestamp": datetime.now().isoformat(),
+        "collection": args.collection,
+        "chunks": index.count(),
+        "dtype": index.info.get("dtype"),
+        "queries": len(queries),
+        "top_k": args.top_k,
+        "where": where,
+        "exact_load_time": load_time,
+        "exact_first_query_time": first_query_time,
+        "chroma_latency": _latency_stats(chroma_latencies),
+        "exact_latency": _latency_stats(exact_latencies),
+        f"chroma_recall@{args.top_k}": float(np.mean(recalls)) if recalls else None
+    }
+
+    print("\n" + "=" * 60)
+    print(f"exact 로드 {load_time * 1000:.1f}ms, 첫 검색 {first_query_time * 1000:.1f}ms")
+    for backend in ("chroma", "exact"):
+        latency = result[f"{backend}_latency"]
+        print(f"{backend:6s} p50 {latency['p50'] * 1000:.2f}ms, p95 {latency['p95'] * 1000:.2f}ms")
+    print(f"chroma recall@{args.top_k} (exact 기준): {result[f'chroma_recall@{args.top_k}']}")
+    print("=" * 60)
+
+    output_file = f"benchmark_exact_search_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
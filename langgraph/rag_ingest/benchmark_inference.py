@@ -0,0 +1,250 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import json
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy as np
+import psutil
+from chromadb import PersistentClient
+from rich import print
+
+# retrieve/rerank 서버와 같은 백엔드 로더 사용 (mcp_servers/common 공유 모듈)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.inference import BACKENDS, OnnxEmbedder, OnnxReranker, load_embedder, load_reranker  # noqa: E402
+
+DEFAULT_QUERIES = [
+    "연차 휴가는 며칠까지 사용할 수 있나요?",
+    "출장비 정산 절차를 알려줘",
+    "InnoRules 룰 배포 방법",
+    "v8.0.5.0 릴리즈 노트의 주요 변경 사항",
+    "재택근무 신청은 어떻게 하나요?",
+    "룰 테스트 케이스 작성 방법",
+    "경조사 휴가 규정",
+    "IRE-10041 이슈 내용"
+]
+
+
+def _rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+def _peak_rss_mb() -> float:
+    # Linux ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _check_backend(model, backend: str, onnx_class: type):
+    """요청한 백엔드가 실제로 로드되었는지 확인 (onnx-int8 요청이 torch로 대체되면 비교 의미가 없으므로 중단)"""
+    loaded = "onnx-int8" if isinstance(model, onnx_class) else "torch"
+    if loaded != backend:
+        raise RuntimeError(
+            f"{backend} 백엔드를 로드하지 못하고 {loaded}로 대체되었습니다 "
+            f"(onnxruntime 설치 및 python -m rag_ingest.export_onnx 실행 여부 확인)"
+        )
+
+
+def _run_isolated(func, *args):
+    """
+    백엔드별 측정을 새 프로세스에서 실행
+
+    이전 백엔드의 모델 메모리와 할당기 캐시가 남지 않도록 측정마다 spawn 프로세스를 새로 만듭니다.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(func, *args).result()
+
+
+def _latency_stats(samples: list) -> dict:
+    return {
+        "p50": float(np.percentile(samples, 50)),
+        "p95": float(np.percentile(samples, 95)),
+        "mean": float(np.mean(samples))
+    }
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(values))
+    ranks[np.argsort(values)] = np.arange(len(values))
+    return ranks
+
+
+def _spearman(a: np.ndarray, b: np.ndarray) -> float:
+    if len(a) < 2:
+        return 1.0
+    return float(np.corrcoef(_ranks(a), _ranks(b))[0, 1])
+
+
+def benchmark_embedding(backend: str, model_name: str, queries: list, corpus: list, batch_size: int, iterations: int):
+    """임베딩 백엔드 로드 시간/메모리, 쿼리 1건 지연 시간, 문서 batch 처리량 측정 (_run_isolated로 실행)"""
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    # 실행 중인 임베딩 서비스가 아닌 이 프로세스에 모델을 직접 로드
+    model = load_embedder(model_name, backend=backend, use_service=False)
+    load_time = time.perf_counter() - start
+    _check_backend(model, backend, OnnxEmbedder)
+    model.encode(queries[:1], batch_size=1, normalize_embeddings=True)  # 워밍업
+
+    latencies = []
+    for _ in range(iterations):
+        for query in queries:
+            start = time.perf_counter()
+            model.encode([query], batch_size=1, normalize_embeddings=True)
+            latencies.append(time.perf_counter() - start)
+
+    query_vectors = model.encode(queries, batch_size=batch_size, normalize_embeddings=True)
+    start = time.perf_counter()
+    doc_vectors = model.encode(corpus, batch_size=batch_size, normalize_embeddings=True)
+    corpus_time = time.perf_counter() - start
+
+    stats = {
+        "backend": backend,
+        "load_time": load_time,
+        "memory_mb": _rss_mb() - rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+        "query_latency": _latency_stats(latencies),
+        "corpus_throughput": len(corpus) / corpus_time if corpus_time else 0.0
+    }
+    return stats, np.asarray(query_vectors), np.asarray(doc_vectors)
+
+
+def benchmark_reranker(backend: str, model_name: str, candidates: dict, iterations: int):
+    """reranker 백엔드 로드 시간/메모리, 쿼리별(후보 문서 전체) 재정렬 지연 시간 측정 (_run_isolated로 실행)"""
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    model = load_reranker(model_name, backend=backend)
+    load_time = time.perf_counter() - start
+    _check_backend(model, backend, OnnxReranker)
+
+    latencies = []
+    scores = {}
+    for _ in range(iterations):
+        for query, texts in candidates.items():
+            pairs = [[query, text] for text in texts]
+            start = time.perf_counter()
+            scores[query] = np.asarray(model.compute_score(pairs, normalize=True), dtype=np.float32)
+            latencies.append(time.perf_counter() - start)
+
+    stats = {
+        "backend": backend,
+        "load_time": load_time,
+        "memory_mb": _rss_mb() - rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rerank_latency": _latency_stats(latencies),
+        "pairs_per_second": sum(len(t) for t in candidates.values()) * iterations / sum(latencies)
+    }
+    return stats, scores
+
+
+def main():
+    parser = argparse.ArgumentParser("Inference Backend Benchmark")
+    parser.add_argument("--chroma-dir", type=str, default="./.chroma", help="ChromaDB 경로")
+    parser.add_argument("--collection", type=str, default="innorules", help="문서를 가져올 컬렉션")
+    parser.add_argument("--corpus-size", type=int, default=500, help="임베딩할 청크 수")
+    parser.add_argument("--queries", type=str, default=None, help="쿼리 파일 (한 줄에 하나, 기본값: 내장 예시)")
+    parser.add_argument("--embedding-model", type=str, default="BAAI/bge-m3", help="임베딩 모델")
+    parser.add_argument("--reranker-model", type=str, default="BAAI/bge-reranker-v2-m3", help="reranker 모델")
+    parser.add_argument("--batch-size", type=int, default=32, help="문서 임베딩 배치 크기")
+    parser.add_argument("--top-k", type=int, default=10, help="검색 일치도 비교 top_k")
+    parser.add_argument("--rerank-candidates", type=int, default=20, help="쿼리별 rerank 후보 수")
+    parser.add_argument("--iterations", type=int, default=3, help="지연 시간 측정 반복 횟수")
+    args = parser.parse_args()
+
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        queries = [line.strip() for line in Path(args.queries).read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    collection = PersistentClient(path=args.chroma_dir).get_collection(args.collection)
+    corpus = collection.get(limit=args.corpus_size, include=["documents"])["documents"]
+    print(f"📚 {args.collection}: 청크 {len(corpus)}개, 쿼리 {len(queries)}개")
+
+    # ===== 임베딩 =====
+    embedding_stats, query_vectors, doc_vectors = {}, {}, {}
+    for backend in BACKENDS:
+        print(f"⏱️ 임베딩 - {backend}")
+        try:
+            embedding_stats[backend], query_vectors[backend], doc_vectors[backend] = _run_isolated(
+                benchmark_embedding, backend, args.embedding_model, queries, corpus, args.batch_size, args.iterations
+            )
+        except RuntimeError as e:
+            print(f"❌ 임베딩 {e}")
+            sys.exit(1)
+
+    baseline, candidate = BACKENDS
+    top_k = min(args.top_k, len(corpus))
+    top_ids = {
+        backend: np.argsort(-(query_vectors[backend] @ doc_vectors[backend].T), axis=1)[:, :top_k]
+        for backend in BACKENDS
+    }
+    embedding_agreement = {
+        "doc_cosine_mean": float(np.mean(np.sum(doc_vectors[baseline] * doc_vectors[candidate], axis=1))),
+        "doc_cosine_min": float(np.min(np.sum(doc_vectors[baseline] * doc_vectors[candidate], axis=1))),
+        f"retrieval_overlap@{top_k}": float(np.mean([
+            len(set(a) & set(b)) / top_k for a, b in zip(top_ids[baseline], top_ids[candidate])
+        ]))
+    }
+
+    # ===== Reranker (torch 검색 상위 후보 기준) =====
+    n_candidates = min(args.rerank_candidates, len(corpus))
+    candidates = {
+        query: [corpus[i] for i in np.argsort(-(doc_vectors[baseline] @ query_vectors[baseline][q]))[:n_candidates]]
+        for q, query in enumerate(queries)
+    }
+    reranker_stats, rerank_scores = {}, {}
+    for backend in BACKENDS:
+        print(f"⏱️ Reranker - {backend}")
+        try:
+            reranker_stats[backend], rerank_scores[backend] = _run_isolated(
+                benchmark_reranker, backend, args.reranker_model, candidates, args.iterations
+            )
+        except RuntimeError as e:
+            print(f"❌ Reranker {e}")
+            sys.exit(1)
+
+    rerank_k = min(5, n_candidates)
+    reranker_agreement = {
+        "spearman_mean": float(np.mean([
+            _spearman(rerank_scores[baseline][q], rerank_scores[candidate][q]) for q in candidates
+        ])),
+        f"top{rerank_k}_overlap": float(np.mean([
+            len(set(np.argsort(-rerank_scores[baseline][q])[:rerank_k])
+                & set(np.argsort(-rerank_scores[candidate][q])[:rerank_k])) / rerank_k
+            for q in candidates
+        ])),
+        "score_abs_diff_mean": float(np.mean([
+            np.mean(np.abs(rerank_scores[baseline][q] - rerank_scores[candidate][q])) for q in candidates
+        ]))
+    }
+
+    result = {
+        "timestamp": datetime.now().isoformat(),
+        "collection": args.collection,
+        "corpus_size": len(corpus),
+        "queries": len(queries),
+        "embedding": {"backends": embedding_stats, "agreement": embedding_agreement},
+        "reranker": {"backends": reranker_stats, "agreement": reranker_agreement}
+    }
+
+    print("\n" + "=" * 60)
+    for section in ("embedding", "reranker"):
+        for backend, stats in result[section]["backends"].items():
+            latency = stats.get("query_latency") or stats.get("rerank_latency")
+            print(
+                f"{section:9s} {backend:9s} load {stats['load_time']:.1f}s, mem {stats['memory_mb']:.0f}MB "
+                f"(peak RSS {stats['peak_rss_mb']:.0f}MB), "
+                f"p50 {latency['p50'] * 1000:.1f}ms, p95 {latency['p95'] * 1000:.1f}ms"
+            )
+        print(f"{section:9s} 일치도: {result[section]['agreement']}")
+    print("=" * 60)
+
+    output_file = f"benchmark_inference_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 결과 저장: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from typing import List, Optional
 from dataclasses import dataclass
+from pathlib import Path
 import logging
 import numpy as np
 import re
-from sentence_transformers import SentenceTransformer
+import sys
 try:
     import tiktoken
     _enc = tiktoken.get_encoding("cl100k_base")
@@ -14,6 +15,10 @@ except ImportError:
 
 from .config import ChunkConfig
 
+# 임베딩 서비스가 실행 중이면 적재/검색과 모델 하나를 공유 (mcp_servers/common 공유 모듈)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.inference import load_embedder  # noqa: E402
+
 
 logger = logging.getLogger(__name__)
 
@@ -50,11 +55,11 @@ class SemanticChunker:
         logger.info(f"SemanticChunker 초기화: {self.config.model_name}")
 
     @property
-    def model(self) -> SentenceTransformer:
-        """모델 지연 로딩 (싱글톤)"""
+    def model(self):
+        """모델 지연 로딩 (싱글톤, 임베딩 서비스가 있으면 서비스 클라이언트)"""
         if self._model is None:
             try:
-                self._model = SentenceTransformer(
+                self._model = load_embedder(
                     self.config.model_name,
                     device=self.config.device
                 )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -6,8 +7,16 @@ class IngestConfig:
     input_dir: str = ".rag_ingest/data/pdfs"
     chroma_dir: str = "./.chroma"
     collection: str = "innorules"
+    # 컬렉션 메타데이터로 저장되어 retrieve 서버의 collections://list에 노출 (None이면 기존 설명 유지)
+    description: Optional[str] = None
+    language: str = "ko"
+    # retrieve 서버 검색 백엔드 (chroma: HNSW, exact: memory-map 행렬 정확 검색), 컬렉션 메타데이터에 기록
+    search_backend: Optional[str] = None
+    exact_index: bool = True
+    exact_index_dtype: str = "float16"
     model_name: str = "BAAI/bge-m3"
     device: str = "cpu"
+    embedding_backend: Optional[str] = None  # torch / onnx-int8 (None: EMBEDDING_BACKEND 환경 변수)
     chunk_size: int = 1024
     chunk_overlap: int = 128
     batch_size: int = 8
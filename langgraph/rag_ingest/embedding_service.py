@@ -0,0 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# mcp_servers/common 공유 모듈 사용
+# (MCP 서버가 아니므로 mcp_servers/ 아래에 두지 않음 - 챗봇이 server.py를 MCP 서버로 자동 실행)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.inference import EMBEDDING_BACKEND, OnnxEmbedder, load_embedder  # noqa: E402
+from common.embedding_client import EMBEDDING_SERVICE_SOCKET, FRAME_PREFIX, encode_frame  # noqa: E402
+from common.histogram import BucketHistogram  # noqa: E402
+
+# micro-batch 설정: 첫 요청 후 최대 MAX_WAIT_MS 동안 요청을 모아 최대 MAX_BATCH_SIZE개 텍스트를 한 번에 인코딩
+MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_SERVICE_MAX_BATCH", "64"))
+MAX_WAIT_MS = float(os.getenv("EMBEDDING_SERVICE_MAX_WAIT_MS", "5"))
+
+# 배치 크기 히스토그램 구간 (텍스트 수) / 큐 대기 시간 구간 (초)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+QUEUE_WAIT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class MicroBatcher:
+    """
+    동시 인코딩 요청을 micro-batch로 묶어 모델 하나로 처리
+
+    - 요청은 MAX_BATCH_SIZE 이하 조각으로 나누어 FIFO 큐에 넣음 (큰 적재 요청이 쿼리를 오래 막지 않도록)
+    - 첫 조각이 도착하면 max_wait 동안 또는 배치가 찰 때까지 조각을 더 모음
+    - 인코딩은 전용 스레드 1개에서 실행하여 소켓 처리(이벤트 루프)가 막히지 않음
+    """
+
+    def __init__(self, model, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue: "asyncio.Queue[Tuple[List[str], asyncio.Future, float]]" = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        self._carry: Optional[Tuple[List[str], asyncio.Future, float]] = None
+        self.requests = 0
+        self.texts = 0
+        self.batches = 0
+        self.total_encode_time = 0.0
+        self.batch_size_histogram = BucketHistogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = BucketHistogram(QUEUE_WAIT_BUCKETS)
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        self.requests += 1
+        self.texts += len(texts)
+
+        futures = []
+        for start in range(0, len(texts), self.max_batch_size):
+            future = loop.create_future()
+            await self.queue.put((texts[start:start + self.max_batch_size], future, time.perf_counter()))
+            futures.append(future)
+        parts = await asyncio.gather(*futures)
+        return np.concatenate(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+
+    async def _collect(self) -> List[Tuple[List[str], asyncio.Future, float]]:
+        loop = asyncio.get_running_loop()
+        first = self._carry or await self.queue.get()
+        self._carry = None
+
+        batch = [first]
+        size = len(first[0])
+        deadline = loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if size + len(item[0]) > self.max_batch_size:
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # 정규화는 클라이언트가 요청별로 수행
+        vectors = self.model.encode(
+            texts,
+            batch_size=self.max_batch_size,
+            normalize_embeddings=False,
+            show_progress_bar=False,
+            convert_to_numpy=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+    def _record(self, batch_size: int, queue_waits: List[float], encode_time: float):
+        self.batches += 1
+        self.total_encode_time += encode_time
+        self.batch_size_histogram.observe(batch_size)
+        for wait in queue_waits:
+            self.queue_wait_histogram.observe(wait)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            texts = [text for segment, _, _ in batch for text in segment]
+            started = time.perf_counter()
+            try:
+                vectors = await loop.run_in_executor(self.executor, self._encode, texts)
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._record(len(texts), [started - queued for _, _, queued in batch], time.perf_counter() - started)
+            offset = 0
+            for segment, future, _ in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(segment)])
+                offset += len(segment)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "texts": self.texts,
+            "batches": self.batches,
+            "avg_encode_time": self.total_encode_time / self.batches if self.batches else 0.0,
+            "queue_depth": self.queue.qsize(),
+            "batch_size_histogram": self.batch_size_histogram.snapshot(),
+            "queue_wait_histogram": self.queue_wait_histogram.snapshot()
+        }
+
+
+async def serve(model_name: str, backend: str, socket_path: Path):
+    model = load_embedder(model_name, backend=backend, use_service=False)
+    # onnx-int8 모델이 없으면 torch로 대체되므로 실제 로드된 백엔드를 알림
+    backend = "onnx-int8" if isinstance(model, OnnxEmbedder) else "torch"
+    batcher = MicroBatcher(model)
+    info = {"model": model_name, "backend": backend, "max_batch_size": MAX_BATCH_SIZE, "max_wait_ms": MAX_WAIT_MS}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header_size, payload_size = FRAME_PREFIX.unpack(await reader.readexactly(FRAME_PREFIX.size))
+                    request = json.loads((await reader.readexactly(header_size)).decode("utf-8"))
+                    if payload_size:
+                        await reader.readexactly(payload_size)
+                except asyncio.IncompleteReadError:
+                    break
+
+                op = request.get("op")
+                if op == "encode":
+                    try:
+                        vectors = await batcher.encode(list(request.get("texts") or []))
+                        writer.write(encode_frame({"shape": list(vectors.shape)}, vectors.tobytes()))
+                    except Exception as e:
+                        writer.write(encode_frame({"error": str(e)}))
+                elif op == "info":
+                    writer.write(encode_frame(info))
+                elif op == "stats":
+                    writer.write(encode_frame({**info, **batcher.stats()}))
+                else:
+                    writer.write(encode_frame({"error": f"지원하지 않는 요청: {op}"}))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    socket_path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(handle, path=str(socket_path))
+    print(f"🚀 임베딩 서비스 시작: {socket_path} ({model_name}, {backend})", file=sys.stderr)
+
+    batch_task = asyncio.create_task(batcher.run())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch_task.cancel()
+        socket_path.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser("Embedding Service")
+    parser.add_argument("--model", type=str, default="BAAI/bge-m3", help="임베딩 모델")
+    parser.add_argument(
+        "--backend", type=str, default=EMBEDDING_BACKEND, choices=["torch", "onnx-int8"],
+        help="추론 백엔드 (기본값: EMBEDDING_BACKEND 환경 변수 또는 torch)"
+    )
+    parser.add_argument("--socket", type=str, default=str(EMBEDDING_SERVICE_SOCKET), help="Unix 소켓 경로")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.model, args.backend, Path(args.socket)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
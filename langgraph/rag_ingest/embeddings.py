@@ -1,5 +1,11 @@
+from pathlib import Path
+import sys
+
 from chromadb import Documents, EmbeddingFunction, Embeddings
-from sentence_transformers import SentenceTransformer
+
+# retrieve 서버와 같은 추론 백엔드 선택 사용 (mcp_servers/common 공유 모듈)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.inference import load_embedder  # noqa: E402
 
 
 class CustomSentenceTransformerEmbedding(EmbeddingFunction):
@@ -8,9 +14,10 @@ class CustomSentenceTransformerEmbedding(EmbeddingFunction):
         model_name: str,
         batch_size: int = 64,
         normalize_embeddings: bool = True,
-        device: str = "cpu"
+        device: str = "cpu",
+        backend: str = None
     ):
-        self.model = SentenceTransformer(model_name, device=device)
+        self.model = load_embedder(model_name, device=device, backend=backend)
         self.batch_size = batch_size
         self.normalize_embeddings = normalize_embeddings
 
@@ -0,0 +1,43 @@
+import argparse
+from pathlib import Path
+import sys
+
+from rich import print
+
+# retrieve/rerank 서버가 로드하는 위치에 내보내기 (mcp_servers/common 공유 모듈)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.inference import ONNX_MODEL_DIR, export_quantized  # noqa: E402
+
+DEFAULT_MODELS = {
+    "embedding": "BAAI/bge-m3",
+    "reranker": "BAAI/bge-reranker-v2-m3"
+}
+
+
+def main():
+    parser = argparse.ArgumentParser("ONNX int8 Export")
+    parser.add_argument(
+        "--kind", type=str, default="all", choices=["all", "embedding", "reranker"],
+        help="내보낼 모델 종류 (기본값: 임베딩, reranker 모두)"
+    )
+    parser.add_argument("--embedding-model", type=str, default=DEFAULT_MODELS["embedding"], help="임베딩 모델")
+    parser.add_argument("--reranker-model", type=str, default=DEFAULT_MODELS["reranker"], help="reranker 모델")
+    parser.add_argument("--output-dir", type=str, default=str(ONNX_MODEL_DIR), help="ONNX 모델 디렉터리")
+    args = parser.parse_args()
+
+    targets = {
+        "embedding": args.embedding_model,
+        "reranker": args.reranker_model
+    }
+    kinds = list(targets) if args.kind == "all" else [args.kind]
+
+    for kind in kinds:
+        print(f"📦 {kind}: {targets[kind]} → ONNX int8 내보내기")
+        path = export_quantized(targets[kind], kind, Path(args.output_dir))
+        print(f"✅ {path} ({path.stat().st_size / 1024 ** 2:.0f}MB)")
+
+    print("\nEMBEDDING_BACKEND=onnx-int8 / RERANKER_BACKEND=onnx-int8 환경 변수로 사용하세요")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from tqdm import tqdm
 
 from .config import IngestConfig
@@ -19,8 +21,10 @@ def run_ingest(config: IngestConfig):
     store = ChromaStore(
         path=config.chroma_dir,
         collection=config.collection,
-        embedding_model=config.model_name
+        embedding_model=config.model_name,
+        embedding_backend=config.embedding_backend
     )
+    store.set_collection_info(config.description, config.language, config.search_backend)
     print(f"임베딩 모델: {config.model_name}")
 
     # 1) 로드
@@ -106,7 +110,9 @@ def run_ingest(config: IngestConfig):
                 "embedding_model": config.model_name,
                 "source_type": source_type,
                 "created": created,
-                "updated": updated
+                "updated": updated,
+                # retrieve 서버의 updated_after 필터용 숫자 시각 (Chroma where는 문자열 범위 비교 불가)
+                "updated_ts": datetime.fromisoformat(updated).timestamp()
             }
 
             all_chunk_ids.append(chunk_id)
@@ -129,4 +135,16 @@ def run_ingest(config: IngestConfig):
 
         print(f"✅ {title} v{new_version}: {len(all_chunk_texts)}개 청크 등록 ({source_type.upper()})")
 
+    # 하이브리드 검색용 BM25 역색인 (Chroma 적재 내용과 동기화)
+    indexed = store.rebuild_lexical_index()
+    print(f"🔤 BM25 역색인 생성: {indexed}개 청크")
+
+    # 정확 검색 백엔드용 memory-map 임베딩 행렬 + sidecar
+    if config.exact_index:
+        exported = store.export_exact_index(config.exact_index_dtype)
+        print(f"🧮 정확 검색 인덱스 내보내기: {exported}개 청크 ({config.exact_index_dtype})")
+
+    # 컬렉션 변경 기록 (검색 결과 캐시 무효화)
+    store.mark_updated()
+
     print(f"\n🎉 총 {len(doc_paths)}개 문서 처리 완료")
@@ -9,20 +9,41 @@ def main():
     parser.add_argument("--input-dir", type=str, default="./rag_ingest/data", help="입력 디렉터리")
     parser.add_argument("--chroma-dir", type=str, default="./.chroma", help="ChromaDB 경로")
     parser.add_argument("--collection", type=str, default="innorules", help="컬렉션 이름")
+    parser.add_argument("--description", type=str, default=None, help="컬렉션 설명 (검색 도구가 컬렉션 선택에 사용)")
+    parser.add_argument("--language", type=str, default="ko", help="컬렉션 문서 언어")
+    parser.add_argument(
+        "--search-backend", type=str, default=None, choices=["chroma", "exact"],
+        help="retrieve 서버 검색 백엔드 (기본값: 기존 설정 유지, 없으면 chroma)"
+    )
+    parser.add_argument("--no-exact-index", action="store_true", help="정확 검색 인덱스 내보내기 생략")
+    parser.add_argument(
+        "--exact-dtype", type=str, default="float16", choices=["float16", "float32"],
+        help="정확 검색 임베딩 행렬 dtype"
+    )
     parser.add_argument("--model", type=str, default="BAAI/bge-m3", help="임베딩 모델")
     parser.add_argument("--chunk-size", type=int, default=1024, help="최대 청크 크기")
     parser.add_argument("--batch-size", type=int, default=8, help="배치 크기")
     parser.add_argument("--device", type=str, default="cpu", help="디바이스 (cpu/cuda)")
+    parser.add_argument(
+        "--backend", type=str, default=None, choices=["torch", "onnx-int8"],
+        help="임베딩 추론 백엔드 (기본값: EMBEDDING_BACKEND 환경 변수 또는 torch)"
+    )
     args = parser.parse_args()
 
     config = IngestConfig(
         input_dir=args.input_dir,
         chroma_dir=args.chroma_dir,
         collection=args.collection,
+        description=args.description,
+        language=args.language,
+        search_backend=args.search_backend,
+        exact_index=not args.no_exact_index,
+        exact_index_dtype=args.exact_dtype,
         model_name=args.model,
         chunk_size=args.chunk_size,
         batch_size=args.batch_size,
-        device=args.device
+        device=args.device,
+        embedding_backend=args.backend
     )
 
     print("=" * 60)
@@ -31,6 +52,8 @@ def main():
     print(f"입력 디렉터리: {config.input_dir}")
     print(f"ChromaDB 경로: {config.chroma_dir}")
     print(f"컬렉션: {config.collection}")
+    if config.description:
+        print(f"컬렉션 설명: {config.description}")
     print(f"모델: {config.model_name}")
     print(f"청크 크기: {config.chunk_size}")
     print("=" * 60)
@@ -1,8 +1,18 @@
 from typing import List, Dict, Any
+from datetime import datetime
+from pathlib import Path
+import json
+import sys
 from chromadb import PersistentClient
 
 from .embeddings import CustomSentenceTransformerEmbedding
 
+# retrieve 서버와 같은 토큰화/색인 규칙 사용 (mcp_servers/common 공유 모듈)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_servers"))
+from common.lexical_index import LexicalIndex, index_path  # noqa: E402
+from common.exact_index import ExactIndex  # noqa: E402
+from common.query_cache import version_key  # noqa: E402
+
 
 class ChromaStore:
     def __init__(
@@ -11,15 +21,20 @@ class ChromaStore:
         collection: str,
         embedding_model: str,
         batch_size: int = 64,
-        normalize_embeddings: bool = True
+        normalize_embeddings: bool = True,
+        embedding_backend: str = None
     ):
+        self.path = path
+        self.collection_name = collection
+        self.embedding_model = embedding_model
         self.client = PersistentClient(path=path)
         try:
             self.embedding_function = CustomSentenceTransformerEmbedding(
                 model_name=embedding_model,
                 batch_size=batch_size,
                 normalize_embeddings=normalize_embeddings,
-                device="cpu"
+                device="cpu",
+                backend=embedding_backend
             )
         except Exception as e:
             print(f"Error: {e}")
@@ -30,6 +45,22 @@ class ChromaStore:
             metadata={"hnsw:space": "cosine"}
         )
 
+    def set_collection_info(self, description: str = None, language: str = "ko", search_backend: str = None):
+        """
+        컬렉션 설명/언어/검색 백엔드를 컬렉션 메타데이터에 기록 (retrieve 서버가 컬렉션 탐색 시 사용)
+
+        description, search_backend가 없으면 기존 값을 유지합니다.
+        """
+        # 거리 함수(hnsw:*)는 생성 후 변경할 수 없으므로 수정 대상에서 제외
+        metadata = {k: v for k, v in (self.col.metadata or {}).items() if not k.startswith("hnsw:")}
+        updated = {**metadata, "language": language}
+        if description:
+            updated["description"] = description
+        if search_backend:
+            updated["search_backend"] = search_backend
+        if updated != metadata:
+            self.col.modify(metadata=updated)
+
     def get_latest_version(self, document_id: str) -> int:
         """document_id에 해당하는 최신 버전 번호 조회"""
         try:
@@ -69,3 +100,69 @@ class ChromaStore:
             documents=texts,
             metadatas=metadatas
         )
+
+    def rebuild_lexical_index(self) -> int:
+        """
+        컬렉션 전체로 BM25 역색인 재생성 (.chroma/lexical/{collection}.json)
+
+        삭제/업데이트된 청크가 남지 않도록 매 적재 후 컬렉션 내용 전체로 다시 만듭니다.
+        """
+        data = self.col.get(include=["documents"])
+        index = LexicalIndex.build(data["ids"], data["documents"])
+        index.save(index_path(self.collection_name, Path(self.path) / "lexical"))
+        return len(data["ids"])
+
+    def export_exact_index(self, dtype: str = "float16") -> int:
+        """
+        컬렉션 전체 임베딩을 정확 검색 인덱스로 내보내기 (.chroma/exact/{collection}.npy + .json)
+
+        BM25 역색인과 마찬가지로 매 적재 후 컬렉션 내용 전체로 다시 만듭니다.
+        sidecar에는 이어서 호출할 mark_updated가 기록할 컬렉션 버전을 남기며,
+        retrieve 서버는 이 값이 현재 컬렉션 버전과 다르면(내보내기 없이 다시 적재한 경우) Chroma로 검색합니다.
+        """
+        data = self.col.get(include=["embeddings", "documents", "metadatas"])
+        ExactIndex.save(
+            self.collection_name,
+            data["ids"],
+            data["embeddings"],
+            data["documents"],
+            data["metadatas"],
+            directory=Path(self.path) / "exact",
+            dtype=dtype,
+            info={
+                "embedding_model": self.embedding_model,
+                "collection_version": version_key(self._next_version_entry())
+            }
+        )
+        return len(data["ids"])
+
+    def _read_versions(self) -> Dict[str, Any]:
+        try:
+            return json.loads((Path(self.path) / "collection_versions.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _next_version_entry(self) -> Dict[str, Any]:
+        """mark_updated가 기록할 다음 버전 항목 (version, count)"""
+        previous = self._read_versions().get(self.collection_name, {})
+        return {"version": previous.get("version", 0) + 1, "count": self.col.count()}
+
+    def mark_updated(self):
+        """
+        컬렉션 변경 기록 (collection_versions.json)
+
+        챗봇 도구 캐시와 retrieve 서버 캐시가 이 파일로 컬렉션 변경을 감지합니다.
+        """
+        versions_path = Path(self.path) / "collection_versions.json"
+        versions = self._read_versions()
+
+        entry = self._next_version_entry()
+        versions[self.collection_name] = {
+            "version": entry["version"],
+            "updated": datetime.now().isoformat(),
+            "count": entry["count"]
+        }
+
+        tmp_path = versions_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(versions, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(versions_path)
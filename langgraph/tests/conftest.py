@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent  # langgraph/
+
+# 챗봇 모듈(from config import ...)과 MCP 서버 공유 모듈(from common... import ...)을
+# 실제 실행 위치(chatbot/, mcp_servers/)와 같은 방식으로 import
+sys.path.insert(0, str(PROJECT_ROOT / "chatbot"))
+sys.path.insert(0, str(PROJECT_ROOT / "mcp_servers"))
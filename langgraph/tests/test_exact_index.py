@@ -0,0 +1,91 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from common.exact_index import ExactIndex, matches_where  # noqa: E402
+
+
+@pytest.mark.parametrize("where, expected", [
+    ({"department": "HR"}, True),
+    ({"department": {"$eq": "IT"}}, False),
+    ({"department": {"$ne": "IT"}}, True),
+    ({"department": {"$in": ["HR", "IT"]}}, True),
+    ({"department": {"$nin": ["HR"]}}, False),
+    ({"year": {"$gte": 2024}}, True),
+    ({"year": {"$gt": 2024}}, False),
+    ({"year": {"$gt": 2020, "$lt": 2025}}, True),
+    ({"$and": [{"department": "HR"}, {"year": {"$lte": 2024}}]}, True),
+    ({"$and": [{"department": "HR"}, {"year": {"$lt": 2024}}]}, False),
+    ({"$or": [{"department": "IT"}, {"year": 2024}]}, True),
+    ({"$or": [{"department": "IT"}, {"year": 2023}]}, False),
+    ({"$and": [{"$or": [{"department": "IT"}, {"department": "HR"}]}, {"year": 2024}]}, True),
+    # 메타데이터에 없는 키는 None으로 비교 (크기 비교는 항상 실패)
+    ({"version": {"$gt": 1}}, False),
+    ({"version": {"$lte": 1}}, False),
+    ({"version": {"$ne": 1}}, True),
+    ({"version": {"$nin": [1, 2]}}, True),
+])
+def test_matches_where(where, expected):
+    assert matches_where({"department": "HR", "year": 2024}, where) is expected
+
+
+def _index():
+    # 2차원 단위 벡터 4개: 0°, 30°, 90°, 180°
+    angles = np.radians([0, 30, 90, 180])
+    matrix = np.stack([np.cos(angles), np.sin(angles)], axis=1).astype(np.float32)
+    return ExactIndex(
+        matrix,
+        ids=["a", "b", "c", "d"],
+        documents=["doc a", "doc b", "doc c", "doc d"],
+        metadatas=[{"team": "x", "year": 2024}, {"team": "y"}, {"team": "x", "year": 2023}, {"team": "y", "year": 2024}]
+    )
+
+
+def test_query_orders_by_cosine_distance():
+    result = _index().query([[2.0, 0.0]], n_results=3)
+
+    assert result["ids"] == [["a", "b", "c"]]
+    assert result["documents"] == [["doc a", "doc b", "doc c"]]
+    assert result["distances"][0] == pytest.approx([0.0, 1 - np.cos(np.radians(30)), 1.0], abs=1e-3)
+
+
+def test_query_applies_where_filter():
+    result = _index().query([[1.0, 0.0]], n_results=2, where={"team": "y"})
+    assert result["ids"] == [["b", "d"]]
+
+
+def test_query_where_gt_skips_rows_without_key():
+    result = _index().query([[1.0, 0.0]], n_results=4, where={"year": {"$gt": 2023}})
+    assert result["ids"] == [["a", "d"]]
+
+
+def test_query_k_larger_than_allowed_rows():
+    index = _index()
+
+    filtered = index.query([[0.0, 1.0]], n_results=10, where={"team": "x"})
+    assert filtered["ids"] == [["c", "a"]]
+
+    unfiltered = index.query([[0.0, 1.0]], n_results=10)
+    assert sorted(unfiltered["ids"][0]) == ["a", "b", "c", "d"]
+
+    nothing = index.query([[0.0, 1.0]], n_results=10, where={"team": "z"})
+    assert nothing["ids"] == [[]]
+    assert nothing["distances"] == [[]]
+
+
+def test_query_multiple_queries_and_include():
+    result = _index().query([[1.0, 0.0], [-1.0, 0.0]], n_results=1, include=("distances",))
+
+    assert set(result) == {"ids", "distances"}
+    assert result["ids"] == [["a"], ["d"]]
+
+
+def test_query_empty_index():
+    index = ExactIndex(np.empty((0, 2), dtype=np.float32), [], [], [])
+    assert index.query([[1.0, 0.0]], n_results=5)["ids"] == [[]]
+
+
+def test_get_applies_where_and_ignores_unknown_ids():
+    result = _index().get(["a", "b", "missing"], where={"team": "x"})
+    assert result["ids"] == ["a"]
+    assert result["metadatas"] == [{"team": "x", "year": 2024}]
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+
+from utils.intent import IntentExtractor  # noqa: E402
+
+CONFIG = {
+    "enabled": True,
+    "formatter": "template",
+    "max_query_chars": 40,
+    "default_timezone": "Asia/Seoul",
+}
+
+
+@pytest.fixture
+def extractor():
+    return IntentExtractor(CONFIG)
+
+
+@pytest.mark.parametrize("query, tool, args", [
+    ("지금 몇 시야?", "get_current_time", {"timezone": "Asia/Seoul"}),
+    ("몇 시야?", "get_current_time", {"timezone": "Asia/Seoul"}),
+    ("현재 시간", "get_current_time", {"timezone": "Asia/Seoul"}),
+    ("오늘 날짜 알려줘", "get_current_time", {"timezone": "Asia/Seoul"}),
+    ("도쿄는 몇 시야?", "get_current_time", {"timezone": "Asia/Tokyo"}),
+    ("뉴욕 시간 알려줘", "get_current_time", {"timezone": "America/New_York"}),
+    ("서울 날씨 어때?", "get_current_weather", {"city": "Seoul"}),
+    ("London weather", "get_current_weather", {"city": "London"}),
+    ("AAPL 주가 알려줘", "get_stock_price", {"ticker": "AAPL"}),
+    ("TSLA주가", "get_stock_price", {"ticker": "TSLA"}),
+    ("애플 주가 알려줘", "get_stock_price", {"ticker": "AAPL"}),
+    ("삼성전자 주가", "get_stock_price", {"ticker": "005930.KS"}),
+    ("LG전자 주가", "get_stock_price", {"ticker": "066570.KS"}),
+    ("005930 주가", "get_stock_price", {"ticker": "005930.KS"}),
+])
+def test_extracts_fast_path_intent(extractor, query, tool, args):
+    intent = extractor.extract(query)
+    assert intent is not None
+    assert intent["tool"] == tool
+    assert intent["args"] == args
+
+
+@pytest.mark.parametrize("query", [
+    # 일정/시각을 묻는 문서 질문
+    "회의는 몇 시에 시작해?",
+    "출근은 몇 시까지 해야 하나요?",
+    "점심시간은 몇 시부터야?",
+    "회의 시간 알려줘",
+    # 한글이 붙은 영문 대문자는 티커가 아님
+    "LG디스플레이 주가",
+    # 슬롯이 확정되지 않거나 의도가 여러 개
+    "날씨 알려줘",
+    "서울이랑 부산 날씨",
+    "AAPL TSLA 주가 비교",
+    "서울 날씨랑 지금 몇 시야?",
+    # 후속 질문, 도구와 무관한 질문
+    "그거 주가는?",
+    "파일서버 권한 신청 방법 알려줘",
+    "",
+])
+def test_falls_through_to_llm_path(extractor, query):
+    assert extractor.extract(query) is None
+
+
+def test_long_query_is_not_fast_path(extractor):
+    assert extractor.extract("지금 몇 시야? " + "추가 설명 " * 10) is None
+
+
+def test_disabled_config_returns_none():
+    assert IntentExtractor({**CONFIG, "enabled": False}).extract("지금 몇 시야?") is None
@@ -0,0 +1,124 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# common 패키지 __init__이 numpy 기반 inference 모듈을 import
+pytest.importorskip("numpy")
+
+from common.lexical_index import LexicalIndex, tokenize  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent  # langgraph/
+
+
+def test_tokenize_korean_bigrams():
+    assert tokenize("휴가규정을") == ["휴가", "가규", "규정", "정을"]
+    # 1글자 어절은 unigram
+    assert tokenize("법 개정") == ["법", "개정"]
+
+
+def test_tokenize_identifier_keeps_whole_and_parts():
+    tokens = tokenize("IRE-10041 오류")
+    assert "ire-10041" in tokens
+    assert "ire" in tokens and "10041" in tokens
+    assert "오류" in tokens
+
+
+@pytest.mark.parametrize("text, identifier", [
+    ("버전 v8.0.5.0 배포", "v8.0.5.0"),
+    ("file_server 권한", "file_server"),
+    ("경로 docs/hr/policy", "docs/hr/policy"),
+])
+def test_tokenize_identifier_separators(text, identifier):
+    assert identifier in tokenize(text)
+
+
+def test_tokenize_normalizes_width_and_case():
+    # NFKC: 전각 영문/숫자를 반각으로
+    assert tokenize("ＩＲＥ－１００４１") == tokenize("ire-10041")
+
+
+def _index():
+    return LexicalIndex.build(
+        ["c1", "c2", "c3"],
+        [
+            "IRE-10041 오류가 발생하면 서비스를 재시작합니다",
+            "IRE-10042 오류는 네트워크 설정 문제입니다",
+            "연차 휴가 신청은 그룹웨어에서 합니다",
+        ]
+    )
+
+
+def test_search_exact_identifier_ranks_its_chunk_first():
+    hits = _index().search("IRE-10041 오류 해결 방법", top_k=3)
+    assert hits[0][0] == "c1"
+    # 조각 토큰(ire, 오류)만 일치하는 청크는 더 낮은 점수
+    assert dict(hits)["c2"] < hits[0][1]
+
+
+def test_search_korean_with_particles():
+    hits = _index().search("휴가를 신청하려면", top_k=3)
+    assert [chunk_id for chunk_id, _ in hits] == ["c3"]
+
+
+def test_search_no_match_and_empty_index():
+    assert _index().search("kubernetes", top_k=3) == []
+    assert LexicalIndex.build([], []).search("휴가", top_k=3) == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / "docs.json"
+    index = _index()
+    index.save(path)
+
+    loaded = LexicalIndex.load(path)
+    assert loaded.search("IRE-10041", top_k=3) == index.search("IRE-10041", top_k=3)
+
+
+@pytest.fixture(scope="module")
+def retrieve_server():
+    pytest.importorskip("fastmcp")
+    pytest.importorskip("chromadb")
+    # rerank 서버와 파일명이 같으므로 고유한 모듈 이름으로 로드
+    path = PROJECT_ROOT / "mcp_servers" / "retrieve_rag_server" / "server.py"
+    spec = importlib.util.spec_from_file_location("retrieve_server_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _doc(chunk_id, distance):
+    return {"chunk_id": chunk_id, "content": chunk_id, "distance": distance}
+
+
+def test_fuse_hybrid_empty_candidates(retrieve_server):
+    assert retrieve_server._fuse_hybrid([], [], {}, top_k=5) == []
+
+
+def test_fuse_hybrid_dense_only(retrieve_server):
+    fused = retrieve_server._fuse_hybrid([_doc("a", 0.4), _doc("b", 0.1)], [], {}, top_k=5)
+
+    assert [doc["chunk_id"] for doc in fused] == ["b", "a"]
+    assert [doc["rank"] for doc in fused] == [1, 2]
+    assert all(doc["lexical_score"] == 0.0 for doc in fused)
+
+
+def test_fuse_hybrid_lexical_only(retrieve_server):
+    lexical_docs = {"a": _doc("a", 0.5), "b": _doc("b", 0.5)}
+    fused = retrieve_server._fuse_hybrid([], [("b", 4.0), ("a", 2.0)], lexical_docs, top_k=5)
+
+    assert [doc["chunk_id"] for doc in fused] == ["b", "a"]
+    assert fused[0]["lexical_score"] == pytest.approx(1.0)
+    assert fused[1]["lexical_score"] == pytest.approx(0.5)
+
+
+def test_fuse_hybrid_merges_and_truncates(retrieve_server, monkeypatch):
+    monkeypatch.setattr(retrieve_server, "HYBRID_ALPHA", 0.5)
+    dense = [_doc("a", 0.1), _doc("b", 0.3)]
+    lexical_docs = {"c": _doc("c", 0.5)}
+    fused = retrieve_server._fuse_hybrid(dense, [("c", 3.0), ("b", 3.0)], lexical_docs, top_k=2)
+
+    # b: dense 0.5 + BM25 1.0 → 0.75, a: dense 1.0 → 0.5, c: BM25 1.0 → 0.5
+    assert len(fused) == 2
+    assert fused[0]["chunk_id"] == "b"
+    assert fused[0]["hybrid_score"] == pytest.approx(0.75)
@@ -0,0 +1,137 @@
+import importlib.util
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("fastmcp")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent  # langgraph/
+
+
+@pytest.fixture(scope="module")
+def server():
+    # retrieve 서버와 파일명이 같으므로 고유한 모듈 이름으로 로드
+    path = PROJECT_ROOT / "mcp_servers" / "rerank_server" / "server.py"
+    spec = importlib.util.spec_from_file_location("rerank_server_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StubReranker:
+    """쌍의 passage 길이를 점수로 돌려주는 reranker (토크나이저 없음)"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+
+    def compute_score(self, pairs, normalize=True, batch_size=None):
+        self.calls.append([list(pair) for pair in pairs])
+        if self.fail:
+            raise RuntimeError("model error")
+        scores = [float(len(passage)) for _, passage in pairs]
+        return scores if len(scores) > 1 else scores[0]
+
+
+def _job(server, pairs):
+    return server.RerankJob(pairs, Future(), time.perf_counter())
+
+
+def test_plan_batches_orders_by_length_descending(server):
+    assert server.RerankBatcher._plan_batches([10, 50, 30]) == [[1, 2, 0]]
+
+
+def test_plan_batches_respects_token_budget(server, monkeypatch):
+    monkeypatch.setattr(server, "RERANK_TOKEN_BUDGET", 100)
+    lengths = [40, 10, 40, 20, 40]
+    batches = server.RerankBatcher._plan_batches(lengths)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) * max(lengths[i] for i in batch) <= 100
+    # 길이순으로 묶이므로 긴 쌍끼리, 짧은 쌍끼리 같은 배치
+    assert batches == [[0, 2], [4, 3], [1]]
+
+
+def test_plan_batches_keeps_overlong_pair_alone(server, monkeypatch):
+    monkeypatch.setattr(server, "RERANK_TOKEN_BUDGET", 100)
+    assert server.RerankBatcher._plan_batches([200, 10]) == [[0], [1]]
+
+
+def test_plan_batches_respects_max_batch_pairs(server, monkeypatch):
+    monkeypatch.setattr(server, "RERANK_MAX_BATCH_PAIRS", 2)
+    assert server.RerankBatcher._plan_batches([1] * 5) == [[0, 1], [2, 3], [4]]
+
+
+def test_process_splits_scores_per_job(server):
+    reranker = StubReranker()
+    batcher = server.RerankBatcher(load_model=lambda: reranker)
+    first = _job(server, [["q", "aaa"], ["q", "a"]])
+    second = _job(server, [["q", "aa"]])
+
+    batcher._process([first, second])
+
+    assert first.future.result() == [3.0, 1.0]
+    assert second.future.result() == [2.0]
+
+
+def test_process_skips_cancelled_jobs(server):
+    reranker = StubReranker()
+    batcher = server.RerankBatcher(load_model=lambda: reranker)
+    cancelled = _job(server, [["q", "cancelled"]])
+    alive = _job(server, [["q", "alive!"]])
+    cancelled.future.cancel()
+
+    batcher._process([cancelled, alive])
+
+    assert cancelled.future.cancelled()
+    assert alive.future.result() == [6.0]
+    assert all(pair != ["q", "cancelled"] for call in reranker.calls for pair in call)
+
+
+def test_process_with_only_cancelled_jobs_does_not_load_model(server):
+    def load_model():
+        raise AssertionError("취소된 요청만 있으면 모델을 로드하지 않아야 함")
+
+    batcher = server.RerankBatcher(load_model=load_model)
+    job = _job(server, [["q", "p"]])
+    job.future.cancel()
+
+    batcher._process([job])
+
+    assert job.future.cancelled()
+
+
+def test_process_propagates_model_error_to_all_jobs(server):
+    batcher = server.RerankBatcher(load_model=lambda: StubReranker(fail=True))
+    jobs = [_job(server, [["q", "a"]]), _job(server, [["q", "b"]])]
+
+    batcher._process(jobs)
+
+    for job in jobs:
+        with pytest.raises(RuntimeError, match="model error"):
+            job.future.result()
+
+
+def test_worker_survives_processing_error(server, monkeypatch):
+    batcher = server.RerankBatcher(load_model=lambda: StubReranker())
+    process = batcher._process
+    failed = []
+
+    def flaky_process(jobs):
+        if not failed:
+            failed.append(jobs)
+            raise RuntimeError("unexpected")
+        process(jobs)
+
+    monkeypatch.setattr(batcher, "_process", flaky_process)
+
+    batcher.submit([["q", "lost"]])
+    # 첫 주기의 예외 후에도 worker가 살아 있어 다음 요청을 처리
+    deadline = time.monotonic() + 5
+    while not failed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert batcher.submit([["q", "abcd"]]).result(timeout=5) == [4.0]
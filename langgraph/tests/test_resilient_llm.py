@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_core")
+pytest.importorskip("openai")
+
+import httpx  # noqa: E402
+from openai import APIConnectionError  # noqa: E402
+
+from utils import resilient_llm  # noqa: E402
+from utils.resilient_llm import LLMDeadlineExceeded, ResilientLLMCaller, is_retryable  # noqa: E402
+
+CONFIG = {
+    "call_timeout": 45.0,
+    "max_retries": 2,
+    "backoff_base": 0.5,
+    "backoff_max": 4.0,
+    "hedge_enabled": False,
+    "hedge_percentile": 95,
+    "hedge_min_samples": 20,
+    "hedge_initial_delay": 8.0,
+    "latency_window": 200,
+}
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # deadline/타임아웃 계산(time.time)만 고정, 이벤트 루프는 monotonic 시계를 사용
+    clock = FakeClock()
+    monkeypatch.setattr(resilient_llm.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """백오프 대기를 기록만 하고 즉시 반환 (jitter는 상한값으로 고정)"""
+    recorded = []
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(resilient_llm.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(resilient_llm.random, "uniform", lambda low, high: high)
+    return recorded
+
+
+class FakeRequests:
+    """호출 순서대로 결과를 돌려주는 request_factory (예외 인스턴스는 raise)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def __call__(self):
+        outcome = self.outcomes[self.calls]
+        self.calls += 1
+
+        async def request():
+            if isinstance(outcome, BaseException):
+                raise outcome
+            return outcome
+
+        return request()
+
+
+def _connection_error():
+    return APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+@pytest.mark.parametrize("error, expected", [
+    (asyncio.TimeoutError(), True),
+    (_connection_error(), True),
+    (ValueError("bad request"), False),
+    (KeyError("missing"), False),
+])
+def test_is_retryable(error, expected):
+    assert is_retryable(error) is expected
+
+
+def test_retries_transient_errors_with_backoff(clock, sleeps):
+    caller = ResilientLLMCaller(CONFIG)
+    requests = FakeRequests(asyncio.TimeoutError(), _connection_error(), "ok")
+
+    response, info = asyncio.run(caller.call(requests, "gpt-4o-mini"))
+
+    assert response == "ok"
+    assert info == {"attempts": 3, "hedged": False, "hedge_won": False}
+    # full jitter 상한: backoff_base * 2^(attempt-1)
+    assert sleeps == [0.5, 1.0]
+    assert caller.retries == 2
+
+
+def test_does_not_retry_non_transient_error(clock, sleeps):
+    caller = ResilientLLMCaller(CONFIG)
+    requests = FakeRequests(ValueError("bad request"), "ok")
+
+    with pytest.raises(ValueError):
+        asyncio.run(caller.call(requests, "gpt-4o-mini"))
+
+    assert requests.calls == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_max_retries(clock, sleeps):
+    caller = ResilientLLMCaller(CONFIG)
+    requests = FakeRequests(*[asyncio.TimeoutError()] * 3, "too late")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(caller.call(requests, "gpt-4o-mini"))
+
+    assert requests.calls == CONFIG["max_retries"] + 1
+
+
+def test_timeout_is_clamped_to_deadline(clock, monkeypatch):
+    caller = ResilientLLMCaller(CONFIG)
+    timeouts = []
+    attempt = caller._attempt
+
+    async def spy_attempt(request_factory, model, timeout, hedge):
+        timeouts.append(timeout)
+        return await attempt(request_factory, model, timeout, hedge)
+
+    monkeypatch.setattr(caller, "_attempt", spy_attempt)
+
+    asyncio.run(caller.call(FakeRequests("ok"), "gpt-4o-mini", deadline=clock.now + 3))
+    asyncio.run(caller.call(FakeRequests("ok"), "gpt-4o-mini", deadline=clock.now + 100))
+
+    assert timeouts == [3.0, CONFIG["call_timeout"]]
+
+
+def test_deadline_already_passed(clock):
+    caller = ResilientLLMCaller(CONFIG)
+    requests = FakeRequests("ok")
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(caller.call(requests, "gpt-4o-mini", deadline=clock.now - 1))
+
+    assert requests.calls == 0
+
+
+def test_no_retry_when_backoff_crosses_deadline(clock, sleeps):
+    caller = ResilientLLMCaller(CONFIG)
+    requests = FakeRequests(asyncio.TimeoutError(), "ok")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(caller.call(requests, "gpt-4o-mini", deadline=clock.now + 0.5))
+
+    assert requests.calls == 1
+    assert sleeps == []
+
+
+def test_attempt_times_out_hanging_request(clock):
+    caller = ResilientLLMCaller({**CONFIG, "call_timeout": 0.05, "max_retries": 0})
+
+    async def hang():
+        await asyncio.Event().wait()
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(caller.call(hang, "gpt-4o-mini"))
+
+    assert caller.timeouts == 1
+
+
+def test_hedge_wins_and_cancels_primary(clock):
+    caller = ResilientLLMCaller({**CONFIG, "hedge_enabled": True, "hedge_initial_delay": 0.01})
+    state = {"calls": 0, "primary_cancelled": False}
+
+    async def slow_primary():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            state["primary_cancelled"] = True
+            raise
+
+    async def fast_hedge():
+        return "hedged response"
+
+    def request_factory():
+        state["calls"] += 1
+        return slow_primary() if state["calls"] == 1 else fast_hedge()
+
+    async def run():
+        result = await caller.call(request_factory, "gpt-4o-mini")
+        # 취소 요청이 primary 태스크에 전달될 때까지 한 번 양보
+        await asyncio.sleep(0)
+        return result
+
+    response, info = asyncio.run(run())
+
+    assert response == "hedged response"
+    assert info == {"attempts": 1, "hedged": True, "hedge_won": True}
+    assert state["primary_cancelled"]
+    assert caller.hedges_fired == 1 and caller.hedges_won == 1
+
+
+def test_hedge_disabled_per_call(clock):
+    caller = ResilientLLMCaller({**CONFIG, "hedge_enabled": True, "hedge_initial_delay": 0.0})
+    requests = FakeRequests("ok", "unused")
+
+    response, info = asyncio.run(caller.call(requests, "gpt-4o-mini", hedge=False))
+
+    assert response == "ok"
+    assert info["hedged"] is False
+    assert requests.calls == 1
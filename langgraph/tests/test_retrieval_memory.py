@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils.retrieval_memory import is_follow_up  # noqa: E402
+
+
+@pytest.mark.parametrize("query", [
+    "그거는 어떻게 신청해?",
+    "거기에서 더 자세히",
+    "해당 내용을 요약해줘",
+    "그 방법 알려줘",
+    "이 절차는 누가 승인해?",
+    "이것도 돼?",
+    "그건요?",
+    "더 알려줘",
+    "그리고 비용은?",
+    "방금 말한 규정 다시",
+    "What about that?",
+    "Can you explain it in more detail?",
+    "How about the previous one?",
+])
+def test_follow_up_queries(query):
+    assert is_follow_up(query)
+
+
+@pytest.mark.parametrize("query", [
+    "파일서버 권한 신청 방법 알려줘",
+    "저는 신입인데 휴가 규정 알려줘",
+    "이번 달 일정",
+    "그린 에너지 정책",
+    "이메일 서명 설정 방법",
+    "더존 ERP 로그인 오류",
+    "I want vacation policy",
+    "How do I reset my password?",
+    "",
+    None,
+])
+def test_standalone_queries(query):
+    assert not is_follow_up(query)
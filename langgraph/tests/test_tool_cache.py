@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+from utils import tool_cache  # noqa: E402
+from utils.tool_cache import ToolResultCache  # noqa: E402
+
+POLICIES = {
+    "get_current_time": {"ttl": 0},
+    "get_stock_price": {"ttl": 30},
+    "retrieve_documents": {"ttl": 900, "invalidate_on_collection_change": True},
+}
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(tool_cache.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def versions_path(tmp_path):
+    path = tmp_path / "collection_versions.json"
+    path.write_text(json.dumps({"docs": 1}), encoding="utf-8")
+    return path
+
+
+def _cache(versions_path, max_entries=8):
+    return ToolResultCache(POLICIES, max_entries=max_entries, collection_versions_path=str(versions_path), enabled=True)
+
+
+def _bump_version(path, version):
+    path.write_text(json.dumps({"docs": version}), encoding="utf-8")
+    # 같은 시각에 두 번 쓰면 mtime이 같을 수 있으므로 명시적으로 변경
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_uncacheable_tools(versions_path):
+    cache = _cache(versions_path)
+    cache.put("get_current_time", {}, "12:00")
+    cache.put("unknown_tool", {}, "x")
+
+    assert cache.get("get_current_time", {}) is None
+    assert cache.get("unknown_tool", {}) is None
+    assert not ToolResultCache(POLICIES, collection_versions_path=str(versions_path), enabled=False).is_cacheable(
+        "get_stock_price"
+    )
+
+
+def test_key_ignores_arg_order_and_whitespace(versions_path, clock):
+    cache = _cache(versions_path)
+    cache.put("retrieve_documents", {"query": "휴가  규정", "top_k": 5}, "result")
+
+    assert cache.get("retrieve_documents", {"top_k": 5, "query": " 휴가 규정 "}) == "result"
+
+
+def test_entry_expires_after_ttl(versions_path, clock):
+    cache = _cache(versions_path)
+    cache.put("get_stock_price", {"ticker": "AAPL"}, "190.1")
+
+    clock.now += 29
+    assert cache.get("get_stock_price", {"ticker": "AAPL"}) == "190.1"
+
+    clock.now += 1
+    assert cache.get("get_stock_price", {"ticker": "AAPL"}) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_keeps_recently_used(versions_path, clock):
+    cache = _cache(versions_path, max_entries=2)
+    cache.put("get_stock_price", {"ticker": "AAPL"}, "a")
+    cache.put("get_stock_price", {"ticker": "TSLA"}, "t")
+    # AAPL을 최근 사용으로 갱신하면 TSLA가 가장 오래된 항목
+    assert cache.get("get_stock_price", {"ticker": "AAPL"}) == "a"
+    cache.put("get_stock_price", {"ticker": "MSFT"}, "m")
+
+    assert cache.get("get_stock_price", {"ticker": "TSLA"}) is None
+    assert cache.get("get_stock_price", {"ticker": "AAPL"}) == "a"
+    assert cache.get("get_stock_price", {"ticker": "MSFT"}) == "m"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_collection_version_change_invalidates(versions_path, clock):
+    cache = _cache(versions_path)
+    cache.put("retrieve_documents", {"query": "휴가"}, "v1 result")
+    cache.put("get_stock_price", {"ticker": "AAPL"}, "190.1")
+    assert cache.get("retrieve_documents", {"query": "휴가"}) == "v1 result"
+
+    _bump_version(versions_path, 2)
+
+    assert cache.get("retrieve_documents", {"query": "휴가"}) is None
+    # 컬렉션 무효화 정책이 없는 도구는 유지
+    assert cache.get("get_stock_price", {"ticker": "AAPL"}) == "190.1"
+
+    cache.put("retrieve_documents", {"query": "휴가"}, "v2 result")
+    assert cache.get("retrieve_documents", {"query": "휴가"}) == "v2 result"
+
+
+def test_invalidate_result_set(versions_path, clock):
+    cache = _cache(versions_path)
+    cache.put("retrieve_documents", {"query": "휴가"}, json.dumps({"result_set_id": "rs-1", "count": 3}))
+    cache.put("retrieve_documents", {"query": "출장"}, json.dumps({"result_set_id": "rs-2", "count": 2}))
+    cache.put("get_stock_price", {"ticker": "AAPL"}, "not json")
+
+    assert cache.invalidate_result_set("rs-1") == 1
+    assert cache.invalidate_result_set("rs-1") == 0
+
+    assert cache.get("retrieve_documents", {"query": "휴가"}) is None
+    assert cache.get("retrieve_documents", {"query": "출장"}) is not None
+    assert cache.get("get_stock_price", {"ticker": "AAPL"}) == "not json"